@@ -0,0 +1,90 @@
+"""Guide generation shared by the Streamlit app and the job queue workers."""
+import time
+from typing import Callable, Dict, Optional
+
+from gemini_service import GeminiService, is_error_response, is_fallback_response
+from resume_profile import ResumeProfile
+from similarity_index import SkillSimilarityIndex
+
+
+def generate_guide(llm_service: GeminiService, prompt: str, company: str, role: str, mode: str,
+                   bypass_cache: bool = False, latency_budget: float = 0.0,
+                   parallel_sections: bool = False,
+                   similarity_index: Optional[SkillSimilarityIndex] = None,
+                   profile: Optional[ResumeProfile] = None,
+                   on_text: Optional[Callable[[str], None]] = None,
+                   on_status: Optional[Callable[[Optional[str]], None]] = None,
+                   span: Optional[Dict] = None, started: Optional[float] = None) -> str:
+    """Generate (or reuse) the interview guide for one request.
+
+    ``on_text`` gets the guide so far each time it changes; ``on_status`` gets a
+    message while an upgrade is pending, then None. ``span`` (a metrics span)
+    receives first_chunk_ms, budget_exceeded and similarity_reuse, measured
+    from ``started``.
+    """
+    span = span if span is not None else {}
+    started = started if started is not None else time.perf_counter()
+
+    def show(text: str) -> None:
+        span.setdefault('first_chunk_ms', round((time.perf_counter() - started) * 1000, 3))
+        if on_text is not None:
+            on_text(text)
+
+    # Section-by-section guides are cached per section, so only whole guides are reused
+    use_index = similarity_index is not None and profile is not None and not parallel_sections
+    if use_index and not bypass_cache:
+        reused = similarity_index.lookup(profile, company, role, mode)
+        if reused is not None:
+            # A guide for a near-identical skill profile at this company and role
+            span['similarity_reuse'] = True
+            show(reused)
+            return reused
+
+    if latency_budget > 0:
+        # Show the role template if the guide misses the budget, then swap
+        # the guide in once it arrives
+        response, pending = llm_service.generate_response_within(
+            prompt,
+            role,
+            latency_budget,
+            bypass_cache=bypass_cache,
+            mode=mode,
+            sections=parallel_sections
+        )
+        show(response)
+        if pending is not None:
+            span['budget_exceeded'] = True
+            if on_status is not None:
+                on_status("Personalizing your guide...")
+            upgraded = pending.result()
+            if on_status is not None:
+                on_status(None)
+            if not is_error_response(upgraded):
+                response = upgraded
+                show(response)
+    elif parallel_sections:
+        # One concurrent request per section, merged in order
+        response = llm_service.generate_response_sections(
+            prompt,
+            role,
+            bypass_cache=bypass_cache,
+            mode=mode
+        )
+        show(response)
+    else:
+        chunks = []
+        for chunk in llm_service.generate_response_stream(
+            prompt,
+            role,
+            bypass_cache=bypass_cache,
+            mode=mode
+        ):
+            chunks.append(chunk)
+            show("".join(chunks))
+        response = "".join(chunks)
+
+    if (use_index and response
+            and not is_error_response(response) and not is_fallback_response(response)):
+        similarity_index.add(profile, company, role, mode,
+                             llm_service.response_cache_key(prompt, role, mode))
+    return response
@@ -0,0 +1,240 @@
+"""Headless batch mode: generate interview guides for a directory of resumes.
+
+Every PDF in the directory is paired with every (company, role) pair and the
+results are appended to a JSONL file as they finish. Re-running with the same
+output file skips pairs that already succeeded, so an interrupted run resumes
+where it stopped.
+
+    python batch.py resumes/ --pair "Acme:Backend Developer" --pair "Globex:Data Scientist"
+    python batch.py resumes/ --pairs-file pairs.csv --output guides.jsonl
+"""
+import argparse
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+from gemini_service import (
+    GeminiService, DEFAULT_GUIDE_MODE, DEFAULT_MAX_CONCURRENCY, GUIDE_MODES, is_error_response,
+    is_partial_response
+)
+from resilience import RetryPolicy
+from pdf_backends import AUTO_BACKEND, BACKENDS
+from pdf_processor import PDFProcessor
+from prompts import PromptGenerator
+
+DEFAULT_OUTPUT = "interview_guides.jsonl"
+# One PDFProcessor per worker process, created on first use
+_worker_processor = None
+
+
+def _parse_resume(pdf_bytes: bytes, backend: str) -> Tuple[str, Dict[str, Any]]:
+    """Process-pool worker: extract text and structured data from PDF bytes"""
+    global _worker_processor
+    if _worker_processor is None or _worker_processor.backend != backend:
+        # Resumes are already spread across processes; don't nest page pools
+        _worker_processor = PDFProcessor(parallel_pages=False, backend=backend)
+    # Only the structured data goes back to the parent process
+    return _worker_processor.extract_structured(io.BytesIO(pdf_bytes), keep_text=False)
+
+
+def parse_pair(value: str) -> Tuple[str, str]:
+    """Parse a "Company:Role" command-line pair"""
+    company, sep, role = value.partition(":")
+    if not sep or not company.strip() or not role.strip():
+        raise argparse.ArgumentTypeError(f"Expected COMPANY:ROLE, got {value!r}")
+    return company.strip(), role.strip()
+
+
+def load_pairs_file(path: str) -> List[Tuple[str, str]]:
+    """Read (company, role) pairs from a two-column CSV file"""
+    pairs = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if len(row) < 2 or not row[0].strip() or row[0].strip().lower() == "company":
+                continue
+            pairs.append((row[0].strip(), row[1].strip()))
+    return pairs
+
+
+def load_completed(output_path: str) -> Set[Tuple[str, str, str]]:
+    """Keys of (resume hash, company, role) that already succeeded in a previous run"""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A run killed mid-write can leave a truncated last line
+                continue
+            if record.get("status") == "ok":
+                completed.add((record["resume_sha256"], record["company"], record["role"]))
+    return completed
+
+
+class BatchRunner:
+    """Fan a directory of resumes out over (company, role) pairs"""
+
+    def __init__(self, llm_service: GeminiService, output_path: str, workers: Optional[int] = None,
+                 mode: str = DEFAULT_GUIDE_MODE, max_prompt_tokens: Optional[int] = None,
+                 sections: bool = False, pdf_backend: str = AUTO_BACKEND):
+        self.llm_service = llm_service
+        self.output_path = output_path
+        self.workers = workers
+        self.mode = mode
+        self.sections = sections
+        self.prompt_generator = PromptGenerator(max_prompt_tokens=max_prompt_tokens)
+        # Parsed resumes wait in memory until all their pairs finish; keep them compact
+        self.pdf_processor = PDFProcessor(parallel_pages=False, backend=pdf_backend)
+        self.stats = {'ok': 0, 'partial': 0, 'error': 0, 'skipped': 0}
+
+    def _write(self, output, record: Dict[str, Any]) -> None:
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+
+    async def _generate(self, output, resume: Dict[str, Any], company: str, role: str) -> None:
+        prompt = self.prompt_generator.generate_interview_prompt(
+            resume['profile'], company, role,
+            self.llm_service.prompt_overhead_tokens(role, self.mode, self.sections)
+        )
+        start = time.perf_counter()
+        if self.sections:
+            response = await self.llm_service.generate_response_sections_async(prompt, role, mode=self.mode)
+        else:
+            response = await self.llm_service.generate_response_async(prompt, role, mode=self.mode)
+        if is_error_response(response):
+            status = 'error'
+        elif is_partial_response(response):
+            # Not "ok", so a rerun retries the missing sections
+            status = 'partial'
+        else:
+            status = 'ok'
+        self.stats[status] += 1
+        self._write(output, {
+            'resume': resume['name'],
+            'resume_sha256': resume['sha256'],
+            'company': company,
+            'role': role,
+            'status': status,
+            'response': response,
+            'skills': resume['profile'].skills_dict(),
+            'elapsed_seconds': round(time.perf_counter() - start, 3)
+        })
+
+    async def run(self, resume_dir: str, pairs: List[Tuple[str, str]]) -> Dict[str, int]:
+        completed = load_completed(self.output_path)
+        loop = asyncio.get_running_loop()
+
+        with open(self.output_path, "a", encoding="utf-8") as output, \
+                ProcessPoolExecutor(max_workers=self.workers) as pool:
+
+            async def process(name: str, pdf_bytes: bytes, sha256: str,
+                              todo: List[Tuple[str, str]]) -> None:
+                try:
+                    _, structured_data = await loop.run_in_executor(
+                        pool, _parse_resume, pdf_bytes, self.pdf_processor.backend
+                    )
+                except Exception as e:
+                    print(f"Error processing {name}: {str(e)}")
+                    for company, role in todo:
+                        self.stats['error'] += 1
+                        self._write(output, {
+                            'resume': name, 'resume_sha256': sha256,
+                            'company': company, 'role': role,
+                            'status': 'error', 'response': f"Error processing PDF: {str(e)}"
+                        })
+                    return
+                for note in structured_data.get('ingest_limits', ()):
+                    print(f"{name}: {note}")
+                # Prompts and output records only use the skills
+                resume = {'name': name, 'sha256': sha256,
+                          'profile': self.pdf_processor.to_profile(
+                              {'skills': structured_data.get('skills', {})}
+                          )}
+                # The service's semaphore bounds how many of these are in flight
+                await asyncio.gather(*(
+                    self._generate(output, resume, company, role) for company, role in todo
+                ))
+
+            tasks = []
+            for name in sorted(os.listdir(resume_dir)):
+                if not name.lower().endswith(".pdf"):
+                    continue
+                with open(os.path.join(resume_dir, name), "rb") as f:
+                    pdf_bytes = f.read()
+                sha256 = hashlib.sha256(pdf_bytes).hexdigest()
+                todo = [pair for pair in pairs if (sha256, *pair) not in completed]
+                self.stats['skipped'] += len(pairs) - len(todo)
+                if todo:
+                    tasks.append(process(name, pdf_bytes, sha256, todo))
+
+            print(f"Using the {self.pdf_processor.backend} PDF backend")
+            await asyncio.gather(*tasks)
+
+        return self.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate interview guides for a directory of resumes")
+    parser.add_argument("resume_dir", help="Directory containing PDF resumes")
+    parser.add_argument("--pair", action="append", type=parse_pair, default=[],
+                        metavar="COMPANY:ROLE", help="Company and role to prepare for (repeatable)")
+    parser.add_argument("--pairs-file", help="CSV file of company,role rows")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSONL file to append results to")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="PDF parsing processes (default: CPU count)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help="Maximum concurrent Gemini calls")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Per-call Gemini timeout in seconds")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="Retries per call for transient Gemini errors")
+    parser.add_argument("--mode", choices=list(GUIDE_MODES), default=DEFAULT_GUIDE_MODE,
+                        help="Guide length (sets max_output_tokens)")
+    parser.add_argument("--sections", action="store_true",
+                        help="Generate each guide section as a separate concurrent request")
+    parser.add_argument("--max-prompt-tokens", type=int, default=None,
+                        help="Trim long skill lists to keep each prompt under this many tokens")
+    parser.add_argument("--pdf-backend", choices=[AUTO_BACKEND, *BACKENDS], default=AUTO_BACKEND,
+                        help="PDF text extractor (auto: the fastest installed one that passes "
+                             "a quality check on generated sample resumes)")
+    args = parser.parse_args()
+
+    pairs = list(args.pair)
+    if args.pairs_file:
+        pairs.extend(load_pairs_file(args.pairs_file))
+    if not pairs:
+        parser.error("at least one --pair or --pairs-file entry is required")
+
+    load_dotenv()
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        parser.error("GOOGLE_API_KEY is not set")
+
+    llm_service = GeminiService(
+        api_key,
+        max_concurrency=args.concurrency,
+        request_timeout=args.timeout,
+        retry_policy=RetryPolicy(max_attempts=args.retries + 1),
+        # Failures must stay errors so a re-run picks them up again
+        fallback_on_error=False
+    )
+    runner = BatchRunner(llm_service, args.output, workers=args.workers,
+                         mode=args.mode, max_prompt_tokens=args.max_prompt_tokens,
+                         sections=args.sections, pdf_backend=args.pdf_backend)
+    stats = asyncio.run(runner.run(args.resume_dir, pairs))
+    print(f"Done: {stats['ok']} ok, {stats['partial']} missing sections, {stats['error']} failed, "
+          f"{stats['skipped']} already complete")
+
+
+if __name__ == "__main__":
+    main()
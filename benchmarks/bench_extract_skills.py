@@ -0,0 +1,79 @@
+"""Compare single-pass skill matching against the old per-pattern scan.
+
+Run from the repository root:
+
+    python benchmarks/bench_extract_skills.py --pages 1 5 20 50
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_processor import PDFProcessor
+
+RESUME_PAGE = """EXPERIENCE
+Senior Software Engineer, Acme Corp
+- Built data pipelines in Python and Go, deployed with Docker and Kubernetes on AWS
+- Migrated a React Native app to Flutter, backed by Node.js and PostgreSQL
+- Led a team of five engineers and mentored interns on Git workflows
+PROJECTS
+- Ruby on Rails storefront with Redis caching and Jenkins CI
+- Realtime dashboard using Vue.js, GraphQL and MongoDB
+- Trained TensorFlow and PyTorch models, tracked results in Jira and Confluence
+TECHNICAL SKILLS
+Languages: Python, Java, JavaScript, TypeScript, C++, SQL
+Frameworks: Django, Flask, FastAPI, React, Angular
+Tools: Git, GitHub, Docker, Kubernetes, VS Code, Figma
+Responsibilities included requirements gathering, stakeholder communication,
+performance reviews, on-call rotations and general software maintenance work.
+"""
+
+
+def legacy_scan(processor: PDFProcessor, text: str) -> dict:
+    """The per-pattern scan used before the compiled matcher"""
+    skills = {category: set() for category in processor.tech_patterns}
+    for category, patterns in processor.tech_patterns.items():
+        for pattern in patterns:
+            for match in re.finditer(pattern, text, re.IGNORECASE):
+                skills[category].add(match.group())
+    return skills
+
+
+def compiled_scan(processor: PDFProcessor, text: str) -> dict:
+    return processor.extract_skills(text)
+
+
+def best_of(func, processor: PDFProcessor, text: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(processor, text)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20, 50],
+                        help="Synthetic resume lengths to benchmark, in pages")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Runs per measurement; the best run is reported")
+    args = parser.parse_args()
+
+    processor = PDFProcessor()
+    processor.extract_skills("warm up the compiled matcher")
+
+    print(f"{'pages':>6} {'chars':>9} {'legacy ms':>10} {'compiled ms':>12} {'speedup':>8}")
+    for pages in args.pages:
+        text = RESUME_PAGE * pages
+        legacy = best_of(legacy_scan, processor, text, args.repeat)
+        compiled = best_of(compiled_scan, processor, text, args.repeat)
+        print(f"{pages:>6} {len(text):>9} {legacy * 1000:>10.2f} "
+              f"{compiled * 1000:>12.2f} {legacy / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
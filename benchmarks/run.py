@@ -0,0 +1,167 @@
+"""Benchmark suite for the analysis pipeline.
+
+Times each stage on a synthetic resume corpus, plus an end-to-end run against
+a stub LLM, and writes machine-readable JSON. With ``--baseline`` the run
+fails (exit code 1) when any stage's median regresses past the tolerance.
+
+    python benchmarks/run.py --output bench.json
+    python benchmarks/run.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run.py --baseline benchmarks/baseline.json --tolerance 0.25
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from llm_utils import LLMUtils
+from pdf_processor import PDFProcessor
+from prompts import PromptGenerator
+from stub_llm import STUB_GUIDE, make_stub_service
+from sample_resumes import LAYOUTS, generate_corpus
+
+SIZES = {'small': 1, 'medium': 3, 'large': 20}
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Run func ``repeat`` times after one warm-up call and summarize in milliseconds"""
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'min_ms': round(min(timings), 4),
+        'median_ms': round(statistics.median(timings), 4),
+        'max_ms': round(max(timings), 4),
+        'runs': repeat
+    }
+
+
+def run_suite(repeat: int, llm_latency: float, layouts) -> Dict[str, Dict[str, float]]:
+    processor = PDFProcessor()
+    prompt_generator = PromptGenerator()
+    llm_utils = LLMUtils()
+    results = {}
+
+    corpus = generate_corpus(list(SIZES.values()), layouts)
+    for size, pages in SIZES.items():
+        documents = [data for name, data in corpus.items() if name.endswith(f"_{pages}p.pdf")]
+        texts = [processor.extract_text(io.BytesIO(data)) for data in documents]
+        structured = [processor.get_structured_data(text) for text in texts]
+
+        results[f"extract_text[{size}]"] = measure(
+            lambda: [processor.extract_text(io.BytesIO(data)) for data in documents], repeat)
+        results[f"extract_skills[{size}]"] = measure(
+            lambda: [processor.extract_skills(text) for text in texts], repeat)
+        results[f"get_structured_data[{size}]"] = measure(
+            lambda: [processor.get_structured_data(text) for text in texts], repeat)
+        results[f"generate_interview_prompt[{size}]"] = measure(
+            lambda: [prompt_generator.generate_interview_prompt(data, "Acme", "Backend Developer")
+                     for data in structured], repeat)
+
+    guide = STUB_GUIDE * 4
+    results["clean_response"] = measure(lambda: llm_utils.clean_response(guide, "prompt"), repeat)
+    results["extract_sections"] = measure(lambda: llm_utils.extract_sections(guide), repeat)
+    # The same post-processing done incrementally over streamed chunks
+    chunks = [guide[i:i + 64] for i in range(0, len(guide), 64)]
+    results["clean_stream"] = measure(
+        lambda: "".join(llm_utils.clean_stream(chunks, "prompt", on_section=lambda name, lines: None)),
+        repeat)
+
+    # End to end: bytes -> structured data -> prompt -> stub LLM -> post-processing
+    service = make_stub_service(latency=llm_latency)
+    document = corpus[f"{layouts[0]}_{SIZES['medium']}p.pdf"]
+
+    def end_to_end():
+        _, structured_data = processor.extract_structured(io.BytesIO(document))
+        prompt = prompt_generator.generate_interview_prompt(structured_data, "Acme", "Backend Developer")
+        response = service.generate_response(prompt, "Backend Developer")
+        llm_utils.extract_sections(llm_utils.clean_response(response, prompt))
+
+    results["end_to_end[medium]"] = measure(end_to_end, repeat)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any],
+            tolerance: float) -> list:
+    """Stages whose median exceeds the baseline median by more than ``tolerance``"""
+    regressions = []
+    for stage, stats in baseline.get('results', {}).items():
+        current = results.get(stage)
+        if current is None:
+            continue
+        limit = stats['median_ms'] * (1 + tolerance)
+        if current['median_ms'] > limit:
+            regressions.append({
+                'stage': stage,
+                'baseline_ms': stats['median_ms'],
+                'current_ms': current['median_ms'],
+                'ratio': round(current['median_ms'] / stats['median_ms'], 3)
+            })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the resume analysis pipeline")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per stage")
+    parser.add_argument("--llm-latency", type=float, default=0.0,
+                        help="Seconds the stub LLM waits before answering")
+    parser.add_argument("--layouts", nargs="+", choices=list(LAYOUTS), default=list(LAYOUTS))
+    parser.add_argument("--output", help="Write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed median slowdown vs. baseline, as a fraction")
+    parser.add_argument("--save-baseline", help="Write these results as a new baseline file")
+    args = parser.parse_args()
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'llm_latency': args.llm_latency
+        },
+        'results': None
+    }
+    # The pipeline prints debug output; keep stdout clean for the JSON report
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        report['results'] = run_suite(args.repeat, args.llm_latency, args.layouts)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report['regressions'] = compare(report['results'], baseline, args.tolerance)
+        if report['regressions']:
+            exit_code = 1
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+
+    for regression in report.get('regressions', []):
+        print(f"REGRESSION {regression['stage']}: {regression['baseline_ms']:.3f} ms -> "
+              f"{regression['current_ms']:.3f} ms ({regression['ratio']}x)", file=sys.stderr)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Offline stand-in for the Gemini model with configurable latency.
+
+``StubModel`` implements the parts of ``GenerativeModel`` that GeminiService
+uses, so ``make_stub_service`` exercises the real service code (prompt
+building, response cache, streaming, async) without network access.
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Optional
+
+from gemini_service import GeminiService
+
+STUB_GUIDE = """# Technical Questions
+1. Walk through the design of a service you owned end to end.
+2. How do you find and fix a memory leak in production?
+3. Explain the trade-offs between SQL and NoSQL stores for this role.
+
+# Coding Challenges
+1. Implement an LRU cache with O(1) get and put.
+2. Merge overlapping intervals from a stream of events.
+
+# System Design Questions
+1. Design a URL shortener that serves 10k requests per second.
+2. Design a rate limiter shared by several API gateways.
+
+# Key Concepts
+- Caching strategies and invalidation
+- Consistency models in distributed systems
+- Observability: metrics, logs and traces
+
+# Preparation Steps
+1. Review the company's public engineering blog.
+2. Practice two medium coding problems per day.
+3. Prepare stories about scaling and incident response.
+"""
+
+
+class _StubResponse:
+    def __init__(self, text: str, prompt: str, generated: Optional[str] = None):
+        self.text = text
+        # Rough 4-chars-per-token estimate, shaped like the SDK's usage metadata
+        # (cumulative over the stream so far, as the API reports it)
+        generated = text if generated is None else generated
+        self.usage_metadata = SimpleNamespace(
+            prompt_token_count=len(prompt) // 4,
+            candidates_token_count=len(generated) // 4,
+            total_token_count=(len(prompt) + len(generated)) // 4
+        )
+
+
+class StubModel:
+    """Returns ``STUB_GUIDE`` after ``latency`` seconds (spread across chunks when streaming)"""
+
+    def __init__(self, latency: float = 0.0, chunks: int = 8, text: str = STUB_GUIDE):
+        self.latency = latency
+        self.chunks = max(1, chunks)
+        self.text = text
+        self.calls = 0
+
+    def _pieces(self):
+        size = -(-len(self.text) // self.chunks)
+        return [self.text[i:i + size] for i in range(0, len(self.text), size)]
+
+    def generate_content(self, contents, generation_config=None, stream: bool = False, **kwargs):
+        self.calls += 1
+        if not stream:
+            time.sleep(self.latency)
+            return _StubResponse(self.text, str(contents))
+        return self._stream(str(contents))
+
+    def _stream(self, prompt: str):
+        pieces = self._pieces()
+        generated = ""
+        for piece in pieces:
+            time.sleep(self.latency / len(pieces))
+            generated += piece
+            yield _StubResponse(piece, prompt, generated)
+
+    async def generate_content_async(self, contents, generation_config=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return _StubResponse(self.text, str(contents))
+
+    def count_tokens(self, contents):
+        return SimpleNamespace(total_tokens=len(str(contents)) // 4)
+
+
+def make_stub_service(latency: float = 0.0, response_cache=None,
+                      max_concurrency: Optional[int] = None) -> GeminiService:
+    """GeminiService wired to a StubModel instead of the Gemini API"""
+    kwargs = {}
+    if max_concurrency is not None:
+        kwargs['max_concurrency'] = max_concurrency
+    return GeminiService("stub", response_cache=response_cache,
+                         model=StubModel(latency), **kwargs)
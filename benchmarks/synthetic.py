@@ -0,0 +1,30 @@
+"""Synthetic resume corpus for benchmarks (generated by ``sample_resumes``).
+
+    python benchmarks/synthetic.py --out corpus/ --pages 1 2 5 20
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sample_resumes import LAYOUTS, generate_corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic resume PDF corpus")
+    parser.add_argument("--out", required=True, help="Directory to write PDFs into")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 2, 5, 20])
+    parser.add_argument("--layouts", nargs="+", choices=list(LAYOUTS), default=list(LAYOUTS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for name, data in generate_corpus(args.pages, args.layouts, args.seed).items():
+        with open(os.path.join(args.out, name), "wb") as f:
+            f.write(data)
+        print(f"{name}: {len(data)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,6 @@
+import re
+from functools import lru_cache
+
 ROLE_TEMPLATES = {
     "Backend Developer": """# 💻 Technical Questions for Backend Developer
 1. Explain your experience with database design and optimization
@@ -237,17 +240,14 @@ function ItemCreator() {
         Scaling patterns"""
 }
 
-def generate_dynamic_template(role: str) -> str:
-    """Generate a template for roles not in predefined templates"""
-
-    # Common skills and concepts for different role types
-    role_patterns = {
-        "Data Scientist": {
-            "skills": ["Python", "R", "SQL", "Machine Learning", "Statistical Analysis"],
-            "tools": ["Pandas", "Scikit-learn", "TensorFlow", "PyTorch", "Jupyter"],
-            "concepts": ["Machine Learning", "Statistical Modeling", "Data Visualization", "Feature Engineering"],
-            "challenges": ["Model Implementation", "Data Pipeline Design", "Feature Selection"],
-            "code_example": """```python
+# Common skills and concepts for different role types
+ROLE_PATTERNS = {
+    "Data Scientist": {
+        "skills": ["Python", "R", "SQL", "Machine Learning", "Statistical Analysis"],
+        "tools": ["Pandas", "Scikit-learn", "TensorFlow", "PyTorch", "Jupyter"],
+        "concepts": ["Machine Learning", "Statistical Modeling", "Data Visualization", "Feature Engineering"],
+        "challenges": ["Model Implementation", "Data Pipeline Design", "Feature Selection"],
+        "code_example": """```python
 class ModelPipeline:
     def __init__(self):
         self.model = None
@@ -261,13 +261,13 @@ class ModelPipeline:
         self.model = RandomForestClassifier()
         self.model.fit(X_scaled, y)
 ```""",
-        },
-        "DevOps Engineer": {
-            "skills": ["CI/CD", "Docker", "Kubernetes", "Cloud Platforms", "Infrastructure as Code"],
-            "tools": ["Jenkins", "AWS/Azure/GCP", "Terraform", "Ansible", "Git"],
-            "concepts": ["Container Orchestration", "Infrastructure Automation", "Monitoring", "Security"],
-            "challenges": ["Pipeline Implementation", "Infrastructure Setup", "Monitoring System"],
-            "code_example": """```yaml
+    },
+    "DevOps Engineer": {
+        "skills": ["CI/CD", "Docker", "Kubernetes", "Cloud Platforms", "Infrastructure as Code"],
+        "tools": ["Jenkins", "AWS/Azure/GCP", "Terraform", "Ansible", "Git"],
+        "concepts": ["Container Orchestration", "Infrastructure Automation", "Monitoring", "Security"],
+        "challenges": ["Pipeline Implementation", "Infrastructure Setup", "Monitoring System"],
+        "code_example": """```yaml
 version: '3'
 services:
   app:
@@ -283,13 +283,13 @@ services:
     volumes:
       - db_data:/var/lib/postgresql/data
 ```""",
-        },
-        "QA Engineer": {
-            "skills": ["Test Automation", "API Testing", "Performance Testing", "Test Planning"],
-            "tools": ["Selenium", "JUnit/PyTest", "Postman", "JMeter"],
-            "concepts": ["Test Methodologies", "CI/CD Integration", "Test Coverage", "Bug Tracking"],
-            "challenges": ["Test Framework Design", "Automation Script", "Test Strategy"],
-            "code_example": """```python
+    },
+    "QA Engineer": {
+        "skills": ["Test Automation", "API Testing", "Performance Testing", "Test Planning"],
+        "tools": ["Selenium", "JUnit/PyTest", "Postman", "JMeter"],
+        "concepts": ["Test Methodologies", "CI/CD Integration", "Test Coverage", "Bug Tracking"],
+        "challenges": ["Test Framework Design", "Automation Script", "Test Strategy"],
+        "code_example": """```python
 class TestLoginFeature(unittest.TestCase):
     def setUp(self):
         self.driver = webdriver.Chrome()
@@ -300,13 +300,13 @@ class TestLoginFeature(unittest.TestCase):
         dashboard = login_page.login("user", "pass")
         self.assertTrue(dashboard.is_loaded())
 ```""",
-        },
-        "Mobile Developer": {
-            "skills": ["iOS/Android Development", "Cross-platform Development", "Mobile UI/UX", "API Integration"],
-            "tools": ["Swift/Kotlin", "React Native/Flutter", "Xcode/Android Studio", "Firebase"],
-            "concepts": ["Mobile Architecture", "State Management", "Native Features", "Performance"],
-            "challenges": ["UI Implementation", "State Management", "Native Integration"],
-            "code_example": """```swift
+    },
+    "Mobile Developer": {
+        "skills": ["iOS/Android Development", "Cross-platform Development", "Mobile UI/UX", "API Integration"],
+        "tools": ["Swift/Kotlin", "React Native/Flutter", "Xcode/Android Studio", "Firebase"],
+        "concepts": ["Mobile Architecture", "State Management", "Native Features", "Performance"],
+        "challenges": ["UI Implementation", "State Management", "Native Integration"],
+        "code_example": """```swift
 class HomeViewController: UIViewController {
     private let viewModel: HomeViewModel
 
@@ -324,16 +324,16 @@ class HomeViewController: UIViewController {
     }
 }
 ```""",
-        }
     }
+}
 
-    # Default pattern for unknown roles
-    default_pattern = {
-        "skills": ["Software Development", "Problem Solving", "System Design", "Testing"],
-        "tools": ["Relevant IDEs", "Version Control", "Project Management Tools"],
-        "concepts": ["Software Architecture", "Best Practices", "Design Patterns"],
-        "challenges": ["Implementation", "System Design", "Problem Solving"],
-        "code_example": """```python
+# Default pattern for unknown roles
+DEFAULT_PATTERN = {
+    "skills": ["Software Development", "Problem Solving", "System Design", "Testing"],
+    "tools": ["Relevant IDEs", "Version Control", "Project Management Tools"],
+    "concepts": ["Software Architecture", "Best Practices", "Design Patterns"],
+    "challenges": ["Implementation", "System Design", "Problem Solving"],
+    "code_example": """```python
 class Solution:
     def implement_feature(self):
         # Feature implementation
@@ -343,11 +343,47 @@ class Solution:
         # Edge case handling
         pass
 ```""",
-    }
+}
 
-    # Get the appropriate pattern or use default
-    pattern = role_patterns.get(role, default_pattern)
+# Other spellings of the roles above, resolved after normalize_role
+ROLE_ALIASES = {
+    "Web Developer": "Full Stack Developer",
+    "UI Developer": "Frontend Developer",
+    "Server Side Developer": "Backend Developer",
+    "iOS Developer": "Mobile Developer",
+    "Android Developer": "Mobile Developer",
+    "Site Reliability Engineer": "DevOps Engineer",
+    "SRE": "DevOps Engineer",
+    "Platform Engineer": "DevOps Engineer",
+    "Cloud Engineer": "DevOps Engineer",
+    "Machine Learning Engineer": "Data Scientist",
+    "ML Engineer": "Data Scientist",
+    "Quality Assurance Engineer": "QA Engineer",
+    "Test Engineer": "QA Engineer",
+    "Test Automation Engineer": "QA Engineer",
+    "SDET": "QA Engineer",
+}
 
+# Seniority and level words that don't change which template applies
+_SENIORITY_WORDS = frozenset({
+    "sr", "senior", "jr", "junior", "lead", "principal", "staff", "associate",
+    "intern", "mid", "level", "i", "ii", "iii", "iv"
+})
+_TITLE_WORDS = {"engineer": "developer", "dev": "developer", "programmer": "developer"}
+_NON_WORD_RE = re.compile(r"[^a-z0-9+#]+")
+_COMPOUND_RE = re.compile(r"\b(front|back|full|dev) (end|stack|ops)\b")
+
+
+def normalize_role(role: str) -> str:
+    """Canonical lookup form, e.g. "Sr. Front-end Engineer" becomes "frontend developer"
+    """
+    text = _NON_WORD_RE.sub(" ", role.casefold())
+    text = _COMPOUND_RE.sub(r"\1\2", text)
+    return " ".join(_TITLE_WORDS.get(word, word) for word in text.split()
+                    if word not in _SENIORITY_WORDS)
+
+
+def _render_dynamic_template(role: str, pattern: dict) -> str:
     # Generate the template
     return f"""# 💻 Technical Questions for {role}
 
@@ -406,8 +442,35 @@ class Solution:
    - Best practices
    - Performance optimization"""
 
+
+def generate_dynamic_template(role: str) -> str:
+    """Generate a template for roles not in predefined templates"""
+    rendered = _PATTERN_TEMPLATES.get(role)
+    if rendered is not None:
+        return rendered
+    return _render_dynamic_template(role, DEFAULT_PATTERN)
+
+
+# Built once at import: every known role rendered, and every normalized
+# spelling (names and aliases) mapped to its rendered template
+_PATTERN_TEMPLATES = {role: _render_dynamic_template(role, pattern)
+                      for role, pattern in ROLE_PATTERNS.items()}
+_ROLE_INDEX = {}
+for _role, _template in (*ROLE_TEMPLATES.items(), *_PATTERN_TEMPLATES.items()):
+    _ROLE_INDEX[normalize_role(_role)] = _template
+for _alias, _role in ROLE_ALIASES.items():
+    _ROLE_INDEX[normalize_role(_alias)] = ROLE_TEMPLATES.get(_role) or _PATTERN_TEMPLATES[_role]
+del _role, _template, _alias
+
+
+@lru_cache(maxsize=1024)
 def get_role_template(role: str) -> str:
-    """Get the template for a specific role"""
-    if role in ROLE_TEMPLATES:
-        return ROLE_TEMPLATES[role]
-    return generate_dynamic_template(role)
\ No newline at end of file
+    """Get the template for a specific role.
+
+    Matching ignores case, punctuation and seniority ("Sr. Front-end Engineer"
+    gets the Frontend Developer template); results are memoized per role string.
+    """
+    template = _ROLE_INDEX.get(normalize_role(role))
+    if template is not None:
+        return template
+    return generate_dynamic_template(role)
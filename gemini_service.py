@@ -1,51 +1,709 @@
-import google.generativeai as genai
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Dict, Iterator, List, Optional, Tuple
+import asyncio
 import time
+import weakref
+
+from fallback_templates import get_role_template
+from llm_utils import LLMUtils
+from metrics import metrics, record_usage
+from prompts import estimate_tokens, normalize_whitespace
+from resilience import (
+    CircuitBreaker, CircuitOpenError, LatencyTracker, RetryPolicy, is_transient_error
+)
+from response_cache import ResponseCache
+from singleflight import FlightAbandonedError, SingleFlight
+
+MODEL_NAME = 'gemini-2.0-flash'
+DEFAULT_MAX_CONCURRENCY = 8
+# How long a request waits on an identical in-flight request before giving up
+DEFAULT_COALESCE_TIMEOUT = 120.0
+
+# Output length per guide mode: the max_output_tokens cap plus a length hint for
+# the model so it plans for the cap instead of being cut off mid-section
+GUIDE_MODES = {
+    'short': {'max_output_tokens': 1024,
+              'hint': "Keep it brief: 2-3 items per section, no long code samples."},
+    'standard': {'max_output_tokens': 2048, 'hint': ""},
+    'deep': {'max_output_tokens': 8192,
+             'hint': "Go deep: 6-8 items per section, with worked examples and follow-up questions."},
+}
+DEFAULT_GUIDE_MODE = 'standard'
+
+# Sections requested by STATIC_PROMPT_PREFIX, in the order a merged guide uses
+GUIDE_SECTIONS = [
+    "Technical Questions",
+    "Coding Challenges",
+    "System Design Questions",
+    "Key Concepts",
+    "Preparation Steps",
+]
+# Rounds of per-section requests (the first try plus retries of failed sections)
+SECTION_ATTEMPTS = 2
+MISSING_SECTION_NOTE = "_This section could not be generated right now._"
+
+# Role-independent instructions, kept as a byte-identical prefix of every
+# request so server-side prefix caching can reuse it
+STATIC_PROMPT_PREFIX = """As an expert technical interviewer, create a detailed interview guide for the position described below.
+
+Please provide a structured response with the following sections:
+# Technical Questions
+# Coding Challenges
+# System Design Questions
+# Key Concepts
+# Preparation Steps
+
+Focus on practical, real-world scenarios and provide specific examples.
+
+"""
+
+# Failures are reported to callers as text rather than raised
+FAILED_RESPONSE = "Failed to generate response."
+ERROR_PREFIX = "Error generating response"
+
+# Prepended to the role template served when the API is unavailable
+FALLBACK_NOTICE = ("> The AI service is unavailable right now, "
+                   "so this is a standard guide for the role.\n\n")
+# Prepended to the role template shown while a guide over its latency budget finishes
+PROVISIONAL_NOTICE = ("> Your personalized guide is taking longer than usual; "
+                      "here is a standard guide for the role in the meantime.\n\n")
+
+
+def is_error_response(response: str) -> bool:
+    """True when a generate_* result is a failure message rather than a guide"""
+    return not response or response == FAILED_RESPONSE or response.startswith(ERROR_PREFIX)
+
+
+def is_partial_response(response: str) -> bool:
+    """True when a merged per-section guide is missing at least one section"""
+    return bool(response) and MISSING_SECTION_NOTE in response
+
+
+def is_fallback_response(response: str) -> bool:
+    """True when a generate_* result is the canned role template rather than a model answer"""
+    return bool(response) and response.startswith((FALLBACK_NOTICE, PROVISIONAL_NOTICE))
 
 class GeminiService:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, response_cache: Optional[ResponseCache] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 request_timeout: Optional[float] = None,
+                 model=None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 hedge_percentile: Optional[float] = None,
+                 fallback_on_error: bool = True,
+                 coalesce_timeout: Optional[float] = DEFAULT_COALESCE_TIMEOUT):
+        """
+        ``hedge_percentile`` (e.g. 0.95) enables hedging: a second identical request
+        is sent once the first has run longer than that percentile of recent
+        latencies, and whichever answers first wins. ``fallback_on_error`` serves
+        the role template instead of an error message when the API fails.
+        ``coalesce_timeout`` bounds how long a request waits for an identical one
+        that is already in flight.
+        """
+        self.model_name = MODEL_NAME
+        self.response_cache = response_cache
+        self.max_concurrency = max_concurrency
+        self.request_timeout = request_timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.hedge_percentile = hedge_percentile
+        self.fallback_on_error = fallback_on_error
+        self.latency = LatencyTracker()
+        self.coalesce_timeout = coalesce_timeout
+        self._flights = SingleFlight()
+        # Sync hedging runs both requests in worker threads
+        self._hedge_pool = None
+        if hedge_percentile is not None:
+            self._hedge_pool = ThreadPoolExecutor(max_workers=2 * max_concurrency,
+                                                  thread_name_prefix="gemini-hedge")
+        # Runs guides that outlived their latency budget to completion
+        self._background_pool = ThreadPoolExecutor(max_workers=4 * max_concurrency,
+                                                   thread_name_prefix="gemini-background")
+        # Runs the per-section requests of generate_response_sections
+        self._section_pool = ThreadPoolExecutor(max_workers=max_concurrency,
+                                                thread_name_prefix="gemini-section")
+        self.llm_utils = LLMUtils()
+        # asyncio primitives are bound to one event loop, so keep one semaphore per loop
+        self._semaphores = weakref.WeakKeyDictionary()
+        self.generation_config = {
+            'temperature': 0.7,
+            'top_p': 0.95,
+            'top_k': 40,
+            'max_output_tokens': 2048,
+            'candidate_count': 1
+        }
+
+        # A pre-built model (e.g. the benchmark stub) skips SDK setup entirely
+        self._genai = None
+        if model is not None:
+            self.model = model
+            return
+
+        # Imported here so importing this module (e.g. on every Streamlit rerun) stays cheap
+        import google.generativeai as genai
+        self._genai = genai
         genai.configure(api_key=api_key)
-        
+
         # Initialize with Gemini 2.0 Flash model
         try:
-            self.model = genai.GenerativeModel('gemini-2.0-flash')
+            self.model = genai.GenerativeModel(self.model_name)
         except Exception as e:
             print(f"Error initializing Gemini model: {str(e)}")
             raise
 
-    def generate_response(self, prompt: str, role: str) -> str:
-        try:
-            # Enhanced prompt for better structure
-            structured_prompt = f"""As an expert technical interviewer, create a detailed interview guide for a {role} position.
+    def build_prompt(self, prompt: str, role: str, mode: str = DEFAULT_GUIDE_MODE,
+                     section: Optional[str] = None) -> str:
+        """Wrap the candidate context in the structured interview-guide instructions.
+
+        With ``section``, the model is asked for that one section of the guide only.
+        """
+        hint = GUIDE_MODES[mode]['hint']
+        length = f"\nLength: {hint}" if hint else ""
+        if section is not None:
+            length += f'\nSection: Write only the "# {section}" section, starting with that heading.'
+        return STATIC_PROMPT_PREFIX + f"""Position: {normalize_whitespace(role)}{length}
 
 Context:
-{prompt}
+{prompt.strip()}"""
 
-Please provide a structured response with the following sections:
-# Technical Questions
-# Coding Challenges
-# System Design Questions
-# Key Concepts
-# Preparation Steps
+    def _mode_config(self, mode: str) -> dict:
+        """Generation config for a guide mode"""
+        if mode not in GUIDE_MODES:
+            raise ValueError(f"Unknown guide mode {mode!r}; expected one of {', '.join(GUIDE_MODES)}")
+        return dict(self.generation_config, max_output_tokens=GUIDE_MODES[mode]['max_output_tokens'])
 
-Focus on practical, real-world scenarios and provide specific examples."""
+    def prompt_overhead_tokens(self, role: str, mode: str = DEFAULT_GUIDE_MODE,
+                               sections: bool = False) -> int:
+        """Estimated tokens ``build_prompt`` adds around the candidate context.
 
-            # Generate response with Gemini 2.0 Flash
+        With ``sections``, the overhead of the longest per-section prompt.
+        """
+        if not sections:
+            return estimate_tokens(self.build_prompt("", role, mode))
+        return max(estimate_tokens(self.build_prompt("", role, mode, section=section))
+                   for section in GUIDE_SECTIONS)
+
+    def _generation_config(self, config: dict):
+        if self._genai is None:
+            return dict(config)
+        return self._genai.types.GenerationConfig(**config)
+
+    def _record_call(self, method: str, status: str, started: float, response=None) -> None:
+        """Latency, outcome and token usage of one API call"""
+        duration = time.perf_counter() - started
+        metrics.increment("gemini_requests_total", method=method, status=status)
+        metrics.observe("gemini_request_duration_seconds", duration, method=method)
+        tokens = record_usage(getattr(response, 'usage_metadata', None), model=self.model_name)
+        metrics.log("gemini_call", method=method, status=status,
+                    duration_ms=round(duration * 1000, 3), model=self.model_name, **tokens)
+
+    def _cache_key(self, structured_prompt: str, config: dict) -> Optional[str]:
+        """Response-cache key for a structured prompt, or None when caching is off"""
+        if self.response_cache is None:
+            return None
+        return ResponseCache.make_key(structured_prompt, self.model_name, config)
+
+    def response_cache_key(self, prompt: str, role: str, mode: str = DEFAULT_GUIDE_MODE) -> Optional[str]:
+        """Key a whole guide for this request is cached under, or None when caching is off"""
+        return self._cache_key(self.build_prompt(prompt, role, mode), self._mode_config(mode))
+
+    def _fallback(self, role: str, reason: str, error_message: str) -> str:
+        """The role template when fallback is enabled, otherwise the error message"""
+        if not self.fallback_on_error:
+            return error_message
+        metrics.increment("gemini_fallbacks_total", reason=reason)
+        return FALLBACK_NOTICE + get_role_template(normalize_whitespace(role))
+
+    def _request_options(self) -> dict:
+        """Per-call deadline for the sync SDK methods"""
+        if self.request_timeout is None:
+            return {}
+        return {'request_options': {'timeout': self.request_timeout}}
+
+    def _hedge_delay(self) -> Optional[float]:
+        if self.hedge_percentile is None:
+            return None
+        return self.latency.percentile(self.hedge_percentile)
+
+    def _record_failure(self, exc: BaseException, permit: object) -> None:
+        """Only transient failures count towards opening the circuit breaker"""
+        if is_transient_error(exc):
+            self.circuit_breaker.record_failure(permit)
+        else:
+            self.circuit_breaker.release(permit)
+
+    def _call(self, method: str, structured_prompt: str, config: dict) -> str:
+        """One ``generate_content`` request; raises on failure"""
+        started = time.perf_counter()
+        try:
             response = self.model.generate_content(
                 contents=structured_prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.7,
-                    top_p=0.95,
-                    top_k=40,
-                    max_output_tokens=2048,
-                    candidate_count=1
+                generation_config=self._generation_config(config),
+                **self._request_options()
+            )
+            text = response.text
+        except Exception:
+            self._record_call(method, "error", started)
+            raise
+        self._record_call(method, "ok", started, response)
+        self.latency.record(time.perf_counter() - started)
+        return text
+
+    def _call_hedged(self, structured_prompt: str, config: dict) -> str:
+        """``_call``, plus a duplicate request if the first runs past the hedge delay"""
+        delay = self._hedge_delay()
+        if delay is None:
+            return self._call("generate", structured_prompt, config)
+        first = self._hedge_pool.submit(self._call, "generate", structured_prompt, config)
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+        metrics.increment("gemini_hedged_requests_total", method="generate")
+        # The slower request cannot be cancelled mid-flight; its result is dropped
+        second = self._hedge_pool.submit(self._call, "hedge", structured_prompt, config)
+        error = None
+        for future in as_completed([first, second]):
+            if future.exception() is None:
+                return future.result()
+            error = error or future.exception()
+        raise error
+
+    def _run_with_retries(self, method: str, call):
+        """Run ``call`` behind the circuit breaker, retrying transient errors with backoff"""
+        attempt = 0
+        while True:
+            permit = self.circuit_breaker.allow_request()
+            if permit is None:
+                raise CircuitOpenError("circuit breaker open")
+            try:
+                result = call()
+            except Exception as e:
+                self._record_failure(e, permit)
+                if not self.retry_policy.should_retry(attempt, e):
+                    raise
+                metrics.increment("gemini_retries_total", method=method)
+                time.sleep(self.retry_policy.delay(attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                # Interrupted without an outcome; don't hold a half-open probe slot
+                self.circuit_breaker.release(permit)
+                raise
+            self.circuit_breaker.record_success(permit)
+            return result
+
+    def _flight_key(self, structured_prompt: str, config: dict, cache_key: Optional[str]) -> str:
+        """Identical structured prompts (same resume skills, company and role) share one call"""
+        return cache_key or ResponseCache.make_key(structured_prompt, self.model_name, config)
+
+    def _coalesce_failure(self, role: str, exc: Exception) -> str:
+        """Result for a caller whose coalesced call timed out or was abandoned"""
+        print(f"Waiting for an identical Gemini request failed: {str(exc)}")
+        return self._fallback(role, "coalesce", f"{ERROR_PREFIX}: {str(exc)}")
+
+    def generate_response(self, prompt: str, role: str, bypass_cache: bool = False,
+                          mode: str = DEFAULT_GUIDE_MODE) -> str:
+        """Generate an interview guide, serving identical requests from the response cache.
+
+        ``bypass_cache`` skips the lookup (e.g. "regenerate") and always makes its
+        own API call, but still stores the fresh result. Other concurrent
+        identical requests share a single API call.
+        Transient API errors are retried; if the API stays down (or the circuit
+        breaker is open) the role template is returned instead. ``mode`` (one of
+        ``GUIDE_MODES``) sets the guide length and its ``max_output_tokens``.
+        """
+        # Enhanced prompt for better structure
+        config = self._mode_config(mode)
+        structured_prompt = self.build_prompt(prompt, role, mode)
+        return self._generate_cached(structured_prompt, config, role, bypass_cache)
+
+    def _generate_cached(self, structured_prompt: str, config: dict, role: str,
+                         bypass_cache: bool) -> str:
+        """Response cache, then a coalesced ``_generate``"""
+        cache_key = self._cache_key(structured_prompt, config)
+        if cache_key is not None and not bypass_cache:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        generate = lambda: self._generate(structured_prompt, config, role, cache_key)
+        if bypass_cache:
+            # A regenerate must not be handed the in-flight answer it is replacing
+            return generate()
+        try:
+            return self._flights.do(
+                self._flight_key(structured_prompt, config, cache_key),
+                generate,
+                timeout=self.coalesce_timeout
+            )
+        except TimeoutError as e:
+            return self._coalesce_failure(role, e)
+
+    def _generate(self, structured_prompt: str, config: dict, role: str,
+                  cache_key: Optional[str]) -> str:
+        try:
+            # Generate response with Gemini 2.0 Flash
+            text = self._run_with_retries("generate", lambda: self._call_hedged(structured_prompt, config))
+
+            if text:
+                if cache_key is not None:
+                    self.response_cache.put(cache_key, text)
+                return text
+            return self._fallback(role, "empty", FAILED_RESPONSE)
+
+        except CircuitOpenError:
+            return self._fallback(role, "circuit_open", f"{ERROR_PREFIX}: service temporarily unavailable")
+        except Exception as e:
+            print(f"Error in Gemini API call: {str(e)}")
+            return self._fallback(role, "error", f"{ERROR_PREFIX}: {str(e)}")
+
+    def generate_response_within(self, prompt: str, role: str, budget: float,
+                                 bypass_cache: bool = False,
+                                 mode: str = DEFAULT_GUIDE_MODE,
+                                 sections: bool = False) -> Tuple[str, Optional[Future]]:
+        """``generate_response`` (or, with ``sections``, ``generate_response_sections``)
+        with a latency budget in seconds.
+
+        Returns ``(response, pending)``. If the guide is ready within ``budget``,
+        ``pending`` is None. Otherwise ``response`` is the role template and
+        ``pending`` is a Future for the guide, which keeps generating in the
+        background (and fills the response cache) rather than being cancelled.
+        """
+        generate = self.generate_response_sections if sections else self.generate_response
+        future = self._background_pool.submit(generate, prompt, role, bypass_cache, mode)
+        try:
+            response = future.result(timeout=budget)
+        except FuturesTimeoutError:
+            metrics.increment("gemini_latency_budget_total", outcome="exceeded")
+            return PROVISIONAL_NOTICE + get_role_template(normalize_whitespace(role)), future
+        metrics.increment("gemini_latency_budget_total", outcome="met")
+        return response, None
+
+    def generate_response_stream(self, prompt: str, role: str, bypass_cache: bool = False,
+                                 mode: str = DEFAULT_GUIDE_MODE) -> Iterator[str]:
+        """Yield the interview guide in chunks as the model produces them.
+
+        A cache hit is yielded as a single chunk; a completed stream is stored in
+        the response cache just like ``generate_response``. Concurrent identical
+        requests follow one shared stream. A stream is only retried (or replaced by
+        the role template) if it fails before its first chunk.
+        """
+        config = self._mode_config(mode)
+        structured_prompt = self.build_prompt(prompt, role, mode)
+
+        cache_key = self._cache_key(structured_prompt, config)
+        if cache_key is not None and not bypass_cache:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        generate = lambda: self._generate_stream(structured_prompt, config, role, cache_key)
+        if bypass_cache:
+            yield from generate()
+            return
+
+        received = False
+        try:
+            for chunk in self._flights.stream(
+                self._flight_key(structured_prompt, config, cache_key),
+                generate,
+                timeout=self.coalesce_timeout
+            ):
+                received = True
+                yield chunk
+        except (TimeoutError, FlightAbandonedError) as e:
+            if received:
+                yield f"{ERROR_PREFIX}: {str(e)}"
+            else:
+                yield self._coalesce_failure(role, e)
+
+    def _generate_stream(self, structured_prompt: str, config: dict, role: str,
+                         cache_key: Optional[str]) -> Iterator[str]:
+        chunks = []
+        try:
+            attempt = 0
+            while True:
+                permit = self.circuit_breaker.allow_request()
+                if permit is None:
+                    raise CircuitOpenError("circuit breaker open")
+                started = time.perf_counter()
+                chunk = None
+                try:
+                    response = self.model.generate_content(
+                        contents=structured_prompt,
+                        generation_config=self._generation_config(config),
+                        stream=True,
+                        **self._request_options()
+                    )
+                    for chunk in response:
+                        text = chunk.text
+                        if text:
+                            if not chunks:
+                                metrics.observe("gemini_time_to_first_chunk_seconds",
+                                                time.perf_counter() - started)
+                            chunks.append(text)
+                            yield text
+                except Exception as e:
+                    self._record_call("stream", "error", started)
+                    self._record_failure(e, permit)
+                    if chunks or not self.retry_policy.should_retry(attempt, e):
+                        raise
+                    metrics.increment("gemini_retries_total", method="stream")
+                    time.sleep(self.retry_policy.delay(attempt))
+                    attempt += 1
+                    continue
+                except BaseException:
+                    # GeneratorExit: the consumer closed the stream (a rerun or a
+                    # page left mid-guide). There is no outcome to record, but a
+                    # half-open probe slot must not stay taken
+                    self.circuit_breaker.release(permit)
+                    raise
+                break
+
+            # Usage metadata arrives with the final chunk
+            self._record_call("stream", "ok", started, chunk)
+            self.circuit_breaker.record_success(permit)
+
+            if not chunks:
+                yield self._fallback(role, "empty", FAILED_RESPONSE)
+            elif cache_key is not None:
+                self.response_cache.put(cache_key, "".join(chunks))
+
+        except CircuitOpenError:
+            yield self._fallback(role, "circuit_open", f"{ERROR_PREFIX}: service temporarily unavailable")
+        except Exception as e:
+            print(f"Error in Gemini API call: {str(e)}")
+            if chunks:
+                # Part of the guide is already on screen; don't append a template to it
+                yield f"{ERROR_PREFIX}: {str(e)}"
+            else:
+                yield self._fallback(role, "error", f"{ERROR_PREFIX}: {str(e)}")
+
+    def _section_request(self, prompt: str, role: str, mode: str, section: str) -> Tuple[str, dict]:
+        """Structured prompt and generation config for one section of the guide"""
+        config = self._mode_config(mode)
+        # Each section is about a fifth of the guide; leave twice that as headroom
+        config['max_output_tokens'] = 2 * config['max_output_tokens'] // len(GUIDE_SECTIONS)
+        return self.build_prompt(prompt, role, mode, section=section), config
+
+    def _section_text(self, text: str, section: str) -> Optional[str]:
+        """Just the requested section of a per-section response, or None if it has none.
+
+        Models sometimes write more of the guide than the one section asked
+        for; anything from the next guide heading on is dropped so the merged
+        guide has each section once.
+        """
+        if is_error_response(text) or is_fallback_response(text):
+            return None
+        others = [name for name in GUIDE_SECTIONS if name != section]
+        if not self.llm_utils.validate_section(text, section, others):
+            return None
+        return self.llm_utils.extract_section(text, section, others)
+
+    def _merge_sections(self, role: str, texts: Dict[str, str], missing: List[str]) -> str:
+        """Join generated sections in ``GUIDE_SECTIONS`` order, noting any that failed"""
+        if missing:
+            metrics.increment("gemini_sections_missing_total", len(missing))
+            if not texts:
+                return self._fallback(role, "sections", f"{ERROR_PREFIX}: no guide section could be generated")
+        parts = []
+        for section in GUIDE_SECTIONS:
+            text = texts.get(section)
+            parts.append(text if text else f"# {section}\n{MISSING_SECTION_NOTE}")
+        return "\n\n".join(parts)
+
+    def generate_response_sections(self, prompt: str, role: str, bypass_cache: bool = False,
+                                   mode: str = DEFAULT_GUIDE_MODE) -> str:
+        """Generate each guide section as its own concurrent request and merge them.
+
+        Latency follows the slowest section rather than one long generation.
+        Sections that fail or don't validate are retried on their own (bypassing
+        the cache); any still missing are marked as such in the merged guide.
+        """
+        texts = {}
+        missing = list(GUIDE_SECTIONS)
+        for attempt in range(SECTION_ATTEMPTS):
+            futures = {
+                section: self._section_pool.submit(
+                    self._generate_cached, *self._section_request(prompt, role, mode, section),
+                    role, bypass_cache or attempt > 0
+                )
+                for section in missing
+            }
+            for section, future in futures.items():
+                text = self._section_text(future.result(), section)
+                if text is not None:
+                    texts[section] = text
+            missing = [section for section in missing if section not in texts]
+            if not missing:
+                break
+            if attempt + 1 < SECTION_ATTEMPTS:
+                metrics.increment("gemini_section_retries_total", len(missing))
+        return self._merge_sections(role, texts, missing)
+
+    def _async_semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limiter for the running event loop"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def _call_async(self, method: str, structured_prompt: str, config: dict,
+                          timeout: Optional[float]) -> str:
+        """One ``generate_content_async`` request within the concurrency limit; raises on failure"""
+        async with self._async_semaphore():
+            started = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(
+                    self.model.generate_content_async(
+                        contents=structured_prompt,
+                        generation_config=self._generation_config(config)
+                    ),
+                    timeout=timeout
                 )
+                text = response.text
+            except asyncio.TimeoutError:
+                self._record_call(method, "timeout", started)
+                raise
+            except Exception:
+                self._record_call(method, "error", started)
+                raise
+        self._record_call(method, "ok", started, response)
+        self.latency.record(time.perf_counter() - started)
+        return text
+
+    async def _call_hedged_async(self, structured_prompt: str, config: dict,
+                                 timeout: Optional[float]) -> str:
+        delay = self._hedge_delay()
+        first = asyncio.ensure_future(self._call_async("async", structured_prompt, config, timeout))
+        if delay is None:
+            return await first
+        pending = {first}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return first.result()
+            metrics.increment("gemini_hedged_requests_total", method="async")
+            pending.add(asyncio.ensure_future(self._call_async("hedge", structured_prompt, config, timeout)))
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _run_with_retries_async(self, method: str, call):
+        """Async ``_run_with_retries``; ``call`` returns a fresh awaitable per attempt"""
+        attempt = 0
+        while True:
+            permit = self.circuit_breaker.allow_request()
+            if permit is None:
+                raise CircuitOpenError("circuit breaker open")
+            try:
+                result = await call()
+            except Exception as e:
+                self._record_failure(e, permit)
+                if not self.retry_policy.should_retry(attempt, e):
+                    raise
+                metrics.increment("gemini_retries_total", method=method)
+                await asyncio.sleep(self.retry_policy.delay(attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                # Cancelled without an outcome; don't hold a half-open probe slot
+                self.circuit_breaker.release(permit)
+                raise
+            self.circuit_breaker.record_success(permit)
+            return result
+
+    async def generate_response_async(self, prompt: str, role: str, bypass_cache: bool = False,
+                                      timeout: Optional[float] = None,
+                                      mode: str = DEFAULT_GUIDE_MODE) -> str:
+        """Async ``generate_response``: at most ``max_concurrency`` calls in flight per loop.
+
+        ``timeout`` (default ``request_timeout``) bounds each API call only, not the
+        time spent waiting for a concurrency slot or backing off between retries.
+        Concurrent identical requests on the same loop share a single call.
+        """
+        timeout = self.request_timeout if timeout is None else timeout
+        config = self._mode_config(mode)
+        structured_prompt = self.build_prompt(prompt, role, mode)
+        return await self._generate_cached_async(structured_prompt, config, role, bypass_cache, timeout)
+
+    async def _generate_cached_async(self, structured_prompt: str, config: dict, role: str,
+                                     bypass_cache: bool, timeout: Optional[float]) -> str:
+        """Async ``_generate_cached``"""
+        cache_key = self._cache_key(structured_prompt, config)
+        if cache_key is not None and not bypass_cache:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        generate = lambda: self._generate_async(structured_prompt, config, role, cache_key, timeout)
+        if bypass_cache:
+            return await generate()
+        try:
+            return await self._flights.do_async(
+                self._flight_key(structured_prompt, config, cache_key),
+                generate,
+                timeout=self.coalesce_timeout
+            )
+        except TimeoutError as e:
+            return self._coalesce_failure(role, e)
+
+    async def generate_response_sections_async(self, prompt: str, role: str,
+                                               bypass_cache: bool = False,
+                                               timeout: Optional[float] = None,
+                                               mode: str = DEFAULT_GUIDE_MODE) -> str:
+        """Async ``generate_response_sections``; sections share the per-loop concurrency limit"""
+        timeout = self.request_timeout if timeout is None else timeout
+        texts = {}
+        missing = list(GUIDE_SECTIONS)
+        for attempt in range(SECTION_ATTEMPTS):
+            results = await asyncio.gather(*(
+                self._generate_cached_async(*self._section_request(prompt, role, mode, section),
+                                            role, bypass_cache or attempt > 0, timeout)
+                for section in missing
+            ))
+            for section, result in zip(missing, results):
+                text = self._section_text(result, section)
+                if text is not None:
+                    texts[section] = text
+            missing = [section for section in missing if section not in texts]
+            if not missing:
+                break
+            if attempt + 1 < SECTION_ATTEMPTS:
+                metrics.increment("gemini_section_retries_total", len(missing))
+        return self._merge_sections(role, texts, missing)
+
+    async def _generate_async(self, structured_prompt: str, config: dict, role: str,
+                              cache_key: Optional[str], timeout: Optional[float]) -> str:
+        try:
+            text = await self._run_with_retries_async(
+                "async", lambda: self._call_hedged_async(structured_prompt, config, timeout)
             )
 
-            if response.text:
-                return response.text
-            return "Failed to generate response."
+            if text:
+                if cache_key is not None:
+                    self.response_cache.put(cache_key, text)
+                return text
+            return self._fallback(role, "empty", FAILED_RESPONSE)
 
+        except CircuitOpenError:
+            return self._fallback(role, "circuit_open", f"{ERROR_PREFIX}: service temporarily unavailable")
+        except asyncio.TimeoutError:
+            print(f"Gemini API call timed out after {timeout}s")
+            return self._fallback(role, "timeout", f"{ERROR_PREFIX}: timed out after {timeout}s")
         except Exception as e:
             print(f"Error in Gemini API call: {str(e)}")
-            return f"Error generating response: {str(e)}"
\ No newline at end of file
+            return self._fallback(role, "error", f"{ERROR_PREFIX}: {str(e)}")
@@ -0,0 +1,235 @@
+"""Persistent queue of analysis jobs shared by the app and the workers.
+
+The app submits a job (the PDF plus company, role and guide mode) and polls it
+by id; ``worker.py`` processes claim queued jobs, report progress (the current
+stage and the guide so far) and store the result. Jobs live in SQLite, so they
+survive app reruns, browser refreshes and worker restarts: a running job whose
+worker stops sending heartbeats is queued again.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from metrics import metrics
+
+DEFAULT_QUEUE_PATH = os.path.join(".cache", "jobs.sqlite3")
+# A running job with no heartbeat for this long is given to another worker
+DEFAULT_STALE_AFTER = 60.0
+DEFAULT_MAX_ATTEMPTS = 3
+# Finished jobs are kept this long for the app to pick up
+DEFAULT_RETENTION_SECONDS = 24 * 3600
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+FINISHED_STATUSES = (DONE, FAILED)
+
+_JOB_COLUMNS = ("id, status, company, role, mode, bypass_cache, stage, partial, result, error, "
+                "attempts, worker, created_at, started_at, heartbeat_at, finished_at")
+
+
+class JobQueue:
+    """SQLite-backed job queue; safe to share between threads and processes"""
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH, stale_after: float = DEFAULT_STALE_AFTER,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = path
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Autocommit; claim() takes the write lock explicitly
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        # Readers (polling UIs) do not block the writing workers
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                company TEXT NOT NULL,
+                role TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                bypass_cache INTEGER NOT NULL,
+                pdf BLOB,
+                stage TEXT,
+                partial TEXT,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                heartbeat_at REAL,
+                finished_at REAL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)"
+        )
+
+    def submit(self, pdf_bytes: bytes, company: str, role: str, mode: str,
+               bypass_cache: bool = False) -> str:
+        """Queue an analysis and return its job id"""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, company, role, mode, bypass_cache, pdf, stage, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, company, role, mode, int(bypass_cache), pdf_bytes,
+                 "Waiting for a worker", time.time())
+            )
+        metrics.increment("jobs_total", event="submitted")
+        return job_id
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """Take the oldest queued job (with its PDF) for ``worker``, or None if there is none"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    f"SELECT {_JOB_COLUMNS}, pdf FROM jobs WHERE status = ? "
+                    "ORDER BY created_at LIMIT 1",
+                    (QUEUED,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, "
+                        "started_at = ?, heartbeat_at = ?, stage = ? WHERE id = ?",
+                        (RUNNING, worker, now, now, "Starting", row['id'])
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        metrics.observe("job_queue_wait_seconds", now - row['created_at'])
+        job = self._job(row)
+        job.update(status=RUNNING, worker=worker, attempts=job['attempts'] + 1,
+                   started_at=now, heartbeat_at=now, stage="Starting")
+        return job
+
+    def progress(self, job_id: str, stage: Optional[str] = None,
+                 partial: Optional[str] = None) -> None:
+        """Record the current stage and/or the guide so far; also counts as a heartbeat"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET stage = COALESCE(?, stage), partial = COALESCE(?, partial), "
+                "heartbeat_at = ? WHERE id = ? AND status = ?",
+                (stage, partial, time.time(), job_id, RUNNING)
+            )
+
+    def heartbeat(self, job_id: str) -> None:
+        self.progress(job_id)
+
+    def complete(self, job_id: str, worker: str, result: Dict[str, Any]) -> bool:
+        """Store the result of a job ``worker`` is running; its PDF is dropped.
+
+        Returns False (and changes nothing) if the job is no longer running on
+        ``worker``, e.g. it was requeued or failed after its heartbeats stopped.
+        """
+        return self._finish(job_id, worker, DONE, result=json.dumps(result))
+
+    def fail(self, job_id: str, worker: str, error: str) -> bool:
+        """Mark a job ``worker`` is running failed with a message for the user; its PDF
+        is dropped. Returns False if the job is no longer running on ``worker``."""
+        return self._finish(job_id, worker, FAILED, error=error)
+
+    def _finish(self, job_id: str, worker: str, status: str, result: Optional[str] = None,
+                error: Optional[str] = None) -> bool:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT started_at FROM jobs WHERE id = ? AND status = ? AND worker = ?",
+                (job_id, RUNNING, worker)
+            ).fetchone()
+            updated = self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, pdf = NULL, partial = NULL, "
+                "stage = NULL, finished_at = ? WHERE id = ? AND status = ? AND worker = ?",
+                (status, result, error, now, job_id, RUNNING, worker)
+            ).rowcount
+        if not updated:
+            metrics.increment("jobs_total", event="finished_late")
+            return False
+        metrics.increment("jobs_total", event=status)
+        if row is not None and row['started_at'] is not None:
+            metrics.observe("job_run_seconds", now - row['started_at'], status=status)
+        return True
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job's status, stage, partial guide and result (without its PDF), or None"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return None if row is None else self._job(row)
+
+    def position(self, job_id: str) -> int:
+        """Number of queued jobs ahead of this one"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND created_at < "
+                "(SELECT created_at FROM jobs WHERE id = ?)",
+                (QUEUED, job_id)
+            ).fetchone()
+        return row[0]
+
+    def requeue_stale(self) -> int:
+        """Queue running jobs whose worker stopped sending heartbeats again (or fail them
+        after ``max_attempts``); returns how many were requeued"""
+        cutoff = time.time() - self.stale_after
+        with self._lock:
+            failed = self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, pdf = NULL, partial = NULL, stage = NULL, "
+                "finished_at = ? WHERE status = ? AND heartbeat_at < ? AND attempts >= ?",
+                (FAILED, "The analysis stopped unexpectedly. Please try again.", time.time(),
+                 RUNNING, cutoff, self.max_attempts)
+            ).rowcount
+            requeued = self._conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, stage = ?, partial = NULL "
+                "WHERE status = ? AND heartbeat_at < ?",
+                (QUEUED, "Waiting for a worker", RUNNING, cutoff)
+            ).rowcount
+        if failed:
+            metrics.increment("jobs_total", value=failed, event=FAILED)
+        if requeued:
+            metrics.increment("jobs_total", value=requeued, event="requeued")
+        return requeued
+
+    def purge(self, older_than: float = DEFAULT_RETENTION_SECONDS) -> int:
+        """Delete jobs that finished more than ``older_than`` seconds ago"""
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        with self._lock:
+            return self._conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({placeholders}) AND finished_at < ?",
+                (*FINISHED_STATUSES, time.time() - older_than)
+            ).rowcount
+
+    def stats(self) -> Dict[str, int]:
+        """Number of jobs in each status"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _job(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job['bypass_cache'] = bool(job['bypass_cache'])
+        if job['result'] is not None:
+            job['result'] = json.loads(job['result'])
+        return job
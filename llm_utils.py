@@ -1,7 +1,10 @@
 import re
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 from fallback_templates import get_role_template
 
+# Runs of spaces/tabs inside a line (leading indentation is kept)
+_INNER_SPACE_RE = re.compile(r'(?<=\S)[ \t]{2,}')
+
 class LLMUtils:
     def validate_response(self, response: str) -> bool:
         """Validate the response meets minimum requirements"""
@@ -17,17 +20,10 @@ class LLMUtils:
         try:
             # Debug print
             print(f"Cleaning text of length: {len(generated_text)}")
-            
-            # Remove the prompt from the beginning
-            if prompt in generated_text:
-                response = generated_text[len(prompt):].strip()
-            else:
-                response = generated_text.strip()
-
-            # Basic cleaning
-            response = re.sub(r'\n{3,}', '\n\n', response)
-            response = re.sub(r'\s{2,}', ' ', response)
-            
+
+            cleaner = ResponseCleaner(prompt)
+            response = cleaner.feed(generated_text) + cleaner.finish()
+
             # Debug print
             print(f"Cleaned text length: {len(response)}")
             
@@ -37,6 +33,21 @@ class LLMUtils:
             print(f"Error cleaning response: {str(e)}")
             return generated_text
 
+    def clean_stream(self, chunks: Iterable[str], prompt: str = "",
+                     on_section: Optional[Callable[[str, List[str]], None]] = None) -> Iterator[str]:
+        """``clean_response`` for streamed text: yield cleaned text as each chunk arrives.
+
+        ``on_section(name, lines)`` is called for every section as soon as it is complete.
+        """
+        cleaner = ResponseCleaner(prompt, on_section)
+        for chunk in chunks:
+            cleaned = cleaner.feed(chunk)
+            if cleaned:
+                yield cleaned
+        cleaned = cleaner.finish()
+        if cleaned:
+            yield cleaned
+
     def get_fallback_response(self, role: str = "Software Engineer") -> str:
         return get_role_template(role)
 
@@ -62,4 +73,138 @@ class LLMUtils:
         if current_section:
             sections[current_section] = current_content
 
-        return sections
\ No newline at end of file
+        return sections
+
+    def extract_section(self, response: str, section: str,
+                        stop_sections: Iterable[str] = ()) -> Optional[str]:
+        """Text of ``section``: from the first heading naming it up to the next heading
+        naming it or one of ``stop_sections`` (sub-headings stay with the section).
+
+        Returns None when no heading names ``section``.
+        """
+        stops = [name.casefold() for name in stop_sections] + [section.casefold()]
+        lines = response.split('\n')
+        start = None
+        for index, line in enumerate(lines):
+            stripped = line.strip()
+            if not stripped.startswith('#'):
+                continue
+            name = stripped.lstrip('#').strip().casefold()
+            if start is None:
+                if section.casefold() in name:
+                    start = index
+            elif any(stop in name for stop in stops):
+                return '\n'.join(lines[start:index]).strip()
+        if start is None:
+            return None
+        return '\n'.join(lines[start:]).strip()
+
+    def validate_section(self, response: str, section: str,
+                         stop_sections: Iterable[str] = ()) -> bool:
+        """True when ``response`` has a heading naming ``section`` with content under it"""
+        text = self.extract_section(response, section, stop_sections)
+        if text is None:
+            return False
+        # Content may sit under sub-headings of the section
+        return any(line.strip() and not line.strip().startswith('#') for line in text.split('\n'))
+
+
+class ResponseCleaner:
+    """Incremental ``clean_response`` plus ``extract_sections``: feed chunks as they stream in.
+
+    Only the partial last line (and, while it may still be echoed, the prompt
+    prefix) is held back between feeds, so no text is scanned twice. Lines keep
+    their breaks and indentation: runs of blank lines become one blank line and
+    runs of spaces inside a line become one space, except in fenced code blocks.
+    A section is finished, and passed to ``on_section``, when the next heading
+    arrives or the stream ends.
+    """
+
+    def __init__(self, prompt: str = "",
+                 on_section: Optional[Callable[[str, List[str]], None]] = None):
+        self.on_section = on_section
+        self.sections: Dict[str, List[str]] = {}
+        self.current_section: Optional[str] = None
+        self.current_content: List[str] = []
+        # Prompt echo still being matched, and how much of it has been seen
+        self._prompt = prompt or None
+        self._prompt_seen = ""
+        self._pending = ""
+        self._started = False
+        self._blank = False
+        self._in_code = False
+
+    def feed(self, chunk: str) -> str:
+        """Consume the next piece of generated text; returns the cleaned text now complete"""
+        chunk = self._strip_prompt(chunk)
+        data = self._pending + chunk
+        complete_end = data.rfind('\n') + 1
+        self._pending = data[complete_end:]
+        if not complete_end:
+            return ""
+        return "".join(self._feed_line(line) for line in data[:complete_end - 1].split('\n'))
+
+    def finish(self) -> str:
+        """Flush the held-back text and close the last section"""
+        out = ""
+        if self._prompt is not None:
+            # The stream ended inside a partial prompt echo; it was real text
+            held, self._prompt = self._prompt_seen, None
+            out = self.feed(held)
+        if self._pending:
+            out += self._feed_line(self._pending)
+            self._pending = ""
+        self._close_section()
+        return out
+
+    def _strip_prompt(self, chunk: str) -> str:
+        if self._prompt is None:
+            return chunk
+        seen = len(self._prompt_seen)
+        size = min(len(chunk), len(self._prompt) - seen)
+        if chunk[:size] != self._prompt[seen:seen + size]:
+            # Not an echo after all: release what was held
+            held, self._prompt, self._prompt_seen = self._prompt_seen, None, ""
+            return held + chunk
+        if seen + size == len(self._prompt):
+            self._prompt, self._prompt_seen = None, ""
+            return chunk[size:]
+        self._prompt_seen += chunk
+        return ""
+
+    def _feed_line(self, line: str) -> str:
+        """Normalize one complete line; returns it with its separator, or "" if held/dropped"""
+        fence = line.lstrip().startswith('```')
+        if not self._in_code:
+            line = _INNER_SPACE_RE.sub(' ', line)
+        line = line.rstrip()
+        if not line and not self._in_code:
+            # Collapsed into one blank line, emitted only if more text follows
+            self._blank = self._started
+            return ""
+        if fence:
+            self._in_code = not self._in_code
+        self._split_line(line.strip())
+        if not self._started:
+            self._started = True
+            return line.lstrip()
+        out = ("\n\n" if self._blank else "\n") + line
+        self._blank = False
+        return out
+
+    def _split_line(self, line: str) -> None:
+        """Section bookkeeping, as in ``LLMUtils.extract_sections``"""
+        if line.startswith('#'):
+            self._close_section()
+            self.current_section = line.lstrip('#').strip()
+            self.current_content = []
+        elif self.current_section and line:
+            self.current_content.append(line)
+
+    def _close_section(self) -> None:
+        if self.current_section:
+            self.sections[self.current_section] = self.current_content
+            if self.on_section is not None:
+                self.on_section(self.current_section, self.current_content)
+        self.current_section = None
+        self.current_content = []
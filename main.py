@@ -1,13 +1,248 @@
 import streamlit as st
-from gemini_service import GeminiService
-from pdf_processor import PDFProcessor
-from prompts import PromptGenerator
+from analysis import generate_guide
+from gemini_service import GUIDE_MODES, DEFAULT_GUIDE_MODE, is_fallback_response
+from job_queue import JobQueue, DONE, FAILED, QUEUED
+from pdf_processor import PDFLimitError
+from metrics import metrics
 from dotenv import load_dotenv
 import os
+import time
+import uuid
+import services
 
 # Load environment variables
 load_dotenv()
 
+# Seconds between checks of a queued job's progress
+JOB_POLL_INTERVAL = 0.5
+
+@st.cache_resource
+def get_resume_cache():
+    """Parsed-resume cache, opened once per process"""
+    return services.build_resume_cache()
+
+@st.cache_resource
+def get_response_cache():
+    """LLM response cache, shared by every session"""
+    return services.build_response_cache()
+
+@st.cache_resource
+def get_llm_service(api_key: str):
+    """Gemini client, built once per process"""
+    return services.build_llm_service(api_key, get_response_cache())
+
+@st.cache_resource
+def get_pdf_processor():
+    """PDF parser, built once per process"""
+    return services.build_pdf_processor()
+
+@st.cache_resource
+def get_prompt_generator():
+    """Prompt builder, built once per process"""
+    return services.build_prompt_generator()
+
+@st.cache_resource
+def get_similarity_index():
+    """Similar-resume guide reuse, or None when it is off"""
+    return services.build_similarity_index(get_response_cache(), get_pdf_processor())
+
+@st.cache_resource
+def get_job_queue():
+    """Queue that worker.py processes run analyses from, enabled by JOB_QUEUE_PATH"""
+    path = os.getenv("JOB_QUEUE_PATH")
+    return JobQueue(path) if path else None
+
+@st.cache_resource
+def start_metrics_exporter():
+    """Serve Prometheus metrics on METRICS_PORT (once per process) when it is set"""
+    port = os.getenv("METRICS_PORT")
+    if port:
+        return metrics.start_http_server(int(port))
+    return None
+
+def render_skills(structured_data):
+    st.subheader("Technical Skills")
+    skills_dict = structured_data.get('skills', {})
+
+    if skills_dict.get('languages'):
+        st.write("🔤 Programming Languages:")
+        st.write(", ".join(skills_dict['languages']))
+
+    if skills_dict.get('frameworks'):
+        st.write("🔧 Frameworks & Libraries:")
+        st.write(", ".join(skills_dict['frameworks']))
+
+    if skills_dict.get('tools'):
+        st.write("🛠️ Tools & Technologies:")
+        st.write(", ".join(skills_dict['tools']))
+
+def render_sections(structured_data):
+    st.subheader("Resume Sections")
+    sections = structured_data.get('sections', {})
+    if sections:
+        for section_name, content in sections.items():
+            with st.expander(f"📌 {section_name}", expanded=True):
+                if content:
+                    for line in content:
+                        if 'GPA' in line or 'CGPA' in line:
+                            st.markdown(f"**{line}**")
+                        else:
+                            st.markdown(f"- {line}")
+                else:
+                    st.info(f"No content found in {section_name}")
+    else:
+        st.warning("No sections found in the resume")
+
+def render_ingest_limits(structured_data):
+    for note in structured_data.get('ingest_limits', ()):
+        st.warning(f"Only part of this resume was analyzed: {note}")
+
+def render_fallback_warning(response):
+    if is_fallback_response(response):
+        st.warning("Gemini is unavailable right now, so a standard guide for this "
+                   "role is shown. Try again later for a personalized one.")
+
+def render_download(response, company_name, role_name):
+    st.success(f"Analysis Complete for {role_name} position! 🎉")
+
+    # Download button
+    st.markdown("---")
+    if response:
+        st.download_button(
+            "📥 Download Complete Analysis",
+            response,
+            file_name=f"interview_prep_{company_name}_{role_name}.txt",
+            mime="text/plain"
+        )
+
+def render_job(job_queue, job_id):
+    """Poll a queued analysis, showing its progress, until it finishes; survives reruns"""
+    status_placeholder = st.empty()
+    guide_placeholder = st.empty()
+    while True:
+        job = job_queue.get(job_id)
+        if job is None:
+            status_placeholder.warning("This analysis is no longer available. Please run it again.")
+            return
+        if job['status'] in (DONE, FAILED):
+            break
+        if job['status'] == QUEUED:
+            ahead = job_queue.position(job_id)
+            status_placeholder.info(f"Waiting for a worker ({ahead} analyses ahead)..."
+                                    if ahead else "Waiting for a worker...")
+        else:
+            status_placeholder.info(f"{job['stage'] or 'Working'}...")
+            if job['partial']:
+                guide_placeholder.markdown(job['partial'])
+        time.sleep(JOB_POLL_INTERVAL)
+
+    status_placeholder.empty()
+    guide_placeholder.empty()
+    if job['status'] == FAILED:
+        st.error(job['error'])
+        st.error("Please try again or contact support if the problem persists.")
+        return
+
+    structured_data = job['result']['structured_data']
+    response = job['result']['response']
+    tabs = st.tabs(["📊 Skills", "🎯 Interview Guide", "📝 Details"])
+    render_ingest_limits(structured_data)
+    with tabs[0]:
+        render_skills(structured_data)
+    with tabs[2]:
+        render_sections(structured_data)
+    with tabs[1]:
+        st.subheader(f"AI Generated Interview Guide for {job['role']}")
+        st.markdown(response)
+        render_fallback_warning(response)
+    render_download(response, job['company'], job['role'])
+
+def run_analysis(api_key, uploaded_file, company_name, role_name, guide_mode, regenerate):
+    """Analyze the resume in this script run, streaming the guide as it is generated"""
+    pdf_processor = get_pdf_processor()
+    prompt_generator = get_prompt_generator()
+    resume_cache = get_resume_cache()
+    similarity_index = get_similarity_index()
+    request_id = uuid.uuid4().hex[:12]
+    analysis_started = time.perf_counter()
+    try:
+        with st.spinner(f"Analyzing resume for {role_name} position at {company_name}..."):
+            # Process PDF and extract structured data (cached by content)
+            with metrics.span("parse_resume", request_id=request_id):
+                resume_text, structured_data = resume_cache.get_or_parse(
+                    uploaded_file.getvalue(),
+                    pdf_processor
+                )
+
+            # Build the interview prompt
+            llm_service = get_llm_service(api_key)
+            settings = services.guide_settings()
+            with metrics.span("build_prompt", request_id=request_id):
+                prompt = prompt_generator.generate_interview_prompt(
+                    structured_data, 
+                    company_name,
+                    role_name,
+                    llm_service.prompt_overhead_tokens(role_name, guide_mode,
+                                                       settings['parallel_sections'])
+                )
+
+        # Display results
+        tabs = st.tabs(["📊 Skills", "🎯 Interview Guide", "📝 Details"])
+
+        render_ingest_limits(structured_data)
+
+        with tabs[0]:
+            render_skills(structured_data)
+
+        with tabs[2]:
+            render_sections(structured_data)
+
+        # Stream the guide into its tab as chunks arrive (or race it against the budget)
+        profile = pdf_processor.to_profile(structured_data) if similarity_index is not None else None
+        with tabs[1]:
+            st.subheader(f"AI Generated Interview Guide for {role_name}")
+            guide_placeholder = st.empty()
+            guide_placeholder.info("Generating interview guide...")
+            status_placeholder = st.empty()
+
+            def on_status(message):
+                if message:
+                    status_placeholder.info(message)
+                else:
+                    status_placeholder.empty()
+
+            with metrics.span("generate_guide", request_id=request_id, role=role_name) as span:
+                response = generate_guide(
+                    llm_service,
+                    prompt,
+                    company_name,
+                    role_name,
+                    guide_mode,
+                    bypass_cache=regenerate,
+                    latency_budget=settings['latency_budget'],
+                    parallel_sections=settings['parallel_sections'],
+                    similarity_index=similarity_index,
+                    profile=profile,
+                    on_text=guide_placeholder.markdown,
+                    on_status=on_status,
+                    span=span,
+                    started=analysis_started
+                )
+            render_fallback_warning(response)
+
+        render_download(response, company_name, role_name)
+
+    except PDFLimitError as e:
+        st.error(f"This resume is too large to analyze. {str(e)}")
+    except Exception as e:
+        st.error(f"An error occurred: {str(e)}")
+        st.error("Please try again or contact support if the problem persists.")
+    finally:
+        metrics.observe("stage_duration_seconds", time.perf_counter() - analysis_started,
+                        stage="analysis_total")
+        if os.getenv("METRICS_PROM_PATH"):
+            metrics.write_prometheus(os.getenv("METRICS_PROM_PATH"))
+
 def main():
     st.set_page_config(
         page_title="Resume Interview Assistant",
@@ -23,15 +258,14 @@ def main():
     if 'role_name' not in st.session_state:
         st.session_state['role_name'] = ""
 
-    # Initialize services
+    # Initialize services (the Gemini client is created when a guide is first requested)
     api_key = st.secrets.get("GOOGLE_API_KEY") or os.getenv("GOOGLE_API_KEY")
     if not api_key:
         st.error("Google API key not found in environment file")
         st.stop()
     
-    llm_service = GeminiService(api_key)
-    pdf_processor = PDFProcessor()
-    prompt_generator = PromptGenerator()
+    job_queue = get_job_queue()
+    start_metrics_exporter()
 
     # Sidebar
     with st.sidebar:
@@ -87,80 +321,30 @@ def main():
                     role_name = role
 
     if uploaded_file and company_name and role_name:
+        guide_mode = st.radio(
+            "Guide length",
+            list(GUIDE_MODES),
+            index=list(GUIDE_MODES).index(DEFAULT_GUIDE_MODE),
+            horizontal=True
+        )
+        regenerate = st.checkbox("Regenerate (ignore cached guide)", value=False)
         if st.button("Generate Interview Preparation", use_container_width=True):
-            try:
-                with st.spinner(f"Analyzing resume for {role_name} position at {company_name}..."):
-                    # Process PDF and extract structured data
-                    resume_text = pdf_processor.extract_text(uploaded_file)
-                    structured_data = pdf_processor.get_structured_data(resume_text)
-                    
-                    # Store the inputs
-                    st.session_state['company_name'] = company_name
-                    st.session_state['role_name'] = role_name
-                    
-                    # Generate and process response
-                    prompt = prompt_generator.generate_interview_prompt(
-                        structured_data, 
-                        company_name,
-                        role_name
-                    )
-                    response = llm_service.generate_response(prompt, role_name)
-                    
-                    # Display results
-                    st.success(f"Analysis Complete for {role_name} position! 🎉")
-                    
-                    tabs = st.tabs(["📊 Skills", "🎯 Interview Guide", "📝 Details"])
-                    
-                    with tabs[0]:
-                        st.subheader("Technical Skills")
-                        skills_dict = structured_data.get('skills', {})
-                        
-                        if skills_dict.get('languages'):
-                            st.write("🔤 Programming Languages:")
-                            st.write(", ".join(skills_dict['languages']))
-                        
-                        if skills_dict.get('frameworks'):
-                            st.write("🔧 Frameworks & Libraries:")
-                            st.write(", ".join(skills_dict['frameworks']))
-                        
-                        if skills_dict.get('tools'):
-                            st.write("🛠️ Tools & Technologies:")
-                            st.write(", ".join(skills_dict['tools']))
-                    
-                    with tabs[1]:
-                        st.subheader(f"AI Generated Interview Guide for {role_name}")
-                        st.markdown(response)
-                    
-                    with tabs[2]:
-                        st.subheader("Resume Sections")
-                        sections = structured_data.get('sections', {})
-                        if sections:
-                            for section_name, content in sections.items():
-                                with st.expander(f"📌 {section_name}", expanded=True):
-                                    if content:
-                                        for line in content:
-                                            if 'GPA' in line or 'CGPA' in line:
-                                                st.markdown(f"**{line}**")
-                                            else:
-                                                st.markdown(f"- {line}")
-                                    else:
-                                        st.info(f"No content found in {section_name}")
-                        else:
-                            st.warning("No sections found in the resume")
-                    
-                    # Download button
-                    st.markdown("---")
-                    if response:
-                        st.download_button(
-                            "📥 Download Complete Analysis",
-                            response,
-                            file_name=f"interview_prep_{company_name}_{role_name}.txt",
-                            mime="text/plain"
-                        )
-
-            except Exception as e:
-                st.error(f"An error occurred: {str(e)}")
-                st.error("Please try again or contact support if the problem persists.")
+            st.session_state['company_name'] = company_name
+            st.session_state['role_name'] = role_name
+            if job_queue is not None:
+                # Hand the analysis to a worker; the job id in the URL survives a refresh
+                st.query_params["job"] = job_queue.submit(
+                    uploaded_file.getvalue(),
+                    company_name,
+                    role_name,
+                    guide_mode,
+                    bypass_cache=regenerate
+                )
+            else:
+                run_analysis(api_key, uploaded_file, company_name, role_name, guide_mode, regenerate)
+
+    if job_queue is not None and st.query_params.get("job"):
+        render_job(job_queue, st.query_params["job"])
 
     # Footer
     st.markdown("---")
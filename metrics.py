@@ -0,0 +1,185 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, Iterator, Optional, Tuple
+
+# Upper bounds (seconds) for stage latency histograms; +Inf is implicit
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(name, value.replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return "{" + body + "}"
+
+
+class Metrics:
+    """Process-wide counters, histograms and timed spans for the analysis pipeline.
+
+    Spans and events are appended to ``log_path`` as JSON lines when it is set;
+    ``render_prometheus`` exposes the aggregates in Prometheus text format.
+    Keep Prometheus labels low-cardinality; per-request fields such as a request
+    id belong in the ``fields`` of a span, which only go to the JSON log.
+    """
+
+    def __init__(self, log_path: Optional[str] = None, buckets=DEFAULT_BUCKETS):
+        self.log_path = log_path
+        self.buckets = tuple(buckets)
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, list]] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Record one sample in a histogram"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # [bucket counts..., sum, count]
+            state = series.get(key)
+            if state is None:
+                state = series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def span(self, stage: str, **fields) -> Iterator[Dict]:
+        """Time a pipeline stage into ``stage_duration_seconds{stage=...}``.
+
+        The yielded dict can be filled with extra fields (e.g. cache hit) that are
+        written to the JSON log alongside the duration.
+        """
+        extra = {}
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield extra
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            self.observe("stage_duration_seconds", duration, stage=stage)
+            if status == "error":
+                self.increment("stage_errors_total", stage=stage)
+            self.log("span", stage=stage, status=status,
+                     duration_ms=round(duration * 1000, 3), **fields, **extra)
+
+    def log(self, event: str, **fields) -> None:
+        """Append one structured JSON log line (no-op without ``log_path``)"""
+        if not self.log_path:
+            return
+        record = {'ts': round(time.time(), 3), 'event': event}
+        record.update(fields)
+        line = json.dumps(record, default=str)
+        with self._lock:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def snapshot(self) -> Dict:
+        """Current aggregates as plain data"""
+        with self._lock:
+            return {
+                'counters': {
+                    name: {_format_labels(key): value for key, value in series.items()}
+                    for name, series in self._counters.items()
+                },
+                'histograms': {
+                    name: {
+                        _format_labels(key): {'count': state[-1], 'sum': state[-2]}
+                        for key, state in series.items()
+                    }
+                    for name, series in self._histograms.items()
+                }
+            }
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name in sorted(self._counters):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {value}")
+            for name in sorted(self._histograms):
+                lines.append(f"# TYPE {name} histogram")
+                for key, state in sorted(self._histograms[name].items()):
+                    for bound, count in zip(self.buckets, state):
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', str(bound)))} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {state[-1]}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {state[-2]}")
+                    lines.append(f"{name}_count{_format_labels(key)} {state[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Write the text exposition atomically (for node_exporter's textfile collector)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+    def start_http_server(self, port: int, host: str = "127.0.0.1") -> HTTPServer:
+        """Serve ``/metrics`` from a daemon thread"""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = HTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+def record_usage(usage_metadata, **labels) -> Dict[str, int]:
+    """Record prompt/response token counts from a Gemini response's usage metadata"""
+    if usage_metadata is None:
+        return {}
+    tokens = {
+        'prompt_tokens': getattr(usage_metadata, 'prompt_token_count', 0) or 0,
+        'response_tokens': getattr(usage_metadata, 'candidates_token_count', 0) or 0,
+    }
+    metrics.increment("gemini_prompt_tokens_total", tokens['prompt_tokens'], **labels)
+    metrics.increment("gemini_response_tokens_total", tokens['response_tokens'], **labels)
+    return tokens
+
+
+# Shared registry; METRICS_LOG_PATH enables the JSON log
+metrics = Metrics(log_path=os.getenv("METRICS_LOG_PATH") or None)
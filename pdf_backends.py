@@ -0,0 +1,253 @@
+"""Text-extraction engines behind ``PDFProcessor``.
+
+PyPDF2 is always installed and is the default. pypdfium2 and pdfminer.six are
+used when they are installed: ``calibrate`` times every available engine on a
+few sample PDFs and picks the fastest one whose text passes a quality check.
+``auto_backend`` does that once per process on generated resumes, never on
+uploads, so calibration cost is fixed and can't be driven by user input.
+"""
+import abc
+import importlib.util
+import io
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from metrics import metrics
+
+DEFAULT_BACKEND = "pypdf2"
+AUTO_BACKEND = "auto"
+
+# Quality check: a backend's text must keep this share of the most words any
+# backend found in the same PDF (engines that glue words together lose words),
+# and at most this share of it may be unreadable glyphs
+MIN_WORD_RATIO = 0.8
+MAX_GARBAGE_RATIO = 0.05
+
+# (pages, layout) of the generated resumes auto_backend calibrates on
+CALIBRATION_RESUMES = ((1, 'classic'), (2, 'skills_first'), (3, 'academic'))
+
+_WORD_RE = re.compile(r'\w+')
+# pdfminer writes "(cid:123)" for glyphs it cannot map to text; control
+# characters and U+FFFD replacement characters are unreadable too
+_GARBAGE_RE = re.compile(r'\(cid:\d+\)|[^\s\x20-\x7e\u00a0-\ufffc]')
+
+
+class PDFDocument(abc.ABC):
+    """An open PDF whose pages are extracted one at a time"""
+
+    page_count = 0
+
+    @abc.abstractmethod
+    def page_text(self, index: int) -> str:
+        """Text of the page at zero-based ``index``"""
+
+    def close(self) -> None:
+        pass
+
+
+class PDFBackend(abc.ABC):
+    """A text-extraction engine; ``module`` is what must be importable to use it"""
+
+    name = ""
+    module = ""
+
+    def available(self) -> bool:
+        return importlib.util.find_spec(self.module) is not None
+
+    @abc.abstractmethod
+    def open(self, pdf_bytes: bytes) -> PDFDocument:
+        """Open a PDF for page-by-page extraction; raises if it can't be parsed"""
+
+
+class _PyPDF2Document(PDFDocument):
+    def __init__(self, pdf_bytes: bytes):
+        # Imported on first use to keep module import (and app start) cheap
+        import PyPDF2
+        self._reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+        self.page_count = len(self._reader.pages)
+
+    def page_text(self, index: int) -> str:
+        return self._reader.pages[index].extract_text()
+
+
+class PyPDF2Backend(PDFBackend):
+    name = "pypdf2"
+    module = "PyPDF2"
+
+    def open(self, pdf_bytes: bytes) -> PDFDocument:
+        return _PyPDF2Document(pdf_bytes)
+
+
+# PDFium is not thread-safe; every call into it goes through this lock
+_pdfium_lock = threading.Lock()
+
+
+class _PdfiumDocument(PDFDocument):
+    def __init__(self, pdf_bytes: bytes):
+        import pypdfium2
+        with _pdfium_lock:
+            self._pdf = pypdfium2.PdfDocument(pdf_bytes)
+            self.page_count = len(self._pdf)
+
+    def page_text(self, index: int) -> str:
+        with _pdfium_lock:
+            page = self._pdf[index]
+            try:
+                textpage = page.get_textpage()
+                try:
+                    text = textpage.get_text_range()
+                finally:
+                    textpage.close()
+            finally:
+                page.close()
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    def close(self) -> None:
+        with _pdfium_lock:
+            self._pdf.close()
+
+
+class PdfiumBackend(PDFBackend):
+    name = "pdfium"
+    module = "pypdfium2"
+
+    def open(self, pdf_bytes: bytes) -> PDFDocument:
+        return _PdfiumDocument(pdf_bytes)
+
+
+class _PdfminerDocument(PDFDocument):
+    def __init__(self, pdf_bytes: bytes):
+        from pdfminer.pdfinterp import PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+        self._file = io.BytesIO(pdf_bytes)
+        # Page objects only reference their content; it is parsed in page_text
+        self._pages = list(PDFPage.get_pages(self._file))
+        self._resources = PDFResourceManager(caching=True)
+        self.page_count = len(self._pages)
+
+    def page_text(self, index: int) -> str:
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter
+        output = io.StringIO()
+        device = TextConverter(self._resources, output, laparams=LAParams())
+        try:
+            PDFPageInterpreter(self._resources, device).process_page(self._pages[index])
+        finally:
+            device.close()
+        # Pages end with a form feed
+        return output.getvalue().rstrip("\x0c")
+
+
+class PdfminerBackend(PDFBackend):
+    name = "pdfminer"
+    module = "pdfminer"
+
+    def open(self, pdf_bytes: bytes) -> PDFDocument:
+        return _PdfminerDocument(pdf_bytes)
+
+
+BACKENDS: Dict[str, PDFBackend] = {
+    backend.name: backend for backend in (PyPDF2Backend(), PdfiumBackend(), PdfminerBackend())
+}
+
+
+def available_backends() -> List[str]:
+    """Names of the backends whose engine is installed, default first"""
+    return [name for name, backend in BACKENDS.items() if backend.available()]
+
+
+def get_backend(name: str) -> PDFBackend:
+    backend = BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown PDF backend {name!r}; expected one of {', '.join(BACKENDS)}")
+    if not backend.available():
+        raise ValueError(f"PDF backend {name!r} needs the {backend.module} package")
+    return backend
+
+
+def extract_all(backend: PDFBackend, pdf_bytes: bytes) -> str:
+    """Text of every page of a PDF, one line break after each page"""
+    document = backend.open(pdf_bytes)
+    try:
+        return "".join(document.page_text(index) + "\n" for index in range(document.page_count))
+    finally:
+        document.close()
+
+
+def _garbage_ratio(text: str) -> float:
+    if not text:
+        return 1.0
+    return sum(len(match) for match in _GARBAGE_RE.findall(text)) / len(text)
+
+
+def calibration_samples() -> List[bytes]:
+    """Generated resumes of a few layouts and lengths (see sample_resumes)"""
+    from sample_resumes import build_pdf, generate_resume_lines
+    return [
+        build_pdf(generate_resume_lines(pages, layout))
+        for pages, layout in CALIBRATION_RESUMES
+    ]
+
+
+def calibrate(samples: Iterable[bytes], names: Optional[List[str]] = None) -> str:
+    """Name of the fastest backend whose text passes the quality check on every sample.
+
+    Each backend extracts every sample once; a backend that raises, or whose
+    text falls short on words or has too many unreadable glyphs compared with
+    the other backends, is not chosen. Falls back to ``DEFAULT_BACKEND``.
+    Samples are extracted in full, so only pass trusted documents.
+    """
+    names = names or available_backends()
+    if len(names) < 2:
+        return names[0] if names else DEFAULT_BACKEND
+    samples = list(samples)
+    if not samples:
+        return names[0]
+
+    seconds: Dict[str, float] = {}
+    texts: Dict[str, List[str]] = {}
+    for name in names:
+        started = time.perf_counter()
+        try:
+            texts[name] = [extract_all(get_backend(name), sample) for sample in samples]
+        except Exception as e:
+            print(f"PDF backend {name} failed during calibration: {str(e)}")
+            continue
+        seconds[name] = time.perf_counter() - started
+        metrics.observe("pdf_backend_calibration_seconds", seconds[name] / len(samples), backend=name)
+
+    most_words = [
+        max(len(_WORD_RE.findall(texts[name][index])) for name in texts)
+        for index in range(len(samples))
+    ]
+    passing = [
+        name for name in texts
+        if all(
+            len(_WORD_RE.findall(text)) >= MIN_WORD_RATIO * most_words[index]
+            and _garbage_ratio(text) <= MAX_GARBAGE_RATIO
+            for index, text in enumerate(texts[name])
+        )
+    ]
+    chosen = min(passing, key=seconds.get) if passing else DEFAULT_BACKEND
+    metrics.log("pdf_backend_calibration", chosen=chosen, samples=len(samples), passed=passing,
+                seconds={name: round(value, 4) for name, value in seconds.items()})
+    return chosen
+
+
+@lru_cache(maxsize=None)
+def auto_backend() -> str:
+    """The backend "auto" stands for: ``calibrate`` on generated samples, once per process"""
+    names = available_backends()
+    if len(names) < 2:
+        # Nothing to choose between; skip generating samples
+        return names[0] if names else DEFAULT_BACKEND
+    try:
+        samples = calibration_samples()
+    except Exception as e:
+        print(f"Could not generate PDF backend calibration samples: {str(e)}")
+        return DEFAULT_BACKEND
+    return calibrate(samples, names)
@@ -1,9 +1,322 @@
-import PyPDF2
+import multiprocessing
+import os
 import re
-from typing import Dict, List, Any
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Any, Optional, Set, Tuple
+
+from metrics import metrics
+from pdf_backends import AUTO_BACKEND, PDFBackend, auto_backend, get_backend
+from resume_profile import ResumeProfile, SkillVocabulary, skill_sort_key, skill_vocabulary
+
+# Bump whenever extraction or structuring output changes so cached parses
+# produced by an older parser are not served.
+PARSER_VERSION = "4"
+
+# Documents at or above either threshold are extracted across worker processes
+PARALLEL_PAGE_THRESHOLD = 8
+PARALLEL_SIZE_THRESHOLD = 2 * 1024 * 1024
+
+# Ingestion caps; a PDF over the byte cap is rejected, the others stop extraction early
+MAX_PDF_BYTES = 10 * 1024 * 1024
+MAX_PDF_PAGES = 30
+PAGE_TIMEOUT_SECONDS = 5.0
+MAX_TEXT_CHARS = 200_000
+
+# Page workers: child processes that extract page ranges and can be killed when
+# a page overruns PAGE_TIMEOUT_SECONDS. Idle ones are kept for the next document;
+# the slots bound how many exist at once across every PDFProcessor in the process.
+# They are never forked from the app process itself, which runs threads (Streamlit,
+# job workers) whose locks a fork would copy mid-use: they come from a fork
+# server where there is one, and are spawned elsewhere.
+WORKER_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+_idle_workers: List["_PageWorker"] = []
+_worker_slots: Optional[threading.BoundedSemaphore] = None
+_workers_lock = threading.Lock()
+
+
+class PDFLimitError(Exception):
+    """The PDF is larger than the processor is configured to accept"""
+
+
+class _PageReadError(Exception):
+    """A page worker missed its deadline or died; ``limit`` is the label it is counted under"""
+
+    def __init__(self, index: int, reason: str, limit: str):
+        super().__init__(f"page {index + 1} {reason}")
+        self.index = index
+        self.reason = reason
+        self.limit = limit
+
+
+class _WorkerOpenError(Exception):
+    """A page worker could not open the document the parent process has open"""
+
+
+def _format_size(size: int) -> str:
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    return f"{size / 1024:.0f} KB"
+
+
+def _extract_page(document, index: int) -> Tuple[str, float]:
+    """Text of one page plus its trailing newline ("" if the page fails), and the seconds it took"""
+    started = time.perf_counter()
+    try:
+        text = document.page_text(index) + "\n"
+    except Exception as e:
+        print(f"Error extracting text from page: {str(e)}")
+        text = ""
+    return text, time.perf_counter() - started
+
+
+def _page_worker_main(conn) -> None:
+    """Child process: extract the page ranges sent over ``conn``, one message per page"""
+    while True:
+        try:
+            pdf_bytes, start, stop, backend = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        try:
+            document = backend.open(pdf_bytes)
+        except Exception as e:
+            conn.send(("error", str(e)))
+            continue
+        try:
+            for index in range(start, stop):
+                conn.send(("page",) + _extract_page(document, index))
+        finally:
+            document.close()
+
+
+class _PageWorker:
+    """One page-extraction child process, used by a single document at a time"""
 
-class PDFProcessor:
     def __init__(self):
+        context = _worker_context()
+        self._conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_page_worker_main, args=(child_conn,),
+                                       name="pdf-page-worker", daemon=True)
+        self.process.start()
+        child_conn.close()
+        # Pages of the current range not yet received; only an idle worker is reused
+        self.pending = 0
+        self._next = 0
+
+    def submit(self, pdf_bytes: bytes, start: int, stop: int, backend: PDFBackend) -> None:
+        # The backend itself is sent (by reference to its class), not its name:
+        # a worker that was not forked from this process has only the built-in
+        # registry
+        self._conn.send((pdf_bytes, start, stop, backend))
+        self.pending = stop - start
+        self._next = start
+
+    def next_page(self, timeout: Optional[float]) -> Tuple[str, float]:
+        """(text, seconds) of the next page, waiting at most ``timeout`` seconds for it"""
+        index = self._next
+        try:
+            if not self._conn.poll(timeout):
+                raise _PageReadError(index, "took too long to read", "page_time")
+            message = self._conn.recv()
+        except (EOFError, OSError):
+            raise _PageReadError(index, "could not be read", "page_error") from None
+        if message[0] == "error":
+            self.pending = 0
+            raise _WorkerOpenError(message[1])
+        self.pending -= 1
+        self._next += 1
+        return message[1], message[2]
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self._conn.close()
+
+
+@lru_cache(maxsize=None)
+def _worker_context():
+    """multiprocessing context page workers are started from (see WORKER_START_METHOD)"""
+    context = multiprocessing.get_context(WORKER_START_METHOD)
+    if WORKER_START_METHOD == "forkserver":
+        # Import the app and this module once in the fork server, not in every worker
+        context.set_forkserver_preload(["__main__", __name__])
+    return context
+
+
+def _checkout_workers(wanted: int, max_workers: int) -> List[_PageWorker]:
+    """Between 1 and ``wanted`` page workers; waits only until the first one is free"""
+    global _worker_slots
+    with _workers_lock:
+        if _worker_slots is None:
+            _worker_slots = threading.BoundedSemaphore(max_workers)
+        slots = _worker_slots
+    slots.acquire()
+    count = 1
+    # Extra workers only if free right away, so two documents can't deadlock
+    while count < wanted and slots.acquire(blocking=False):
+        count += 1
+    workers = []
+    try:
+        for _ in range(count):
+            with _workers_lock:
+                worker = _idle_workers.pop() if _idle_workers else None
+            workers.append(worker or _PageWorker())
+    except BaseException:
+        for worker in workers:
+            _checkin_worker(worker)
+        for _ in range(count - len(workers)):
+            slots.release()
+        raise
+    return workers
+
+
+def _checkin_worker(worker: _PageWorker) -> None:
+    """Return an idle worker for reuse; one still busy with a range is killed"""
+    if worker.pending or not worker.process.is_alive():
+        worker.kill()
+    else:
+        with _workers_lock:
+            _idle_workers.append(worker)
+    _worker_slots.release()
+
+# Characters that may appear inside a skill name (C++, C#, Node.js, Material-UI).
+# A skill only matches when it is not glued to one of these on either side, so
+# "R", "Go" and "Git" no longer match inside "React", "Google" or "GitHub".
+_SKILL_BOUNDARY_LEFT = r'(?<![\w+#])'
+_SKILL_BOUNDARY_RIGHT = r'(?![\w+#])'
+
+
+def _literal_length(pattern: str) -> int:
+    """Approximate length of the longest text a skill pattern can match"""
+    return len(re.sub(r'[\\()?:\[\]]', '', pattern))
+
+
+@lru_cache(maxsize=None)
+def _compile_skill_matcher(patterns: Tuple[Tuple[str, Tuple[str, ...]], ...]):
+    """Compile all skill patterns into a single matcher, once per process.
+
+    Every pattern becomes a named group so ``match.lastgroup`` maps a hit back to
+    its category. Alternatives are bucketed by their (literal) first letter so a
+    word start only tries the handful of skills sharing that letter, and each
+    bucket is ordered longest first because ``re`` takes the first alternative
+    that matches, and "React Native" must win over "React".
+    """
+    buckets: Dict[str, List[Tuple[str, str]]] = {}
+    categories = {}
+    for category, category_patterns in patterns:
+        for pattern in category_patterns:
+            name = f"s{len(categories)}"
+            categories[name] = category
+            buckets.setdefault(pattern[0].lower(), []).append((name, pattern))
+
+    branches = []
+    for first, group in sorted(buckets.items()):
+        group.sort(key=lambda item: _literal_length(item[1]), reverse=True)
+        tails = '|'.join(f"(?P<{name}>{pattern[1:]})" for name, pattern in group)
+        branches.append(f"{re.escape(first)}(?:{tails})")
+
+    matcher = re.compile(
+        f"{_SKILL_BOUNDARY_LEFT}(?:{'|'.join(branches)}){_SKILL_BOUNDARY_RIGHT}",
+        re.IGNORECASE
+    )
+    return matcher, categories
+
+
+@lru_cache(maxsize=4096)
+def _split_phrase_skills(patterns: Tuple[Tuple[str, Tuple[str, ...]], ...],
+                         phrase: str) -> Tuple[Tuple[str, str], ...]:
+    """Find the shorter skills inside a multi-word hit ("Ruby" in "Ruby on Rails")"""
+    matcher, categories = _compile_skill_matcher(patterns)
+    words = phrase.split()
+    found = []
+    for start in range(len(words)):
+        for end in range(start + 1, len(words) + 1):
+            candidate = ' '.join(words[start:end])
+            if candidate == phrase:
+                continue
+            match = matcher.fullmatch(candidate)
+            if match:
+                found.append((categories[match.lastgroup], match.group()))
+    return tuple(found)
+
+
+@lru_cache(maxsize=None)
+def _compile_section_index(sections: Tuple[Tuple[str, Tuple[str, ...]], ...]):
+    """Compile the section markers into one matcher, once per process.
+
+    A line belongs to the first section (in definition order) with a marker
+    anywhere in the upper-cased line. Markers that contain a marker of the same
+    or an earlier section can never decide the result and are dropped. The
+    remaining ones form a single alternation with one named group per marker,
+    matched against the upper-cased line.
+    """
+    markers = [
+        (rank, marker.upper())
+        for rank, (_, section_markers) in enumerate(sections)
+        for marker in section_markers
+    ]
+    live = [
+        (rank, marker) for rank, marker in markers
+        if not any(
+            other != marker and other in marker and other_rank <= rank
+            for other_rank, other in markers
+        )
+    ]
+    # Bucket by first letter (like the skill matcher) so each position only
+    # tries the markers that can start there; within a bucket, earlier sections
+    # come first so they win when two markers start at the same position.
+    buckets: Dict[str, List[Tuple[int, str]]] = {}
+    for rank, marker in live:
+        buckets.setdefault(marker[0], []).append((rank, marker))
+    names = {}
+    branches = []
+    for first, group in sorted(buckets.items()):
+        group.sort(key=lambda item: (item[0], -len(item[1])))
+        tails = []
+        for rank, marker in group:
+            name = f"m{len(names)}"
+            names[name] = (rank, sections[rank][0])
+            tails.append(f"(?P<{name}>{re.escape(marker[1:])})")
+        branches.append(f"{re.escape(first)}(?:{'|'.join(tails)})")
+    alternation = '|'.join(branches)
+    # Plain search finds whether any marker is present; the zero-width form
+    # also reports markers that overlap an earlier match.
+    return re.compile(alternation), re.compile(f"(?=(?:{alternation}))"), names
+
+
+# Leading bullet points and other common list markers
+_BULLET_RE = re.compile(r'^[-•●■◆○*]+\s*')
+
+
+class PDFProcessor:
+    def __init__(self, parallel_pages: bool = True,
+                 parallel_page_threshold: int = PARALLEL_PAGE_THRESHOLD,
+                 parallel_size_threshold: int = PARALLEL_SIZE_THRESHOLD,
+                 max_workers: Optional[int] = None,
+                 max_bytes: Optional[int] = MAX_PDF_BYTES,
+                 max_pages: Optional[int] = MAX_PDF_PAGES,
+                 page_timeout: Optional[float] = PAGE_TIMEOUT_SECONDS,
+                 max_chars: Optional[int] = MAX_TEXT_CHARS,
+                 stop_after_sections: bool = False,
+                 backend: str = AUTO_BACKEND):
+        # Text-extraction engine (see pdf_backends); "auto" is resolved up front
+        # by calibrating on generated samples, never on an upload
+        self.backend = auto_backend() if backend == AUTO_BACKEND else get_backend(backend).name
+
+        # Page-parallel extraction settings; disable when already running in a worker pool
+        self.parallel_pages = parallel_pages
+        self.parallel_page_threshold = parallel_page_threshold
+        self.parallel_size_threshold = parallel_size_threshold
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+        # Ingestion limits (None disables one); see iter_pages and extract_structured
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.page_timeout = page_timeout
+        self.max_chars = max_chars
+        self.stop_after_sections = stop_after_sections
+
         # Define section markers
         self.sections = {
             "Education": ["EDUCATION", "ACADEMIC BACKGROUND", "ACADEMIC QUALIFICATIONS"],
@@ -63,20 +376,168 @@ class PDFProcessor:
 
     def extract_text(self, pdf_file) -> str:
         """Extract text from PDF file with error handling"""
+        return "".join(self.iter_pages(pdf_file))
+
+    def iter_pages(self, pdf_file, limits_hit: Optional[List[str]] = None,
+                   should_stop: Optional[Callable[[], bool]] = None) -> Iterator[str]:
+        """Yield the text of each page (with a trailing newline) in order as it is extracted.
+
+        Raises ``PDFLimitError`` for a file over ``max_bytes``. Past ``max_pages``
+        or ``max_chars``, or after a page slower than ``page_timeout``, the pages
+        stop and a note saying why is appended to ``limits_hit``. ``should_stop``
+        is asked after each page whether the caller has read enough; if pages
+        remain, that is noted too.
+        """
+        pdf_bytes = self._read_bytes(pdf_file)
+        if self.max_bytes and len(pdf_bytes) > self.max_bytes:
+            metrics.increment("pdf_limit_hits_total", limit="bytes")
+            raise PDFLimitError(
+                f"The PDF is {_format_size(len(pdf_bytes))}; "
+                f"files up to {_format_size(self.max_bytes)} are accepted."
+            )
+        backend = get_backend(self.backend)
         try:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                try:
-                    text += page.extract_text() + "\n"
-                except Exception as e:
-                    print(f"Error extracting text from page: {str(e)}")
-                    continue
-            return text
+            document = backend.open(pdf_bytes)
+            page_count = document.page_count
         except Exception as e:
             print(f"Error processing PDF: {str(e)}")
             raise Exception(f"Error processing PDF: {str(e)}")
 
+        try:
+            if self.max_pages and page_count > self.max_pages:
+                self._limit_hit(limits_hit, "pages",
+                                f"Only the first {self.max_pages} of {page_count} pages were read.")
+                page_count = self.max_pages
+
+            chars = 0
+            pages = self._extract_pages(document, backend, pdf_bytes, page_count, limits_hit)
+            for index, page_text in enumerate(pages, start=1):
+                if self.max_chars and chars + len(page_text) > self.max_chars:
+                    yield page_text[:self.max_chars - chars]
+                    self._limit_hit(limits_hit, "chars",
+                                    f"Text extraction stopped after {self.max_chars:,} characters.")
+                    return
+                chars += len(page_text)
+                yield page_text
+                if should_stop is not None and index < page_count and should_stop():
+                    self._limit_hit(limits_hit, "sections",
+                                    f"Reading stopped after page {index} of {page_count} because "
+                                    f"every section had been found; later pages were skipped.")
+                    pages.close()
+                    return
+        finally:
+            document.close()
+
+    def parse_settings(self) -> str:
+        """The settings that change what ``extract_structured`` returns for a PDF,
+        for cache keys: the backend and the caps that cut extraction short"""
+        return (f"{self.backend}:pages={self.max_pages}:chars={self.max_chars}:"
+                f"timeout={self.page_timeout}:sections={int(self.stop_after_sections)}")
+
+    def _extract_pages(self, document, backend: PDFBackend, pdf_bytes: bytes, page_count: int,
+                       limits_hit: Optional[List[str]]) -> Iterator[str]:
+        """Pages [0, page_count), in page workers when a page may need to be stopped
+        (``page_timeout``) or the document is large enough to split across them"""
+        if self.page_timeout or self._should_parallelize(page_count, len(pdf_bytes)):
+            wanted = min(self.max_workers, page_count) \
+                if self._should_parallelize(page_count, len(pdf_bytes)) else 1
+            try:
+                workers = _checkout_workers(wanted, self.max_workers)
+            except Exception as e:
+                print(f"Page workers unavailable, extracting in this process: {str(e)}")
+            else:
+                yield from self._worker_pages(workers, document, backend, pdf_bytes,
+                                              page_count, limits_hit)
+                return
+
+        yield from self._local_pages(document, backend, 0, page_count, limits_hit)
+
+    def _local_pages(self, document, backend: PDFBackend, start: int, stop: int,
+                     limits_hit: Optional[List[str]]) -> Iterator[str]:
+        """Pages [start, stop) extracted in this process"""
+        for index in range(start, stop):
+            # Pages are materialized one at a time and not kept
+            page_text, seconds = _extract_page(document, index)
+            metrics.observe("pdf_page_seconds", seconds, backend=backend.name)
+            yield page_text
+            if self.page_timeout and seconds > self.page_timeout:
+                self._limit_hit(limits_hit, "page_time",
+                                f"Page {index + 1} took too long to read, so extraction stopped there.")
+                return
+
+    def _worker_pages(self, workers: List[_PageWorker], document, backend: PDFBackend,
+                      pdf_bytes: bytes, page_count: int,
+                      limits_hit: Optional[List[str]]) -> Iterator[str]:
+        """Split the pages into contiguous ranges, one per worker, and yield them in order.
+
+        Waiting for each page is bounded by ``page_timeout`` (time spent waiting
+        for a free worker does not count). A worker that overruns is killed, so a
+        hostile page can't keep it busy for the next document. If a worker
+        cannot open the document, the remaining pages are read in this process.
+        """
+        chunk = -(-page_count // len(workers))
+        ranges = []
+        try:
+            for worker, start in zip(workers, range(0, page_count, chunk)):
+                stop = min(start + chunk, page_count)
+                worker.submit(pdf_bytes, start, stop, backend)
+                ranges.append((worker, start, stop))
+            for worker, start, stop in ranges:
+                for index in range(start, stop):
+                    try:
+                        page_text, seconds = worker.next_page(self.page_timeout)
+                    except _PageReadError as e:
+                        self._limit_hit(limits_hit, e.limit,
+                                        f"Page {e.index + 1} {e.reason}, so extraction stopped there.")
+                        return
+                    except _WorkerOpenError as e:
+                        print(f"Page worker could not open the PDF, extracting in this process: {str(e)}")
+                        metrics.increment("pdf_worker_errors_total", backend=backend.name)
+                        yield from self._local_pages(document, backend, index, page_count, limits_hit)
+                        return
+                    metrics.observe("pdf_page_seconds", seconds, backend=backend.name)
+                    yield page_text
+                    # The page may have run while this document was still reading
+                    # earlier ranges, so its own duration is checked too
+                    if self.page_timeout and seconds > self.page_timeout:
+                        self._limit_hit(limits_hit, "page_time",
+                                        f"Page {index + 1} took too long to read, "
+                                        f"so extraction stopped there.")
+                        return
+        finally:
+            # Workers stopped mid-range (timed out, or the caller stopped early) are killed
+            for worker in workers:
+                _checkin_worker(worker)
+
+    @staticmethod
+    def _limit_hit(limits_hit: Optional[List[str]], limit: str, message: str) -> None:
+        metrics.increment("pdf_limit_hits_total", limit=limit)
+        if limits_hit is not None:
+            limits_hit.append(message)
+
+    @staticmethod
+    def _read_bytes(pdf_file) -> bytes:
+        """Raw bytes of a path, bytes object or file-like upload"""
+        if isinstance(pdf_file, (bytes, bytearray)):
+            return bytes(pdf_file)
+        if hasattr(pdf_file, "getvalue"):
+            return pdf_file.getvalue()
+        if hasattr(pdf_file, "read"):
+            if hasattr(pdf_file, "seek"):
+                pdf_file.seek(0)
+            return pdf_file.read()
+        with open(pdf_file, "rb") as f:
+            return f.read()
+
+    def _should_parallelize(self, page_count: int, size: int) -> bool:
+        return (
+            self.parallel_pages
+            and self.max_workers > 1
+            and page_count > 1
+            and (page_count >= self.parallel_page_threshold
+                 or size >= self.parallel_size_threshold)
+        )
+
     def extract_skills(self, text: str) -> Dict[str, List[str]]:
         """Extract and categorize skills from text"""
         skills = {
@@ -95,34 +556,12 @@ class PDFProcessor:
                     break
 
             if skills_section:
-                # Process structured skills section
-                categories = {
-                    'Languages:': 'languages',
-                    'Programming Languages:': 'languages',
-                    'Frameworks:': 'frameworks',
-                    'Libraries:': 'frameworks',
-                    'Tools:': 'tools',
-                    'Technologies:': 'tools'
-                }
-
-                for header, category in categories.items():
-                    match = re.search(f"{header}(.*?)(?=\n\w+:|$)", skills_section, re.DOTALL | re.IGNORECASE)
-                    if match:
-                        items = match.group(1).strip().split(',')
-                        skills[category].update(item.strip() for item in items if item.strip())
-
-            # Then scan entire text for additional technologies
-            for category, patterns in self.tech_patterns.items():
-                for pattern in patterns:
-                    matches = re.finditer(pattern, text, re.IGNORECASE)
-                    for match in matches:
-                        skills[category].add(match.group())
-
-            # Convert sets to sorted lists and remove duplicates
-            return {
-                category: sorted(list(set(skill_set)), key=str.lower)
-                for category, skill_set in skills.items()
-            }
+                self._parse_skills_section(skills_section, skills)
+
+            # Then scan entire text for additional technologies in a single pass
+            self._scan_tech_patterns(text, skills)
+
+            return self._finalize_skills(skills)
 
         except Exception as e:
             print(f"Error in skill extraction: {str(e)}")
@@ -132,78 +571,182 @@ class PDFProcessor:
                 'tools': ['Git']
             }
 
+    def _parse_skills_section(self, skills_section: str, skills: Dict[str, set]) -> None:
+        """Add items listed under "Languages:", "Tools:" etc. in the skills section"""
+        categories = {
+            'Languages:': 'languages',
+            'Programming Languages:': 'languages',
+            'Frameworks:': 'frameworks',
+            'Libraries:': 'frameworks',
+            'Tools:': 'tools',
+            'Technologies:': 'tools'
+        }
+
+        for header, category in categories.items():
+            match = re.search(f"{header}(.*?)(?=\n\w+:|$)", skills_section, re.DOTALL | re.IGNORECASE)
+            if match:
+                items = match.group(1).strip().split(',')
+                skills[category].update(item.strip() for item in items if item.strip())
+
+    def _scan_tech_patterns(self, text: str, skills: Dict[str, set]) -> None:
+        """Add every known technology mentioned in text (must hold whole lines)"""
+        patterns_key = self._skill_patterns_key()
+        matcher, categories = _compile_skill_matcher(patterns_key)
+        for match in matcher.finditer(text):
+            found = match.group()
+            skills[categories[match.lastgroup]].add(found)
+            if ' ' in found:
+                for category, skill in _split_phrase_skills(patterns_key, found):
+                    skills[category].add(skill)
+
+    @staticmethod
+    def _finalize_skills(skills: Dict[str, set]) -> Dict[str, List[str]]:
+        """Convert sets to sorted lists and remove duplicates"""
+        # Spellings differing only in case ("GitHub", "github") are ordered too,
+        # so the result doesn't depend on set iteration order
+        return {
+            category: sorted(set(skill_set), key=skill_sort_key)
+            for category, skill_set in skills.items()
+        }
+
+    def _skill_patterns_key(self) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+        """Hashable snapshot of ``self.tech_patterns`` used to look up the compiled matcher"""
+        return tuple(
+            (category, tuple(patterns))
+            for category, patterns in self.tech_patterns.items()
+        )
+
+    def skill_vocabulary(self) -> SkillVocabulary:
+        """Process-wide skill bit positions for ``self.tech_patterns``"""
+        return skill_vocabulary(self._skill_patterns_key())
+
+    def to_profile(self, structured_data: Dict[str, Any]) -> ResumeProfile:
+        """Compact ``ResumeProfile`` for a ``get_structured_data`` result"""
+        return ResumeProfile.from_dict(structured_data, self.skill_vocabulary())
+
     def get_structured_data(self, text: str) -> Dict[str, Any]:
         """Extract structured data from resume text"""
         try:
-            sections_dict = {}
-            current_section = None
-            current_content = []
-            
-            # Split text into lines and process
-            lines = text.split('\n')
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Check for section headers
-                section_match = None
-                for section_name, markers in self.sections.items():
-                    for marker in markers:
-                        if marker.upper() in line.upper():
-                            section_match = section_name
-                            break
-                    if section_match:
-                        break
-
-                if section_match:
-                    # Save previous section
-                    if current_section and current_content:
-                        sections_dict[current_section] = self._clean_content(current_content)
-                    # Start new section
-                    current_section = section_match
-                    current_content = []
-                elif current_section:
-                    current_content.append(line)
-
-            # Add last section
-            if current_section and current_content:
-                sections_dict[current_section] = self._clean_content(current_content)
-
-            # Extract skills
-            skills_dict = self.extract_skills(text)
-
-            # Validate and return structured data
-            return self._validate_structured_data({
-                'sections': sections_dict,
-                'skills': skills_dict
-            })
+            builder = StructuredDataBuilder(self)
+            builder.feed(text)
+            return builder.finish()
 
         except Exception as e:
             print(f"Error in structured data extraction: {str(e)}")
-            return {
-                'sections': {
-                    'Education': ['Education information not found'],
-                    'Experience': ['Experience information not found'],
-                    'Technical Skills': ['Technical skills information not found']
-                },
-                'skills': {
-                    'languages': ['Python'],
-                    'frameworks': ['React'],
-                    'tools': ['Git']
-                }
+            return self._default_structured_data()
+
+    def extract_structured(self, pdf_file, keep_text: bool = True) -> Tuple[str, Dict[str, Any]]:
+        """Extract text and structured data in one streaming pass over the pages.
+
+        Each page is fed to the section parser and skill matcher as soon as it is
+        decoded, so structuring overlaps extraction of later pages. With
+        ``keep_text=False`` the full text is never assembled and "" is returned.
+        With ``stop_after_sections``, extraction ends one page after every known
+        section has been seen. Ingestion limits and early stops that cut the
+        text short are listed under ``structured_data['ingest_limits']``.
+        """
+        started = time.perf_counter()
+        structure_seconds = 0.0
+        builder = StructuredDataBuilder(self)
+        pages = []
+        page_count = 0
+        failed = False
+        limits_hit = []
+        last_page = None
+        should_stop = None
+        if self.stop_after_sections:
+            should_stop = lambda: page_count == last_page
+        for page_text in self.iter_pages(pdf_file, limits_hit, should_stop):
+            page_count += 1
+            if keep_text:
+                pages.append(page_text)
+            if failed:
+                continue
+            feed_started = time.perf_counter()
+            try:
+                builder.feed(page_text)
+            except Exception as e:
+                print(f"Error in structured data extraction: {str(e)}")
+                failed = True
+            structure_seconds += time.perf_counter() - feed_started
+            if last_page is None and self.stop_after_sections \
+                    and len(builder.seen_sections) == len(self.sections):
+                # The last section may run onto the next page
+                last_page = page_count + 1
+
+        structured_data = None
+        if not failed:
+            finish_started = time.perf_counter()
+            try:
+                structured_data = builder.finish()
+            except Exception as e:
+                print(f"Error in structured data extraction: {str(e)}")
+            structure_seconds += time.perf_counter() - finish_started
+        if structured_data is None:
+            structured_data = self._default_structured_data()
+        if limits_hit:
+            structured_data['ingest_limits'] = limits_hit
+
+        # Extraction and structuring interleave, so split the wall time between them
+        extract_seconds = time.perf_counter() - started - structure_seconds
+        metrics.observe("stage_duration_seconds", extract_seconds, stage="pdf_extract")
+        metrics.observe("stage_duration_seconds", structure_seconds, stage="pdf_structure")
+        metrics.log("pdf_parse", pages=page_count, extract_ms=round(extract_seconds * 1000, 3),
+                    structure_ms=round(structure_seconds * 1000, 3), failed=failed,
+                    stopped_early=page_count == last_page, limits_hit=len(limits_hit))
+        return "".join(pages), structured_data
+
+    @staticmethod
+    def _default_structured_data() -> Dict[str, Any]:
+        return {
+            'sections': {
+                'Education': ['Education information not found'],
+                'Experience': ['Experience information not found'],
+                'Technical Skills': ['Technical skills information not found']
+            },
+            'skills': {
+                'languages': ['Python'],
+                'frameworks': ['React'],
+                'tools': ['Git']
             }
+        }
 
-    def _clean_content(self, content: List[str]) -> List[str]:
+    def _section_index(self):
+        """Return the process-wide compiled header matcher for ``self.sections``"""
+        return _compile_section_index(tuple(
+            (section_name, tuple(markers))
+            for section_name, markers in self.sections.items()
+        ))
+
+    def _match_section(self, line: str, section_index=None) -> Optional[str]:
+        """Name of the section whose header appears in line, if any.
+
+        Callers matching many lines can pass ``self._section_index()`` once.
+        """
+        search, overlapping, names = section_index or self._section_index()
+        upper = line.upper()
+        match = search.search(upper)
+        if match is None:
+            return None
+        rank, section_name = names[match.lastgroup]
+        if rank == 0:
+            return section_name
+        # An earlier section's marker may still appear later in the line
+        for match in overlapping.finditer(upper, match.start() + 1):
+            other_rank, other_name = names[match.lastgroup]
+            if other_rank < rank:
+                rank, section_name = other_rank, other_name
+        return section_name
+
+    def _clean_content(self, content: List[str], section_index=None) -> List[str]:
         """Clean and format section content"""
+        search = (section_index or self._section_index())[0]
         cleaned = []
         for line in content:
             line = line.strip()
-            if line and not any(marker.upper() in line.upper() 
-                              for markers in self.sections.values() 
-                              for marker in markers):
+            if line and search.search(line.upper()) is None:
                 # Remove bullet points and other common markers
-                line = re.sub(r'^[-•●■◆○*]+\s*', '', line)
+                line = _BULLET_RE.sub('', line)
                 if line:
                     cleaned.append(line)
         return cleaned
@@ -230,3 +773,108 @@ class PDFProcessor:
                     validated['skills'][category] = data['skills'][category]
 
         return validated
+
+
+class StructuredDataBuilder:
+    """Incremental ``get_structured_data``: feed text (e.g. one page at a time) as it arrives.
+
+    Lines go through the section state machine and skill matcher as soon as they
+    are complete, so only the partial last line is held back between feeds.
+    """
+
+    def __init__(self, processor: PDFProcessor):
+        self.processor = processor
+        self.sections_dict = {}
+        self.current_section = None
+        self.current_content = []
+        self.seen_sections: Set[str] = set()
+        self.skills = {
+            'languages': set(),
+            'frameworks': set(),
+            'tools': set()
+        }
+        self._pending = ""
+        self._section_index = processor._section_index()
+        # Candidate "Technical Skills" regions, one per marker, in marker priority order.
+        # A region runs from the marker to the next line that starts with "word:".
+        self._skill_markers = [
+            re.compile(re.escape(marker), re.IGNORECASE)
+            for marker in processor.sections["Technical Skills"]
+        ]
+        self._skill_regions: List[Optional[List[str]]] = [None] * len(self._skill_markers)
+        self._open_regions: List[int] = []
+
+    def feed(self, chunk: str) -> None:
+        """Consume the next piece of document text"""
+        data = self._pending + chunk
+        complete_end = data.rfind('\n') + 1
+        self._pending = data[complete_end:]
+        if not complete_end:
+            return
+        complete = data[:complete_end]
+        self.processor._scan_tech_patterns(complete, self.skills)
+        for line in complete[:-1].split('\n'):
+            self._feed_line(line)
+
+    def finish(self) -> Dict[str, Any]:
+        """Flush the last partial line and return the validated structured data"""
+        if self._pending:
+            self.processor._scan_tech_patterns(self._pending, self.skills)
+            self._feed_line(self._pending)
+            self._pending = ""
+
+        # Add last section
+        if self.current_section and self.current_content:
+            self.sections_dict[self.current_section] = self.processor._clean_content(
+                self.current_content, self._section_index
+            )
+
+        # Use the region of the highest-priority skills marker that was found
+        for region in self._skill_regions:
+            if region is not None:
+                self.processor._parse_skills_section('\n'.join(region), self.skills)
+                break
+
+        return self.processor._validate_structured_data({
+            'sections': self.sections_dict,
+            'skills': self.processor._finalize_skills(self.skills)
+        })
+
+    def _feed_line(self, raw_line: str) -> None:
+        self._track_skill_regions(raw_line)
+
+        line = raw_line.strip()
+        if not line:
+            return
+
+        # Check for section headers
+        section_match = self.processor._match_section(line, self._section_index)
+        if section_match:
+            # Save previous section
+            if self.current_section and self.current_content:
+                self.sections_dict[self.current_section] = self.processor._clean_content(
+                    self.current_content, self._section_index
+                )
+            # Start new section
+            self.current_section = section_match
+            self.seen_sections.add(section_match)
+            self.current_content = []
+        elif self.current_section:
+            self.current_content.append(line)
+
+    def _track_skill_regions(self, raw_line: str) -> None:
+        if self._open_regions:
+            if re.match(r'\w+:', raw_line):
+                self._open_regions = []
+            else:
+                for index in self._open_regions:
+                    self._skill_regions[index].append(raw_line)
+
+        for index, marker in enumerate(self._skill_markers):
+            if self._skill_regions[index] is not None:
+                # Lower-priority markers can no longer be chosen
+                break
+            match = marker.search(raw_line)
+            if match:
+                self._skill_regions[index] = [raw_line[match.start():]]
+                self._open_regions.append(index)
@@ -1,21 +1,114 @@
+from typing import Iterable, List, Optional, Union
+
+from metrics import metrics
+from resume_profile import ResumeProfile
+
+# Skills kept per category however tight the token budget
+MIN_SKILLS_PER_CATEGORY = 3
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English text)"""
+    return (len(text) + 3) // 4
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of whitespace (including newlines) into single spaces"""
+    return " ".join(str(text).split())
+
+
+def canonical_skills(skills: Iterable[str]) -> List[str]:
+    """Deduplicate case-insensitively and sort, so equal inputs give identical bytes.
+
+    When spellings differ only by case ("python", "Python") the same one is kept
+    regardless of input order.
+    """
+    canonical = {}
+    for skill in skills:
+        skill = normalize_whitespace(skill)
+        if not skill:
+            continue
+        key = skill.casefold()
+        if key not in canonical or skill < canonical[key]:
+            canonical[key] = skill
+    return [canonical[key] for key in sorted(canonical)]
+
+
+def _format_skills(skills: List[str], total: int) -> str:
+    if not skills:
+        return 'Not specified'
+    listed = ', '.join(skills)
+    if total > len(skills):
+        listed += f" (+{total - len(skills)} more)"
+    return listed
+
+
 class PromptGenerator:
-    def generate_interview_prompt(self, structured_data: dict, company_name: str, role_name: str) -> str:
-        skills = structured_data.get('skills', {})
-        languages = skills.get('languages', [])
-        frameworks = skills.get('frameworks', [])
-        tools = skills.get('tools', [])
-        
-        # Remove duplicates and clean up skills
-        languages = list(set([lang.strip() for lang in languages]))
-        frameworks = list(set([framework.strip() for framework in frameworks]))
-        tools = list(set([tool.strip() for tool in tools]))
+    def __init__(self, max_prompt_tokens: Optional[int] = None):
+        """``max_prompt_tokens`` caps the estimated size of the prompt that is sent.
+
+        Over the cap, the longest skill list is shortened one skill at a time (from
+        the end of its sorted order, never below ``MIN_SKILLS_PER_CATEGORY``), so
+        the same input is always compacted the same way.
+        """
+        self.max_prompt_tokens = max_prompt_tokens
+
+    def generate_interview_prompt(self, structured_data: Union[dict, ResumeProfile],
+                                  company_name: str, role_name: str,
+                                  overhead_tokens: int = 0) -> str:
+        """The candidate context for a guide request.
+
+        ``overhead_tokens`` is what the LLM service wraps around this context
+        (see ``GeminiService.prompt_overhead_tokens``); it counts against the budget.
+        """
+        if isinstance(structured_data, ResumeProfile):
+            skills = structured_data.skills_dict()
+        else:
+            skills = structured_data.get('skills', {})
+
+        # Remove duplicates and clean up skills in a stable order
+        languages = canonical_skills(skills.get('languages', []))
+        frameworks = canonical_skills(skills.get('frameworks', []))
+        tools = canonical_skills(skills.get('tools', []))
+        company_name = normalize_whitespace(company_name)
+        role_name = normalize_whitespace(role_name)
+
+        prompt = self._render(company_name, role_name, languages, frameworks, tools)
+        if self.max_prompt_tokens is None:
+            return prompt
+        budget = self.max_prompt_tokens - overhead_tokens
+        if estimate_tokens(prompt) <= budget:
+            return prompt
+        return self._compact(company_name, role_name, languages, frameworks, tools, budget)
+
+    def _compact(self, company_name: str, role_name: str, languages: List[str],
+                 frameworks: List[str], tools: List[str], budget: int) -> str:
+        """Trim skill lists until the context fits ``budget`` tokens (or can't shrink further)"""
+        kept = [list(languages), list(frameworks), list(tools)]
+        totals = [len(languages), len(frameworks), len(tools)]
+        prompt = self._render(company_name, role_name, *kept, totals=totals)
+        trimmed = False
+        while estimate_tokens(prompt) > budget:
+            # Ties go to the earlier category, keeping the choice deterministic
+            longest = max(kept, key=len)
+            if len(longest) <= MIN_SKILLS_PER_CATEGORY:
+                break
+            longest.pop()
+            trimmed = True
+            prompt = self._render(company_name, role_name, *kept, totals=totals)
+        if trimmed:
+            metrics.increment("prompt_compactions_total")
+        return prompt
 
+    def _render(self, company_name: str, role_name: str, languages: List[str],
+                frameworks: List[str], tools: List[str], totals: Optional[List[int]] = None) -> str:
+        totals = totals or [len(languages), len(frameworks), len(tools)]
         prompt = f"""Creating interview guide for {role_name} position at {company_name}.
 
 Candidate's Technical Profile:
-- Programming Languages: {', '.join(languages) if languages else 'Not specified'}
-- Frameworks & Libraries: {', '.join(frameworks) if frameworks else 'Not specified'}
-- Tools & Technologies: {', '.join(tools) if tools else 'Not specified'}
+- Programming Languages: {_format_skills(languages, totals[0])}
+- Frameworks & Libraries: {_format_skills(frameworks, totals[1])}
+- Tools & Technologies: {_format_skills(tools, totals[2])}
 
 Consider {company_name}'s:
 - Technical environment and scale
@@ -24,4 +117,4 @@ Consider {company_name}'s:
 
 Provide practical examples and specific scenarios relevant to {company_name} and this role."""
 
-        return prompt
\ No newline at end of file
+        return prompt
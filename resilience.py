@@ -0,0 +1,144 @@
+"""Retry, hedging and circuit-breaker primitives for calls to the Gemini API."""
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from metrics import metrics
+
+# HTTP statuses (as exposed on google.api_core exceptions' ``code``) worth retrying
+TRANSIENT_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """True for timeouts, connection failures, rate limits and server-side errors"""
+    if isinstance(exc, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    return getattr(exc, 'code', None) in TRANSIENT_STATUS_CODES
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the API while the circuit breaker is open"""
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: attempt ``n`` sleeps U(0, min(max_delay, base * 2**n))"""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def should_retry(self, attempt: int, exc: BaseException) -> bool:
+        """Whether a failure on (zero-based) ``attempt`` deserves another try"""
+        return attempt + 1 < self.max_attempts and is_transient_error(exc)
+
+
+# Permit for calls admitted while the breaker is closed; they hold no probe slot
+_CLOSED_PERMIT = object()
+
+
+class CircuitBreaker:
+    """Stop calling a failing dependency for ``reset_timeout`` seconds.
+
+    ``allow_request`` returns a permit for one call, which the caller hands back
+    to ``record_success``, ``record_failure`` or ``release``. After
+    ``failure_threshold`` consecutive transient failures the breaker opens and
+    ``allow_request`` returns None. Once the timeout passes a single probe
+    request is let through (half-open); its outcome closes or re-opens the breaker.
+    Only the probe's own permit frees its slot, and a probe that reports no
+    outcome within ``probe_timeout`` seconds gives its slot to the next request.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 probe_timeout: float = 120.0, name: str = "gemini"):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe_timeout = probe_timeout
+        self.name = name
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe = None
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def _transition(self, state: str) -> None:
+        if state != self.state:
+            self.state = state
+            metrics.increment("circuit_breaker_transitions_total", breaker=self.name, state=state)
+            metrics.log("circuit_breaker", breaker=self.name, state=state)
+
+    def allow_request(self) -> Optional[object]:
+        """A permit for one call, or None while the breaker is open or probing"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return _CLOSED_PERMIT
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return None
+                self._transition(self.HALF_OPEN)
+            now = time.monotonic()
+            if self._probe is not None and now - self._probe_started < self.probe_timeout:
+                return None
+            self._probe = object()
+            self._probe_started = now
+            return self._probe
+
+    def _end_probe(self, permit: Optional[object]) -> None:
+        # Without a permit (e.g. a failure recorded by hand) any probe ends
+        if permit is None or permit is self._probe:
+            self._probe = None
+
+    def record_success(self, permit: Optional[object] = None) -> None:
+        with self._lock:
+            self._failures = 0
+            self._end_probe(permit)
+            self._transition(self.CLOSED)
+
+    def record_failure(self, permit: Optional[object] = None) -> None:
+        with self._lock:
+            self._failures += 1
+            self._end_probe(permit)
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._transition(self.OPEN)
+
+    def release(self, permit: object) -> None:
+        """Give back ``permit`` without an outcome (e.g. a non-transient error, or a
+        stream closed by its consumer). Only the half-open probe's permit frees
+        the probe slot; a call admitted while closed has nothing to give back."""
+        with self._lock:
+            if permit is self._probe:
+                self._probe = None
+
+
+class LatencyTracker:
+    """Sliding window of recent successful call latencies, for hedging thresholds"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Latency at ``fraction`` (0-1) of the window, or None until enough samples exist"""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(fraction * len(ordered)))
+        return ordered[index]
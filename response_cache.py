@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from metrics import metrics
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MEMORY_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_DISK_MAX_BYTES = 256 * 1024 * 1024
+
+
+class ResponseCache:
+    """Two-tier (memory, optional SQLite) cache of LLM responses with TTL and LRU eviction"""
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_bytes: int = DEFAULT_MEMORY_MAX_BYTES,
+                 disk_path: Optional[str] = None,
+                 disk_max_bytes: int = DEFAULT_DISK_MAX_BYTES):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()  # key -> (value, expires_at, size)
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if disk_path:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(disk_path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_responses_last_access "
+                "ON llm_responses (last_access)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(prompt: str, model_name: str, generation_config: Dict[str, Any]) -> str:
+        """Hash of everything that determines the model output"""
+        material = json.dumps(
+            {'prompt': prompt, 'model': model_name, 'config': generation_config},
+            sort_keys=True
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a live cached response, checking memory first and then disk"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at, size = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    metrics.increment("cache_requests_total", cache="response",
+                                      result="hit", tier="memory")
+                    return value
+                self._drop_memory(key)
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM llm_responses WHERE key = ?",
+                    (key,)
+                ).fetchone()
+                if row is not None:
+                    value, expires_at = row
+                    if expires_at > now:
+                        self._conn.execute(
+                            "UPDATE llm_responses SET last_access = ? WHERE key = ?",
+                            (now, key)
+                        )
+                        self._conn.commit()
+                        self._put_memory(key, value, expires_at)
+                        self.hits += 1
+                        metrics.increment("cache_requests_total", cache="response",
+                                          result="hit", tier="disk")
+                        return value
+                    self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                    self._conn.commit()
+
+            self.misses += 1
+            metrics.increment("cache_requests_total", cache="response", result="miss")
+            return None
+
+    def put(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> None:
+        """Store a response in every tier with a per-entry TTL"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        now = time.time()
+        expires_at = now + ttl
+        with self._lock:
+            self._put_memory(key, value, expires_at)
+            if self._conn is not None:
+                size = len(value.encode("utf-8"))
+                if size <= self.disk_max_bytes:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO llm_responses "
+                        "(key, value, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                        (key, value, size, expires_at, now)
+                    )
+                    self._evict_disk(now)
+                    self._conn.commit()
+
+    def _put_memory(self, key: str, value: str, expires_at: float) -> None:
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        if key in self._memory:
+            self._drop_memory(key)
+        self._memory[key] = (value, expires_at, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_bytes:
+            oldest = next(iter(self._memory))
+            self._drop_memory(oldest)
+
+    def _drop_memory(self, key: str) -> None:
+        _, _, size = self._memory.pop(key)
+        self._memory_bytes -= size
+
+    def _evict_disk(self, now: float) -> None:
+        """Remove expired entries, then least recently used ones over the size cap"""
+        self._conn.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (now,))
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM llm_responses"
+        ).fetchone()[0]
+        if total <= self.disk_max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM llm_responses ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.disk_max_bytes:
+                break
+            self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+            total -= size
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current footprint of each tier"""
+        with self._lock:
+            stats = {
+                'hits': self.hits,
+                'misses': self.misses,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes
+            }
+            if self._conn is not None:
+                entries, size = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+                ).fetchone()
+                stats['disk_entries'] = entries
+                stats['disk_bytes'] = size
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM llm_responses")
+                self._conn.commit()
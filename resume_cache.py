@@ -0,0 +1,138 @@
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from metrics import metrics
+from pdf_processor import PARSER_VERSION
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "resumes.sqlite3")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ResumeCache:
+    """Disk-backed cache of parsed resumes keyed by PDF content, parser version and
+    the settings that shape the parse (see ``PDFProcessor.parse_settings``)"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS parsed_resumes (
+                key TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                structured_data TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_parsed_resumes_last_access "
+            "ON parsed_resumes (last_access)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(pdf_bytes: bytes, settings: str = "") -> str:
+        """Content address for a PDF: hash of its bytes plus the parser version and settings"""
+        digest = hashlib.sha256(pdf_bytes).hexdigest()
+        return f"{PARSER_VERSION}:{settings}:{digest}"
+
+    def get(self, pdf_bytes: bytes, settings: str = "") -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Return cached (text, structured_data) for a PDF, or None on a miss"""
+        key = self.make_key(pdf_bytes, settings)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, structured_data FROM parsed_resumes WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                metrics.increment("cache_requests_total", cache="resume", result="miss")
+                return None
+            self._conn.execute(
+                "UPDATE parsed_resumes SET last_access = ? WHERE key = ?",
+                (time.time(), key)
+            )
+            self._conn.commit()
+            self.hits += 1
+        metrics.increment("cache_requests_total", cache="resume", result="hit")
+        return row[0], json.loads(row[1])
+
+    def put(self, pdf_bytes: bytes, text: str, structured_data: Dict[str, Any],
+            settings: str = "") -> None:
+        """Store a parsed resume and evict least recently used entries over the size cap"""
+        key = self.make_key(pdf_bytes, settings)
+        payload = json.dumps(structured_data)
+        size = len(text.encode("utf-8")) + len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parsed_resumes "
+                "(key, text, structured_data, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, text, payload, size, time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM parsed_resumes"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM parsed_resumes ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM parsed_resumes WHERE key = ?", (key,))
+            total -= size
+
+    def get_or_parse(self, pdf_bytes: bytes, pdf_processor) -> Tuple[str, Dict[str, Any]]:
+        """Return the parsed resume from cache, parsing and storing it on a miss"""
+        # A parse by another backend, or cut short under other limits, is not reused
+        settings = pdf_processor.parse_settings()
+        cached = self.get(pdf_bytes, settings)
+        if cached is not None:
+            return cached
+        text, structured_data = pdf_processor.extract_structured(io.BytesIO(pdf_bytes))
+        self.put(pdf_bytes, text, structured_data, settings)
+        return text, structured_data
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current footprint of the cache"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parsed_resumes"
+            ).fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': entries,
+            'bytes': size
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM parsed_resumes")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,193 @@
+"""Compact in-memory form of a parsed resume.
+
+``ResumeProfile`` holds the same information as the ``structured_data`` dict
+built by ``PDFProcessor`` (sections of text lines plus categorized skills) in
+far less memory: sections are slotted records of tuples, section names and
+skills are interned, and skills known to ``tech_patterns`` are bits in one
+integer, so overlap between profiles is a couple of bit operations.
+"""
+import re
+import sys
+from functools import lru_cache
+from itertools import product
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SKILL_CATEGORIES = ('languages', 'frameworks', 'tools')
+
+# Tokens of the simple regexes used in tech_patterns: an optional group, an
+# optional character class, an escaped character or a plain character
+_PATTERN_TOKEN_RE = re.compile(r'\(\?:([^()]*)\)\?|\[(.)\]\?|\\(.)|(.)')
+
+
+def expand_pattern(pattern: str) -> List[str]:
+    """Literal spellings a skill pattern matches, e.g. r'Java(?:Script)?' gives Java and JavaScript"""
+    options = []
+    for optional_group, optional_char, escaped, literal in _PATTERN_TOKEN_RE.findall(pattern):
+        if optional_group:
+            options.append(("", optional_group.replace("\\", "")))
+        elif optional_char:
+            options.append(("", optional_char))
+        else:
+            options.append((escaped or literal,))
+    return ["".join(parts) for parts in product(*options)]
+
+
+def skill_sort_key(skill: str) -> Tuple[str, str]:
+    """Case-insensitive order with case-only variants ordered by spelling"""
+    return skill.lower(), skill
+
+
+def _iter_bits(mask: int) -> Iterable[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+if hasattr(int, "bit_count"):  # Python 3.10+
+    _popcount = int.bit_count
+else:
+    def _popcount(mask: int) -> int:
+        return bin(mask).count("1")
+
+
+class SkillVocabulary:
+    """Fixed bit positions for every spelling the skill patterns can match"""
+
+    __slots__ = ('spellings', 'categories', 'category_masks', '_bits')
+
+    def __init__(self, patterns: Tuple[Tuple[str, Tuple[str, ...]], ...]):
+        spellings = []
+        categories = []
+        bits = {}
+        category_masks = dict.fromkeys(SKILL_CATEGORIES, 0)
+        for category, category_patterns in patterns:
+            category_masks.setdefault(category, 0)
+            for pattern in category_patterns:
+                for spelling in expand_pattern(pattern):
+                    key = (category, spelling.casefold())
+                    if key in bits:
+                        continue
+                    bits[key] = len(spellings)
+                    category_masks[category] |= 1 << len(spellings)
+                    spellings.append(sys.intern(spelling))
+                    categories.append(sys.intern(category))
+        self.spellings = tuple(spellings)
+        self.categories = tuple(categories)
+        self.category_masks = category_masks
+        self._bits = bits
+
+    def __len__(self) -> int:
+        return len(self.spellings)
+
+    def bit(self, category: str, skill: str) -> Optional[int]:
+        """Bit position of a skill (case-insensitive), or None if it is not in the vocabulary"""
+        return self._bits.get((category, skill.casefold()))
+
+    def mask(self, skills: Dict[str, Iterable[str]]) -> int:
+        """Bitset of the known skills in a ``{'languages': [...], ...}`` dict"""
+        mask = 0
+        for category, names in skills.items():
+            for name in names:
+                bit = self.bit(category, name)
+                if bit is not None:
+                    mask |= 1 << bit
+        return mask
+
+
+@lru_cache(maxsize=None)
+def skill_vocabulary(patterns: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> SkillVocabulary:
+    """Process-wide vocabulary for a ``PDFProcessor._skill_patterns_key()`` snapshot"""
+    return SkillVocabulary(patterns)
+
+
+class SectionRecord:
+    """One resume section: its name and cleaned content lines"""
+
+    __slots__ = ('name', 'lines')
+
+    def __init__(self, name: str, lines: Iterable[str]):
+        self.name = sys.intern(name)
+        self.lines = tuple(lines)
+
+    def __repr__(self) -> str:
+        return f"SectionRecord({self.name!r}, {len(self.lines)} lines)"
+
+
+class ResumeProfile:
+    """Parsed resume with a skill bitset; converts losslessly to and from the dict format.
+
+    ``skill_bits`` has a bit set for every vocabulary skill the resume lists.
+    Skills outside the vocabulary, and vocabulary skills written differently
+    from their canonical spelling (``respelled_bits``), keep their exact text
+    in ``extra_skills`` so ``to_dict`` reproduces the original names.
+    """
+
+    __slots__ = ('vocabulary', 'sections', 'skill_bits', 'respelled_bits', 'extra_skills')
+
+    def __init__(self, vocabulary: SkillVocabulary, sections: Tuple[SectionRecord, ...],
+                 skill_bits: int, respelled_bits: int, extra_skills: Tuple[Tuple[str, ...], ...]):
+        self.vocabulary = vocabulary
+        self.sections = sections
+        self.skill_bits = skill_bits
+        self.respelled_bits = respelled_bits
+        self.extra_skills = extra_skills
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], vocabulary: SkillVocabulary) -> 'ResumeProfile':
+        """Build from the ``{'sections': ..., 'skills': ...}`` dict produced by PDFProcessor"""
+        sections = tuple(
+            SectionRecord(name, lines)
+            for name, lines in (data.get('sections') or {}).items()
+        )
+        skills = data.get('skills') or {}
+        skill_bits = 0
+        canonical_bits = 0
+        extras = []
+        for category in SKILL_CATEGORIES:
+            category_extras = []
+            for skill in dict.fromkeys(skills.get(category) or ()):
+                bit = vocabulary.bit(category, skill)
+                if bit is None:
+                    category_extras.append(sys.intern(skill))
+                    continue
+                skill_bits |= 1 << bit
+                if skill == vocabulary.spellings[bit]:
+                    canonical_bits |= 1 << bit
+                else:
+                    category_extras.append(sys.intern(skill))
+            extras.append(tuple(category_extras))
+        return cls(vocabulary, sections, skill_bits, skill_bits & ~canonical_bits, tuple(extras))
+
+    def skills(self, category: str) -> List[str]:
+        """Skills of one category, in the order extract_skills returns them"""
+        spellings = self.vocabulary.spellings
+        mask = self.skill_bits & ~self.respelled_bits & self.vocabulary.category_masks[category]
+        names = [spellings[bit] for bit in _iter_bits(mask)]
+        names.extend(self.extra_skills[SKILL_CATEGORIES.index(category)])
+        return sorted(names, key=skill_sort_key)
+
+    def skills_dict(self) -> Dict[str, List[str]]:
+        return {category: self.skills(category) for category in SKILL_CATEGORIES}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The ``structured_data`` dict this profile was built from"""
+        return {
+            'sections': {section.name: list(section.lines) for section in self.sections},
+            'skills': self.skills_dict()
+        }
+
+    def has_skill(self, category: str, skill: str) -> bool:
+        bit = self.vocabulary.bit(category, skill)
+        if bit is not None:
+            return bool(self.skill_bits >> bit & 1)
+        return skill in self.extra_skills[SKILL_CATEGORIES.index(category)]
+
+    def shared_skills(self, other: 'ResumeProfile') -> int:
+        """Number of vocabulary skills both profiles list"""
+        return _popcount(self.skill_bits & other.skill_bits)
+
+    def skill_similarity(self, other: 'ResumeProfile') -> float:
+        """Jaccard similarity of the two profiles' vocabulary skills"""
+        union = _popcount(self.skill_bits | other.skill_bits)
+        return _popcount(self.skill_bits & other.skill_bits) / union if union else 0.0
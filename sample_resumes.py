@@ -0,0 +1,139 @@
+"""Generated resume PDFs.
+
+Resumes are generated deterministically from a seed in several section
+layouts and written as real (minimal, uncompressed) PDFs, so the whole
+extraction path can be exercised without sample documents: ``pdf_backends``
+calibrates on them at startup, and the benchmarks and tests use them as a corpus.
+"""
+import random
+from typing import Dict, List, Optional
+
+LINES_PER_PAGE = 58
+
+# Header variants come from PDFProcessor.sections so every marker gets exercised
+LAYOUTS = {
+    'classic': ["EDUCATION", "EXPERIENCE", "PROJECTS", "TECHNICAL SKILLS", "CERTIFICATIONS"],
+    'skills_first': ["TECHNICAL SKILLS", "WORK EXPERIENCE", "PERSONAL PROJECTS", "ACADEMIC BACKGROUND"],
+    'academic': ["ACADEMIC QUALIFICATIONS", "PROFESSIONAL EXPERIENCE", "ACADEMIC PROJECTS",
+                 "TECHNOLOGIES", "ACHIEVEMENTS", "COURSES"],
+    'minimal': ["Experience", "Skills", "Education"],
+}
+
+LANGUAGES = ["Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust", "Kotlin",
+             "Scala", "Ruby", "PHP", "SQL", "Bash", "R", "MATLAB", "Swift"]
+FRAMEWORKS = ["React", "Angular", "Vue.js", "Django", "Flask", "FastAPI", "Spring Boot", "Node.js",
+              "Express", "TensorFlow", "PyTorch", "Pandas", "NumPy", "Flutter", "React Native",
+              "Ruby on Rails", "Next.js", "Pytest", "JUnit"]
+TOOLS = ["Git", "GitHub", "Docker", "Kubernetes", "Jenkins", "AWS", "Azure", "GCP", "PostgreSQL",
+         "MySQL", "MongoDB", "Redis", "VS Code", "IntelliJ", "Jira", "Figma", "Postman"]
+VERBS = ["Built", "Designed", "Led", "Migrated", "Optimized", "Automated", "Maintained", "Shipped"]
+NOUNS = ["data pipeline", "payments service", "search index", "internal dashboard", "mobile app",
+         "recommendation model", "CI workflow", "billing system", "feature store", "REST API"]
+FILLER = ["improving latency by 40%", "serving 2M daily users", "with a team of five engineers",
+          "cutting cloud spend in half", "under a strict compliance regime", "across three regions"]
+
+
+def _bullet(rng: random.Random) -> str:
+    tech = rng.sample(LANGUAGES, 1) + rng.sample(FRAMEWORKS, 1) + rng.sample(TOOLS, 1)
+    return (f"- {rng.choice(VERBS)} a {rng.choice(NOUNS)} using {', '.join(tech)} "
+            f"{rng.choice(FILLER)}")
+
+
+def _is_skills_header(header: str) -> bool:
+    upper = header.upper()
+    return "SKILL" in upper or "TECHNOLOG" in upper
+
+
+def _section_lines(header: str, rng: random.Random, filler_lines: int) -> List[str]:
+    upper = header.upper()
+    lines = [header]
+    if _is_skills_header(header):
+        lines.append(f"Languages: {', '.join(rng.sample(LANGUAGES, 6))}")
+        lines.append(f"Frameworks: {', '.join(rng.sample(FRAMEWORKS, 5))}")
+        lines.append(f"Tools: {', '.join(rng.sample(TOOLS, 6))}")
+    elif "EDUCATION" in upper or ("ACADEMIC" in upper and "PROJECT" not in upper):
+        lines.append("B.S. Computer Science, State University, 2016 - 2020")
+        lines.append(f"GPA: {rng.uniform(3.0, 4.0):.2f}")
+        for index in range(filler_lines):
+            lines.append(f"[{index + 1}] Paper on {rng.choice(NOUNS)} {rng.choice(FILLER)}, "
+                         f"Proc. of Conference {2010 + index % 14}")
+    else:
+        for _ in range(max(2, filler_lines)):
+            lines.append(_bullet(rng))
+    lines.append("")
+    return lines
+
+
+def generate_resume_lines(pages: int, layout: str = 'classic', seed: int = 0) -> List[str]:
+    """Resume text lines long enough to fill roughly ``pages`` PDF pages"""
+    rng = random.Random(f"{layout}:{pages}:{seed}")
+    headers = LAYOUTS[layout]
+    target = pages * LINES_PER_PAGE
+    fixed = sum(len(_section_lines(header, rng, 0)) for header in headers) + 3
+    # Skills sections have a fixed size; the rest share the filler
+    fillable = sum(1 for header in headers if not _is_skills_header(header))
+    per_section = max(0, (target - fixed) // fillable)
+    lines = ["Jordan Example", "jordan@example.com | github.com/jordan-example", ""]
+    for header in headers:
+        lines.extend(_section_lines(header, rng, per_section))
+    return lines
+
+
+def _escape(text: str) -> str:
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(lines: List[str], lines_per_page: int = LINES_PER_PAGE) -> bytes:
+    """Write lines into a minimal multi-page PDF using the built-in Helvetica font"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # filled in once the page tree id is known
+    page_tree = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    page_ids = []
+    for page_lines in pages:
+        commands = ["BT", "/F1 10 Tf", "12 TL", "50 760 Td"]
+        for line in page_lines:
+            commands.append(f"({_escape(line)}) Tj T*")
+        commands.append("ET")
+        stream = "\n".join(commands).encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (page_tree, font, content)
+        ))
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % page_tree
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[page_tree - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog, xref
+    )
+    return bytes(out)
+
+
+def generate_corpus(page_counts: List[int], layouts: Optional[List[str]] = None,
+                    seed: int = 0) -> Dict[str, bytes]:
+    """Map of "<layout>_<pages>p.pdf" to PDF bytes for every layout and size"""
+    corpus = {}
+    for layout in layouts or list(LAYOUTS):
+        for pages in page_counts:
+            lines = generate_resume_lines(pages, layout, seed)
+            corpus[f"{layout}_{pages}p.pdf"] = build_pdf(lines)
+    return corpus
@@ -0,0 +1,88 @@
+"""Build the app's services from environment variables.
+
+Shared by the Streamlit app (which keeps one of each per process) and the job
+queue workers, so both are configured by the same variables.
+"""
+import os
+from typing import Optional
+
+from gemini_service import GeminiService
+from pdf_backends import AUTO_BACKEND
+from pdf_processor import (
+    PDFProcessor, MAX_PDF_BYTES, MAX_PDF_PAGES, PAGE_TIMEOUT_SECONDS, MAX_TEXT_CHARS
+)
+from prompts import PromptGenerator
+from resume_cache import ResumeCache, DEFAULT_CACHE_PATH, DEFAULT_MAX_BYTES
+from response_cache import ResponseCache, DEFAULT_TTL_SECONDS, DEFAULT_MEMORY_MAX_BYTES
+from similarity_index import SkillSimilarityIndex
+
+
+def guide_settings() -> dict:
+    """How guides are generated: latency budget (seconds, 0 for none) and per-section requests"""
+    return {
+        'latency_budget': float(os.getenv("GUIDE_LATENCY_BUDGET") or 0),
+        'parallel_sections': os.getenv("GUIDE_PARALLEL_SECTIONS", "").lower() in ("1", "true", "yes")
+    }
+
+
+def build_resume_cache() -> ResumeCache:
+    """Parsed-resume cache on disk"""
+    return ResumeCache(
+        path=os.getenv("RESUME_CACHE_PATH", DEFAULT_CACHE_PATH),
+        max_bytes=int(os.getenv("RESUME_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+    )
+
+
+def build_response_cache() -> ResponseCache:
+    """LLM response cache; the disk tier is enabled by RESPONSE_CACHE_PATH"""
+    return ResponseCache(
+        ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+        max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", DEFAULT_MEMORY_MAX_BYTES)),
+        disk_path=os.getenv("RESPONSE_CACHE_PATH") or None
+    )
+
+
+def build_llm_service(api_key: str, response_cache: Optional[ResponseCache]) -> GeminiService:
+    """Gemini client; configures the SDK and builds the model right away"""
+    request_timeout = os.getenv("GEMINI_REQUEST_TIMEOUT")
+    hedge_percentile = os.getenv("GEMINI_HEDGE_PERCENTILE")
+    return GeminiService(
+        api_key,
+        response_cache=response_cache,
+        request_timeout=float(request_timeout) if request_timeout else None,
+        hedge_percentile=float(hedge_percentile) if hedge_percentile else None
+    )
+
+
+def build_pdf_processor(parallel_pages: bool = True) -> PDFProcessor:
+    """PDF parser; the PDF_* variables pick the text extractor and bound what one
+    upload may cost (0 disables a cap)"""
+    return PDFProcessor(
+        parallel_pages=parallel_pages,
+        max_bytes=int(os.getenv("PDF_MAX_BYTES", MAX_PDF_BYTES)) or None,
+        max_pages=int(os.getenv("PDF_MAX_PAGES", MAX_PDF_PAGES)) or None,
+        page_timeout=float(os.getenv("PDF_PAGE_TIMEOUT", PAGE_TIMEOUT_SECONDS)) or None,
+        max_chars=int(os.getenv("PDF_MAX_CHARS", MAX_TEXT_CHARS)) or None,
+        stop_after_sections=os.getenv("PDF_STOP_AFTER_SECTIONS", "").lower() in ("1", "true", "yes"),
+        backend=os.getenv("PDF_BACKEND", AUTO_BACKEND)
+    )
+
+
+def build_prompt_generator() -> PromptGenerator:
+    """Prompt builder; PROMPT_TOKEN_BUDGET trims long skill lists to fit"""
+    budget = os.getenv("PROMPT_TOKEN_BUDGET")
+    return PromptGenerator(max_prompt_tokens=int(budget) if budget else None)
+
+
+def build_similarity_index(response_cache: ResponseCache,
+                           pdf_processor: PDFProcessor) -> Optional[SkillSimilarityIndex]:
+    """Reuse of guides across similar resumes, enabled by SIMILARITY_REUSE_THRESHOLD"""
+    threshold = os.getenv("SIMILARITY_REUSE_THRESHOLD")
+    if not threshold:
+        return None
+    return SkillSimilarityIndex(
+        response_cache,
+        pdf_processor.skill_vocabulary(),
+        threshold=float(threshold),
+        metric=os.getenv("SIMILARITY_REUSE_METRIC", "jaccard")
+    )
@@ -0,0 +1,179 @@
+"""Reuse cached guides across resumes with nearly the same skills.
+
+Guides are generated per (company, role, guide mode) from the candidate's
+skills, so a new resume whose skills closely match one we already have a guide
+for can be served that guide instead of a fresh Gemini call. The index keeps,
+per (company, role, mode), a resume-by-skill matrix over the ``tech_patterns``
+vocabulary and scores a new profile against every row at once with NumPy.
+Without NumPy it falls back to the profiles' integer bitsets.
+"""
+import threading
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: scoring falls back to pure-Python bit counting
+    np = None
+
+from metrics import metrics
+from prompts import normalize_whitespace
+from response_cache import ResponseCache
+from resume_profile import ResumeProfile, SkillVocabulary, _iter_bits, _popcount
+
+DEFAULT_THRESHOLD = 0.9
+DEFAULT_MAX_ENTRIES = 4096
+SIMILARITY_METRICS = ('jaccard', 'cosine')
+
+GroupKey = Tuple[str, str, str]
+
+
+class _Group:
+    """Skill rows and guide cache keys for one (company, role, mode); a ring buffer"""
+
+    def __init__(self, width: int, capacity: int):
+        self.capacity = capacity
+        self.keys: List[Optional[str]] = []
+        self.bits: List[int] = []
+        # Row of each cache key, so a guide seen again updates its row
+        self.rows: Dict[str, int] = {}
+        self.next = 0
+        if np is not None:
+            self.matrix = np.zeros((0, width), dtype=np.float32)
+            self.sizes = np.zeros(0, dtype=np.float32)
+
+    def add(self, vector, bits: int, cache_key: str) -> None:
+        index = self.rows.get(cache_key)
+        if index is not None:
+            self.bits[index] = bits
+        elif len(self.keys) < self.capacity:
+            index = len(self.keys)
+            self.keys.append(cache_key)
+            self.bits.append(bits)
+            if np is not None and index >= len(self.matrix):
+                # Grow geometrically so adding rows stays amortized O(1)
+                rows = min(max(2 * len(self.matrix), 16), self.capacity)
+                self.matrix = np.resize(self.matrix, (rows, self.matrix.shape[1]))
+                self.sizes = np.resize(self.sizes, rows)
+        else:
+            # Full: overwrite the oldest row
+            index = self.next
+            self.next = (self.next + 1) % self.capacity
+            del self.rows[self.keys[index]]
+            self.keys[index] = cache_key
+            self.bits[index] = bits
+        self.rows[cache_key] = index
+        if np is not None:
+            self.matrix[index] = vector
+            self.sizes[index] = vector.sum()
+
+
+class SkillSimilarityIndex:
+    """Nearest cached guide for a resume profile, by skill-set similarity.
+
+    ``threshold`` is the minimum Jaccard (or cosine) similarity over vocabulary
+    skills for a stored guide to be reused. Guides live in ``response_cache``;
+    the index only remembers their keys, so expired guides simply stop matching.
+    """
+
+    def __init__(self, response_cache: ResponseCache, vocabulary: SkillVocabulary,
+                 threshold: float = DEFAULT_THRESHOLD, metric: str = 'jaccard',
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        if metric not in SIMILARITY_METRICS:
+            raise ValueError(f"Unknown similarity metric {metric!r}")
+        self.response_cache = response_cache
+        self.vocabulary = vocabulary
+        self.threshold = threshold
+        self.metric = metric
+        self.max_entries = max_entries
+        self._groups: Dict[GroupKey, _Group] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _group_key(company: str, role: str, mode: str) -> GroupKey:
+        return normalize_whitespace(company).casefold(), normalize_whitespace(role).casefold(), mode
+
+    def _vector(self, bits: int):
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        vector[list(_iter_bits(bits))] = 1.0
+        return vector
+
+    def add(self, profile: ResumeProfile, company: str, role: str, mode: str, cache_key: str) -> None:
+        """Remember that the guide stored under ``cache_key`` was generated for ``profile``.
+
+        A key the group already holds keeps its row, so serving the same guide
+        again does not push other profiles out of the buffer.
+        """
+        if not profile.skill_bits or cache_key is None:
+            return
+        vector = self._vector(profile.skill_bits) if np is not None else None
+        with self._lock:
+            group = self._groups.get(self._group_key(company, role, mode))
+            if group is None:
+                group = _Group(len(self.vocabulary), self.max_entries)
+                self._groups[self._group_key(company, role, mode)] = group
+            group.add(vector, profile.skill_bits, cache_key)
+
+    def _scores(self, group: _Group, bits: int):
+        """(score, row) for rows at or above the threshold, most similar first"""
+        if np is not None:
+            vector = self._vector(bits)
+            rows = len(group.keys)
+            sizes = group.sizes[:rows]
+            shared = group.matrix[:rows] @ vector
+            if self.metric == 'jaccard':
+                union = sizes + vector.sum() - shared
+                scores = np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+            else:
+                norms = np.sqrt(sizes * vector.sum())
+                scores = np.divide(shared, norms, out=np.zeros_like(shared), where=norms > 0)
+            above = np.flatnonzero(scores >= self.threshold)
+            order = above[np.argsort(-scores[above], kind='stable')]
+            return [(float(scores[row]), int(row)) for row in order]
+        size = _popcount(bits)
+        scores = []
+        for row, row_bits in enumerate(group.bits):
+            shared = _popcount(bits & row_bits)
+            if self.metric == 'jaccard':
+                union = _popcount(bits | row_bits)
+                score = shared / union if union else 0.0
+            else:
+                norm = (size * _popcount(row_bits)) ** 0.5
+                score = shared / norm if norm else 0.0
+            if score >= self.threshold:
+                scores.append((score, row))
+        scores.sort(key=lambda item: -item[0])
+        return scores
+
+    def lookup(self, profile: ResumeProfile, company: str, role: str, mode: str) -> Optional[str]:
+        """A stored guide for a similar profile (adapted to this one), or None"""
+        if not profile.skill_bits:
+            return None
+        with self._lock:
+            group = self._groups.get(self._group_key(company, role, mode))
+            if group is None or not group.keys:
+                metrics.increment("similarity_reuse_total", outcome="miss")
+                return None
+            candidates = [
+                (score, group.keys[row], group.bits[row])
+                for score, row in self._scores(group, profile.skill_bits)
+            ]
+        for score, cache_key, matched_bits in candidates:
+            guide = self.response_cache.get(cache_key)
+            if guide is None:
+                # Expired or evicted from the response cache; try the next best
+                metrics.increment("similarity_reuse_total", outcome="expired")
+                continue
+            metrics.increment("similarity_reuse_total", outcome="hit")
+            metrics.log("similarity_reuse", score=round(score, 4), metric=self.metric)
+            return self.adapt(guide, profile.skill_bits & ~matched_bits)
+        metrics.increment("similarity_reuse_total", outcome="miss")
+        return None
+
+    def adapt(self, guide: str, missing_bits: int) -> str:
+        """Point out the candidate's skills that the reused guide was not written for"""
+        if not missing_bits:
+            return guide
+        skills = sorted((self.vocabulary.spellings[bit] for bit in _iter_bits(missing_bits)),
+                        key=str.lower)
+        return (guide.rstrip() + "\n\n# Additional Skills to Review\n"
+                f"Also be ready to discuss: {', '.join(skills)}.\n")
@@ -0,0 +1,150 @@
+"""Coalesce concurrent identical calls into one in-flight execution.
+
+The first caller for a key (the leader) does the work; callers arriving with
+the same key while it runs wait for and share its result, or its exception.
+Waiting callers give up with ``TimeoutError`` after ``timeout`` seconds.
+"""
+import asyncio
+import threading
+import weakref
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from metrics import metrics
+
+
+class FlightAbandonedError(Exception):
+    """The leader of a streamed flight stopped before the stream finished"""
+
+
+class _Flight:
+    """Result (or chunks, for streams) of one in-flight call, shared with waiters"""
+
+    def __init__(self):
+        self.chunks: List[Any] = []
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.done = False
+        self._cond = threading.Condition()
+
+    def publish(self, chunk: Any) -> None:
+        with self._cond:
+            self.chunks.append(chunk)
+            self._cond.notify_all()
+
+    def finish(self, result: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._cond:
+            self.result = result
+            self.error = error
+            self.done = True
+            self._cond.notify_all()
+
+    def wait(self, timeout: Optional[float]) -> Any:
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.done, timeout):
+                raise TimeoutError(f"coalesced call did not finish within {timeout}s")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def follow(self, timeout: Optional[float]) -> Iterator[Any]:
+        """Yield every chunk, past and future; ``timeout`` bounds each wait for the next one"""
+        index = 0
+        while True:
+            with self._cond:
+                ready = self._cond.wait_for(lambda: self.done or index < len(self.chunks), timeout)
+                if not ready:
+                    raise TimeoutError(f"coalesced stream stalled for {timeout}s")
+                pending = self.chunks[index:]
+                done = self.done
+            for chunk in pending:
+                yield chunk
+            index += len(pending)
+            if done and index >= len(self.chunks):
+                break
+        if self.error is not None:
+            raise self.error
+
+
+class SingleFlight:
+    """Per-key deduplication of concurrent sync, streaming and async calls"""
+
+    def __init__(self, name: str = "gemini"):
+        self.name = name
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        # asyncio tasks are bound to one event loop, so keep one table per loop
+        self._async_flights = weakref.WeakKeyDictionary()
+
+    def _join(self, key: str):
+        """(flight, is_leader) for ``key``"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                metrics.increment("singleflight_coalesced_total", flight=self.name)
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            return flight, True
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def do(self, key: str, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """Run ``fn()`` once for all concurrent callers with the same ``key``"""
+        flight, leader = self._join(key)
+        if not leader:
+            return flight.wait(timeout)
+        try:
+            result = fn()
+        except BaseException as e:
+            flight.finish(error=e)
+            raise
+        else:
+            flight.finish(result=result)
+            return result
+        finally:
+            self._forget(key, flight)
+
+    def stream(self, key: str, fn: Callable[[], Iterator[Any]],
+               timeout: Optional[float] = None) -> Iterator[Any]:
+        """Iterate ``fn()`` once; concurrent callers replay and then follow its chunks"""
+        flight, leader = self._join(key)
+        if not leader:
+            yield from flight.follow(timeout)
+            return
+        try:
+            for chunk in fn():
+                flight.publish(chunk)
+                yield chunk
+        except GeneratorExit:
+            flight.finish(error=FlightAbandonedError("stream closed by its leader"))
+            raise
+        except BaseException as e:
+            flight.finish(error=e)
+            raise
+        else:
+            flight.finish()
+        finally:
+            self._forget(key, flight)
+
+    async def do_async(self, key: str, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """Await ``fn()`` once per event loop for all concurrent callers with the same ``key``.
+
+        The work runs in its own task, so cancelling any one caller (the leader
+        included) does not cancel it for the others.
+        """
+        loop = asyncio.get_running_loop()
+        flights = self._async_flights.get(loop)
+        if flights is None:
+            flights = self._async_flights[loop] = {}
+        task = flights.get(key)
+        if task is None:
+            task = flights[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: flights.pop(key, None) if flights.get(key) is done else None)
+            return await asyncio.shield(task)
+        metrics.increment("singleflight_coalesced_total", flight=self.name)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"coalesced call did not finish within {timeout}s") from None
@@ -0,0 +1,73 @@
+"""SQLite job queue: claiming, late finishes and stale jobs"""
+import time
+
+import pytest
+
+from job_queue import DONE, FAILED, QUEUED, RUNNING, JobQueue
+from metrics import metrics
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), stale_after=0.05, max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def failed_count():
+    return metrics.snapshot()['counters'].get('jobs_total', {}).get('{event="failed"}', 0)
+
+
+def test_jobs_are_claimed_oldest_first(queue):
+    first = queue.submit(b"%PDF-1", "Acme", "Backend Developer", "standard")
+    second = queue.submit(b"%PDF-2", "Acme", "Data Scientist", "short")
+    job = queue.claim("w1")
+    assert job['id'] == first and job['pdf'] == b"%PDF-1"
+    assert job['status'] == RUNNING and job['attempts'] == 1
+    assert queue.position(second) == 0
+    assert queue.claim("w2")['id'] == second
+    assert queue.claim("w3") is None
+
+
+def test_complete_stores_the_result(queue):
+    job_id = queue.submit(b"%PDF", "Acme", "Backend Developer", "standard")
+    queue.claim("w1")
+    assert queue.complete(job_id, "w1", {'response': "guide"})
+    job = queue.get(job_id)
+    assert job['status'] == DONE and job['result'] == {'response': "guide"}
+
+
+def test_late_finish_does_not_overwrite_a_failed_job(queue):
+    job_id = queue.submit(b"%PDF", "Acme", "Backend Developer", "standard")
+    queue.claim("w1")
+    assert queue.fail(job_id, "w1", "boom")
+    assert not queue.complete(job_id, "w1", {'response': "late guide"})
+    job = queue.get(job_id)
+    assert job['status'] == FAILED and job['result'] is None
+
+
+def test_stalled_worker_cannot_finish_a_reclaimed_job(queue):
+    job_id = queue.submit(b"%PDF", "Acme", "Backend Developer", "standard")
+    queue.claim("stalled")
+    time.sleep(0.06)
+    assert queue.requeue_stale() == 1
+    assert queue.claim("w2")['id'] == job_id
+
+    assert not queue.complete(job_id, "stalled", {'response': "stale guide"})
+    assert queue.get(job_id)['status'] == RUNNING
+    assert queue.complete(job_id, "w2", {'response': "guide"})
+    assert queue.get(job_id)['result'] == {'response': "guide"}
+
+
+def test_stale_job_fails_after_max_attempts_and_is_counted(queue):
+    job_id = queue.submit(b"%PDF", "Acme", "Backend Developer", "standard")
+    before = failed_count()
+    for attempt in range(2):
+        queue.claim(f"w{attempt}")
+        time.sleep(0.06)
+        queue.requeue_stale()
+    job = queue.get(job_id)
+    assert job['status'] == FAILED
+    assert failed_count() == before + 1
+    assert queue.stats() == {FAILED: 1}
+    assert QUEUED not in queue.stats()
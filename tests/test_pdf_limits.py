@@ -0,0 +1,187 @@
+"""Ingestion limits on synthetic PDFs"""
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+import pdf_backends
+import pdf_processor
+from metrics import metrics
+from pdf_backends import (
+    AUTO_BACKEND, BACKENDS, DEFAULT_BACKEND, PyPDF2Backend, _PyPDF2Document, auto_backend,
+    available_backends, calibrate, calibration_samples
+)
+from pdf_processor import PDFLimitError, PDFProcessor
+from sample_resumes import build_pdf, generate_resume_lines
+
+HOSTILE_PAGES = 8
+
+
+class _SlowDocument(_PyPDF2Document):
+    """Every page of a long document takes far longer than the page timeout"""
+
+    def page_text(self, index: int) -> str:
+        if self.page_count >= HOSTILE_PAGES:
+            time.sleep(3)
+        return super().page_text(index)
+
+
+class SlowBackend(PyPDF2Backend):
+    name = "slow-test"
+
+    def open(self, pdf_bytes: bytes):
+        return _SlowDocument(pdf_bytes)
+
+
+class ParentOnlyBackend(PyPDF2Backend):
+    """Opens documents in the app process but fails in page workers"""
+    name = "parent-only-test"
+
+    def open(self, pdf_bytes: bytes):
+        if multiprocessing.parent_process() is not None:
+            raise RuntimeError("not in a page worker")
+        return super().open(pdf_bytes)
+
+
+@pytest.fixture
+def test_backends(monkeypatch):
+    for backend in (SlowBackend(), ParentOnlyBackend()):
+        monkeypatch.setitem(BACKENDS, backend.name, backend)
+
+
+@pytest.fixture(params=sorted({pdf_processor.WORKER_START_METHOD, "spawn"}))
+def start_method(request, monkeypatch):
+    """Page workers started the way production starts them, and spawned"""
+    monkeypatch.setattr(pdf_processor, "WORKER_START_METHOD", request.param)
+    pdf_processor._worker_context.cache_clear()
+    # Idle workers of the other start method must not be reused
+    while pdf_processor._idle_workers:
+        pdf_processor._idle_workers.pop().kill()
+    yield request.param
+    pdf_processor._worker_context.cache_clear()
+
+
+def resume_pdf(pages: int, seed: int = 0) -> bytes:
+    return build_pdf(generate_resume_lines(pages, 'classic', seed))
+
+
+def test_worker_extraction_matches_in_process_extraction(start_method):
+    pdf_bytes = resume_pdf(12)
+    serial = PDFProcessor(parallel_pages=False, page_timeout=None, backend="pypdf2")
+    workers = PDFProcessor(page_timeout=5.0, max_workers=4, backend="pypdf2")
+    assert workers.extract_text(pdf_bytes) == serial.extract_text(pdf_bytes)
+
+
+def test_slow_document_does_not_hold_workers_for_the_next_one(start_method, test_backends):
+    processor = PDFProcessor(backend=SlowBackend.name, page_timeout=0.5, max_workers=4)
+    results = {}
+
+    def extract(name, pdf_bytes):
+        limits_hit = []
+        results[name] = ("".join(processor.iter_pages(pdf_bytes, limits_hit)), limits_hit)
+
+    hostile = threading.Thread(target=extract, args=("hostile", resume_pdf(HOSTILE_PAGES, 1)))
+    hostile.start()
+    time.sleep(0.1)
+    started = time.perf_counter()
+    extract("normal", resume_pdf(2, 2))
+    elapsed = time.perf_counter() - started
+    hostile.join()
+
+    text, limits_hit = results["normal"]
+    assert limits_hit == []
+    assert "EDUCATION" in text
+    # At most one page timeout spent waiting for the hostile document's workers
+    assert elapsed < 2.0
+    assert results["hostile"][1] == ["Page 1 took too long to read, so extraction stopped there."]
+
+
+def test_worker_that_cannot_open_the_pdf_falls_back_to_this_process(start_method, test_backends):
+    def worker_errors():
+        return metrics.snapshot()['counters'].get('pdf_worker_errors_total', {}).get(
+            f'{{backend="{ParentOnlyBackend.name}"}}', 0)
+
+    pdf_bytes = resume_pdf(3)
+    before = worker_errors()
+    limits_hit = []
+    processor = PDFProcessor(backend=ParentOnlyBackend.name, page_timeout=5.0)
+    text = "".join(processor.iter_pages(pdf_bytes, limits_hit))
+    assert limits_hit == []
+    assert text == PDFProcessor(page_timeout=None, backend="pypdf2").extract_text(pdf_bytes)
+    assert worker_errors() == before + 1
+
+
+def test_page_and_byte_caps():
+    pdf_bytes = resume_pdf(5)
+    limits_hit = []
+    text = "".join(PDFProcessor(max_pages=2, backend="pypdf2").iter_pages(pdf_bytes, limits_hit))
+    assert text
+    assert limits_hit == ["Only the first 2 of 5 pages were read."]
+    with pytest.raises(PDFLimitError):
+        PDFProcessor(max_bytes=1024, backend="pypdf2").extract_text(pdf_bytes)
+
+
+def test_stopping_after_sections_is_reported():
+    pdf_bytes = resume_pdf(12)
+    full_text, full = PDFProcessor(backend="pypdf2").extract_structured(pdf_bytes)
+    assert 'ingest_limits' not in full
+
+    text, early = PDFProcessor(backend="pypdf2", stop_after_sections=True).extract_structured(pdf_bytes)
+    assert len(text) < len(full_text)
+    [note] = early['ingest_limits']
+    assert note.startswith("Reading stopped after page ")
+
+
+def test_resume_cache_keys_depend_on_parse_settings(tmp_path):
+    from resume_cache import ResumeCache
+
+    cache = ResumeCache(path=str(tmp_path / "resumes.sqlite3"))
+    pdf_bytes = resume_pdf(5)
+    capped_text, capped = cache.get_or_parse(pdf_bytes, PDFProcessor(max_pages=2, backend="pypdf2"))
+    full_text, full = cache.get_or_parse(pdf_bytes, PDFProcessor(max_pages=30, backend="pypdf2"))
+    assert 'ingest_limits' in capped and 'ingest_limits' not in full
+    assert len(full_text) > len(capped_text)
+    assert cache.get_or_parse(pdf_bytes, PDFProcessor(max_pages=2, backend="pypdf2"))[0] == capped_text
+    assert cache.stats()['hits'] == 1
+
+
+class _GluedDocument(_PyPDF2Document):
+    """Fast, but loses the spaces between words"""
+
+    def page_text(self, index: int) -> str:
+        return super().page_text(index).replace(" ", "")
+
+
+class GluedBackend(PyPDF2Backend):
+    name = "glued-test"
+
+    def open(self, pdf_bytes: bytes):
+        return _GluedDocument(pdf_bytes)
+
+
+@pytest.fixture
+def fresh_auto_backend():
+    """``auto_backend`` recalibrated for this test and forgotten after it"""
+    auto_backend.cache_clear()
+    yield
+    auto_backend.cache_clear()
+
+
+def test_auto_backend_is_resolved_before_any_upload(fresh_auto_backend):
+    processor = PDFProcessor(backend=AUTO_BACKEND)
+    assert processor.backend in available_backends()
+
+
+def test_calibration_rejects_backends_that_lose_words(monkeypatch):
+    monkeypatch.setitem(BACKENDS, GluedBackend.name, GluedBackend())
+    assert calibrate(calibration_samples(), [GluedBackend.name, "pypdf2"]) == "pypdf2"
+
+
+def test_auto_backend_without_samples_uses_the_default(monkeypatch, fresh_auto_backend):
+    def no_samples():
+        raise ImportError("No module named 'sample_resumes'")
+
+    monkeypatch.setitem(BACKENDS, GluedBackend.name, GluedBackend())
+    monkeypatch.setattr(pdf_backends, "calibration_samples", no_samples)
+    assert auto_backend() == DEFAULT_BACKEND
@@ -0,0 +1,45 @@
+"""Prompt token budgets, measured on the prompt GeminiService actually sends"""
+import pytest
+
+from gemini_service import GUIDE_MODES, GUIDE_SECTIONS
+from metrics import metrics
+from prompts import MIN_SKILLS_PER_CATEGORY, PromptGenerator, estimate_tokens
+from stub_llm import make_stub_service
+
+COMPANY = "Acme"
+ROLE = "Backend Developer"
+PROFILE = {'skills': {
+    'languages': [f"Language{i}" for i in range(20)],
+    'frameworks': [f"Framework{i}" for i in range(20)],
+    'tools': [f"Tool{i}" for i in range(20)],
+}}
+
+
+def compactions():
+    return metrics.snapshot()['counters'].get('prompt_compactions_total', {}).get('', 0)
+
+
+@pytest.mark.parametrize("mode", list(GUIDE_MODES))
+@pytest.mark.parametrize("sections", [False, True])
+def test_budget_covers_the_built_prompt(mode, sections):
+    service = make_stub_service()
+    budget = 320
+    context = PromptGenerator(max_prompt_tokens=budget).generate_interview_prompt(
+        PROFILE, COMPANY, ROLE, service.prompt_overhead_tokens(ROLE, mode, sections)
+    )
+    built = ([service.build_prompt(context, ROLE, mode, section=section) for section in GUIDE_SECTIONS]
+             if sections else [service.build_prompt(context, ROLE, mode)])
+    assert max(estimate_tokens(prompt) for prompt in built) <= budget
+    # Without the overhead the context alone would have been allowed the whole budget
+    assert len(context) < len(PromptGenerator(max_prompt_tokens=budget).generate_interview_prompt(
+        PROFILE, COMPANY, ROLE))
+
+
+def test_only_real_trims_are_counted():
+    small = {'skills': {name: values[:MIN_SKILLS_PER_CATEGORY] for name, values in PROFILE['skills'].items()}}
+    generator = PromptGenerator(max_prompt_tokens=1)
+    before = compactions()
+    generator.generate_interview_prompt(small, COMPANY, ROLE)
+    assert compactions() == before
+    generator.generate_interview_prompt(PROFILE, COMPANY, ROLE)
+    assert compactions() == before + 1
@@ -0,0 +1,181 @@
+"""Circuit breaker, retries and hedging, against the benchmark stub model"""
+import time
+
+import pytest
+
+from gemini_service import FALLBACK_NOTICE, GeminiService
+from resilience import CircuitBreaker, RetryPolicy
+from stub_llm import STUB_GUIDE, StubModel
+
+ROLE = "Backend Developer"
+
+
+class FlakyModel(StubModel):
+    """Raises the queued errors, one per call, before answering normally"""
+
+    def __init__(self, errors, **kwargs):
+        super().__init__(**kwargs)
+        self.errors = list(errors)
+
+    def generate_content(self, contents, generation_config=None, stream=False, **kwargs):
+        if self.errors:
+            self.calls += 1
+            raise self.errors.pop(0)
+        return super().generate_content(contents, generation_config, stream=stream, **kwargs)
+
+
+class SlowFirstModel(StubModel):
+    """The first call takes ``first_latency`` seconds, later ones answer at once"""
+
+    def __init__(self, first_latency, **kwargs):
+        super().__init__(**kwargs)
+        self.first_latency = first_latency
+
+    def generate_content(self, contents, generation_config=None, stream=False, **kwargs):
+        self.latency = self.first_latency if self.calls == 0 else 0.0
+        return super().generate_content(contents, generation_config, stream=stream, **kwargs)
+
+
+def make_service(model, breaker=None, **kwargs):
+    return GeminiService("stub", model=model, circuit_breaker=breaker or CircuitBreaker(),
+                         retry_policy=RetryPolicy(max_attempts=3, base_delay=0.0), **kwargs)
+
+
+def test_breaker_opens_after_threshold_and_probes_after_timeout():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # Only one probe at a time
+    assert not breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_stale_probe_slot_is_reclaimed():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0, probe_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    time.sleep(0.06)
+    assert breaker.allow_request()
+
+
+def test_only_the_probe_releases_its_slot():
+    # A call admitted while closed that ends without an outcome after the
+    # breaker went half-open must not free the real probe's slot
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    early = breaker.allow_request()
+    breaker.record_failure()
+    probe = breaker.allow_request()
+    assert probe is not None
+
+    breaker.release(early)
+    assert breaker.allow_request() is None
+    breaker.record_failure(early)
+    assert breaker.allow_request() is None
+
+    breaker.release(probe)
+    assert breaker.allow_request() is not None
+
+
+def test_transient_errors_are_retried():
+    model = FlakyModel([ConnectionError("reset"), ConnectionError("reset")])
+    service = make_service(model)
+    assert service.generate_response("Python, SQL", ROLE) == STUB_GUIDE
+    assert model.calls == 3
+    assert service.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+def test_non_transient_errors_are_not_retried():
+    model = FlakyModel([ValueError("bad request")])
+    service = make_service(model)
+    assert service.generate_response("Python, SQL", ROLE).startswith(FALLBACK_NOTICE)
+    assert model.calls == 1
+
+
+def test_open_breaker_serves_fallback_without_calling_the_model():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+    model = StubModel()
+    service = make_service(model, breaker)
+    breaker.record_failure()
+    assert service.generate_response("Python, SQL", ROLE).startswith(FALLBACK_NOTICE)
+    assert model.calls == 0
+
+
+@pytest.mark.parametrize("chunks_read", [0, 1, 3])
+def test_closed_stream_releases_half_open_probe(chunks_read):
+    # A stream closed mid-guide (a rerun, or the user leaving the page) used to
+    # keep the half-open probe slot forever, so every later call got the fallback
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    service = make_service(StubModel(chunks=8), breaker)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    stream = service.generate_response_stream("Python, SQL", ROLE)
+    for _ in range(max(1, chunks_read)):
+        next(stream)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    stream.close()
+
+    breaker.release(breaker.allow_request())
+    assert service.generate_response("Python, SQL", ROLE) == STUB_GUIDE
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_completed_stream_closes_half_open_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    service = make_service(StubModel(chunks=4), breaker)
+    breaker.record_failure()
+    assert "".join(service.generate_response_stream("Python, SQL", ROLE)) == STUB_GUIDE
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_slow_call_is_hedged():
+    model = SlowFirstModel(first_latency=1.0)
+    service = make_service(model, hedge_percentile=0.5)
+    for _ in range(service.latency.min_samples):
+        service.latency.record(0.01)
+
+    started = time.perf_counter()
+    assert service.generate_response("Python, SQL", ROLE) == STUB_GUIDE
+    assert time.perf_counter() - started < 0.5
+    assert model.calls == 2
+
+
+def test_no_hedge_until_enough_latency_samples():
+    model = SlowFirstModel(first_latency=0.05)
+    service = make_service(model, hedge_percentile=0.5)
+    assert service.generate_response("Python, SQL", ROLE) == STUB_GUIDE
+    assert model.calls == 1
+
+
+def test_async_call_is_hedged():
+    import asyncio
+
+    class SlowFirstAsyncModel(StubModel):
+        async def generate_content_async(self, contents, generation_config=None, **kwargs):
+            self.latency = 1.0 if self.calls == 0 else 0.0
+            return await super().generate_content_async(contents, generation_config, **kwargs)
+
+    model = SlowFirstAsyncModel()
+    service = make_service(model, hedge_percentile=0.5)
+    for _ in range(service.latency.min_samples):
+        service.latency.record(0.01)
+
+    started = time.perf_counter()
+    assert asyncio.run(service.generate_response_async("Python, SQL", ROLE)) == STUB_GUIDE
+    assert time.perf_counter() - started < 0.5
+    assert model.calls == 2
@@ -0,0 +1,108 @@
+"""Incremental response cleaning and section splitting"""
+import random
+
+import pytest
+
+from llm_utils import LLMUtils, ResponseCleaner
+
+PROMPT = "As an expert technical interviewer, create a detailed interview guide."
+GUIDE = """# Technical Questions
+
+
+1.   Explain   the GIL.
+2. Compare processes and threads.   
+
+## Follow-ups
+- How does asyncio   schedule tasks?
+
+# Coding Challenges
+```python
+def  two_sum(nums,   target):
+
+
+    seen = {}
+    return   seen
+```
+   Indented    note after the code.
+
+# Key Concepts
+- Caching
+- Idempotency
+"""
+
+
+def chunked(text, rng, max_size=12):
+    chunks = []
+    while text:
+        size = rng.randint(1, max_size)
+        chunks.append(text[:size])
+        text = text[size:]
+    return chunks
+
+
+def clean(chunks, prompt=""):
+    sections = []
+    cleaner = ResponseCleaner(prompt, on_section=lambda name, lines: sections.append((name, lines)))
+    out = "".join(cleaner.feed(chunk) for chunk in chunks) + cleaner.finish()
+    return out, sections
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_random_chunkings_match_a_single_feed(seed):
+    rng = random.Random(seed)
+    expected = clean([PROMPT + GUIDE], PROMPT)
+    assert clean(chunked(PROMPT + GUIDE, rng), PROMPT) == expected
+    assert clean(list(PROMPT + GUIDE), PROMPT) == expected
+
+
+def test_prompt_echo_split_across_chunks_is_dropped():
+    text = PROMPT + "\n" + GUIDE
+    cut = len(PROMPT) // 2
+    out, _ = clean([text[:cut], text[cut:len(PROMPT) + 3], text[len(PROMPT) + 3:]], PROMPT)
+    assert out == clean([GUIDE])[0]
+    assert PROMPT not in out
+
+
+def test_near_match_of_the_prompt_is_kept():
+    lookalike = PROMPT[:20] + "ly, you should review caching first.\n" + GUIDE
+    out, _ = clean([lookalike[:10], lookalike[10:25], lookalike[25:]], PROMPT)
+    assert out == clean([lookalike])[0]
+    assert out.startswith(PROMPT[:20] + "ly, you should")
+
+
+def test_stream_ending_inside_a_prompt_prefix_keeps_the_text():
+    out, _ = clean([PROMPT[:5], PROMPT[5:12]], PROMPT)
+    assert out == PROMPT[:12]
+
+
+def test_text_outside_code_is_normalized_and_code_is_verbatim():
+    out, _ = clean([GUIDE])
+    assert "1. Explain the GIL." in out
+    assert "\n\n\n" not in out.split("```python")[0]
+    code = out.split("```python\n", 1)[1].split("\n```", 1)[0]
+    assert code == "def  two_sum(nums,   target):\n\n\n    seen = {}\n    return   seen"
+    # Indentation is kept, inner runs of spaces are not
+    assert "\n   Indented note after the code." in out
+
+
+def test_on_section_fires_when_the_next_heading_arrives():
+    sections = []
+    cleaner = ResponseCleaner(on_section=lambda name, lines: sections.append((name, lines)))
+    cleaner.feed("# Technical Questions\n- one\n- tw")
+    assert sections == []
+    cleaner.feed("o\n# Cod")
+    assert sections == []
+    cleaner.feed("ing Challenges\n")
+    assert sections == [("Technical Questions", ["- one", "- two"])]
+    cleaner.feed("- FizzBuzz")
+    cleaner.finish()
+    assert sections[-1] == ("Coding Challenges", ["- FizzBuzz"])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_sections_match_extract_sections(seed):
+    out, sections = clean(chunked(GUIDE, random.Random(seed)))
+    assert dict(sections) == LLMUtils().extract_sections(out)
+    assert [name for name, _ in sections] == [
+        "Technical Questions", "Follow-ups", "Coding Challenges", "Key Concepts"
+    ]
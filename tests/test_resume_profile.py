@@ -0,0 +1,63 @@
+"""ResumeProfile round trips and the skill vocabulary behind its bitset"""
+import re
+
+import pytest
+
+from pdf_processor import PDFProcessor
+from resume_profile import ResumeProfile, expand_pattern, skill_sort_key
+from sample_resumes import build_pdf, generate_corpus
+
+PROCESSOR = PDFProcessor(parallel_pages=False, page_timeout=None, backend="pypdf2")
+VOCABULARY = PROCESSOR.skill_vocabulary()
+MIXED_CASE_RESUME = [
+    "Jordan Example", "",
+    "TECHNICAL SKILLS",
+    "Languages: python, Python, GOLANG",
+    "Frameworks: react, React.js",
+    "Tools: github, GitHub, Docker", "",
+    "EXPERIENCE",
+    "Built services in Go and JavaScript with Node.js on AWS", "",
+]
+
+
+def round_trip(structured_data):
+    return ResumeProfile.from_dict(structured_data, VOCABULARY).to_dict()
+
+
+@pytest.mark.parametrize("name, pdf_bytes", sorted(generate_corpus([1, 3]).items()))
+def test_extracted_resumes_round_trip(name, pdf_bytes):
+    _, structured_data = PROCESSOR.extract_structured(pdf_bytes)
+    structured_data.pop('ingest_limits', None)
+    assert round_trip(structured_data) == structured_data
+
+
+def test_case_variants_and_unknown_skills_round_trip():
+    _, structured_data = PROCESSOR.extract_structured(build_pdf(MIXED_CASE_RESUME))
+    structured_data.pop('ingest_limits', None)
+    skills = structured_data['skills']
+    # Spellings that differ only by case are both kept by the extractor
+    assert {'Python', 'python'} <= set(skills['languages'])
+    for category, extra in (('languages', 'Elixir'), ('frameworks', 'Phoenix'), ('tools', 'Terraformish')):
+        assert VOCABULARY.bit(category, extra) is None
+        skills[category] = sorted(skills[category] + [extra], key=skill_sort_key)
+    assert round_trip(structured_data) == structured_data
+
+    profile = ResumeProfile.from_dict(structured_data, VOCABULARY)
+    assert profile.has_skill('languages', 'python')
+    assert profile.has_skill('frameworks', 'Phoenix')
+    assert not profile.has_skill('tools', 'Kubernetes')
+
+
+@pytest.mark.parametrize("category, pattern", [
+    (category, pattern)
+    for category, patterns in PROCESSOR.tech_patterns.items()
+    for pattern in patterns
+])
+def test_expand_pattern_covers_every_alternative(category, pattern):
+    spellings = expand_pattern(pattern)
+    # Every optional group or character doubles the spellings
+    optional = len(re.findall(r'\)\?|\]\?', pattern))
+    assert len(set(spellings)) == 2 ** optional
+    for spelling in spellings:
+        assert re.fullmatch(pattern, spelling)
+        assert VOCABULARY.bit(category, spelling) is not None
@@ -0,0 +1,46 @@
+"""Per-section generation and merging, against the benchmark stub model"""
+from gemini_service import (
+    GUIDE_SECTIONS, MISSING_SECTION_NOTE, GeminiService, is_partial_response
+)
+from llm_utils import LLMUtils
+from resilience import RetryPolicy
+from stub_llm import STUB_GUIDE, StubModel
+
+ROLE = "Backend Developer"
+
+
+def make_service(text):
+    return GeminiService("stub", model=StubModel(text=text),
+                         retry_policy=RetryPolicy(max_attempts=1))
+
+
+def test_merged_guide_has_each_section_once():
+    # The stub answers every per-section request with the whole guide
+    guide = make_service(STUB_GUIDE).generate_response_sections("Python, SQL", ROLE)
+    for section in GUIDE_SECTIONS:
+        assert guide.count(f"# {section}") == 1
+    assert guide == STUB_GUIDE.strip()
+    assert not is_partial_response(guide)
+
+
+def test_section_keeps_its_sub_headings_and_drops_preamble():
+    text = ("Sure, here is the section.\n# Key Concepts\n## Caching\n- LRU\n"
+            "# Preparation Steps\n1. Sleep well\n")
+    section = LLMUtils().extract_section(text, "Key Concepts", ["Preparation Steps"])
+    assert section == "# Key Concepts\n## Caching\n- LRU"
+
+
+def test_heading_without_content_is_not_valid():
+    text = "# Key Concepts\n\n# Preparation Steps\n1. Sleep well\n"
+    assert not LLMUtils().validate_section(text, "Key Concepts", ["Preparation Steps"])
+    assert LLMUtils().validate_section(text, "Preparation Steps", ["Key Concepts"])
+
+
+def test_missing_section_is_marked_partial():
+    text = STUB_GUIDE.replace("# Key Concepts", "# Other Notes")
+    service = make_service(text)
+    guide = service.generate_response_sections("Python, SQL", ROLE)
+    assert f"# Key Concepts\n{MISSING_SECTION_NOTE}" in guide
+    assert is_partial_response(guide)
+    # First round plus one retry of the missing section
+    assert service.model.calls == len(GUIDE_SECTIONS) + 1
@@ -0,0 +1,115 @@
+"""Guide reuse across resumes with similar skills, on both scoring paths"""
+import random
+
+import pytest
+
+import similarity_index
+from response_cache import ResponseCache
+from resume_profile import ResumeProfile, SkillVocabulary
+from similarity_index import SkillSimilarityIndex
+
+VOCABULARY = SkillVocabulary((
+    ('languages', tuple(f"Language{i}" for i in range(40))),
+    ('frameworks', tuple(f"Framework{i}" for i in range(40))),
+    ('tools', tuple(f"Tool{i}" for i in range(40))),
+))
+ALL_SKILLS = [(category, name) for category, name in zip(VOCABULARY.categories, VOCABULARY.spellings)]
+GROUP = ("Acme", "Backend Developer", "standard")
+
+
+def profile(*skills):
+    data = {'skills': {}}
+    for category, name in skills:
+        data['skills'].setdefault(category, []).append(name)
+    return ResumeProfile.from_dict(data, VOCABULARY)
+
+
+def languages(*numbers):
+    return profile(*(('languages', f"Language{n}") for n in numbers))
+
+
+@pytest.fixture(params=["numpy", "bitset"])
+def scoring(request, monkeypatch):
+    """Run a test against the NumPy scorer and the integer-popcount fallback"""
+    if request.param == "bitset":
+        monkeypatch.setattr(similarity_index, "np", None)
+    return request.param
+
+
+def make_index(threshold=0.5, metric='jaccard', max_entries=16):
+    return SkillSimilarityIndex(ResponseCache(), VOCABULARY, threshold=threshold,
+                                metric=metric, max_entries=max_entries)
+
+
+def store(index, resume, cache_key, guide=None):
+    index.response_cache.put(cache_key, guide or f"guide for {cache_key}")
+    index.add(resume, *GROUP, cache_key)
+
+
+@pytest.mark.parametrize("metric", ["jaccard", "cosine"])
+def test_numpy_and_bitset_scores_agree(metric, monkeypatch):
+    rng = random.Random(metric)
+    profiles = [profile(*rng.sample(ALL_SKILLS, rng.randint(1, 30))) for _ in range(200)]
+    queries = [profile(*rng.sample(ALL_SKILLS, rng.randint(1, 30))) for _ in range(20)]
+
+    def scores():
+        index = make_index(threshold=0.0, metric=metric, max_entries=len(profiles))
+        for number, resume in enumerate(profiles):
+            index.add(resume, *GROUP, f"key{number}")
+        group = index._groups[index._group_key(*GROUP)]
+        return [dict((row, score) for score, row in index._scores(group, query.skill_bits))
+                for query in queries]
+
+    with_numpy = scores()
+    monkeypatch.setattr(similarity_index, "np", None)
+    with_bitsets = scores()
+    for numpy_scores, bitset_scores in zip(with_numpy, with_bitsets):
+        assert numpy_scores.keys() == bitset_scores.keys()
+        for row, score in numpy_scores.items():
+            assert score == pytest.approx(bitset_scores[row], abs=1e-6)
+
+
+@pytest.mark.parametrize("metric, stored, query, score", [
+    # Jaccard: 3 shared of 4 in the union
+    ('jaccard', (1, 2, 3, 4), (1, 2, 3), 0.75),
+    # Cosine: 1 shared / sqrt(4 * 1)
+    ('cosine', (1, 2, 3, 4), (1,), 0.5),
+])
+def test_score_exactly_at_threshold_matches(scoring, metric, stored, query, score):
+    index = make_index(threshold=score, metric=metric)
+    store(index, languages(*stored), "key", "the guide")
+    assert index.lookup(languages(*query), *GROUP).startswith("the guide")
+
+    stricter = make_index(threshold=score + 0.01, metric=metric)
+    store(stricter, languages(*stored), "key", "the guide")
+    assert stricter.lookup(languages(*query), *GROUP) is None
+
+
+def test_full_group_overwrites_the_oldest_row(scoring):
+    index = make_index(threshold=1.0, max_entries=2)
+    store(index, languages(1), "first")
+    store(index, languages(2), "second")
+    store(index, languages(3), "third")
+    assert index.lookup(languages(1), *GROUP) is None
+    assert index.lookup(languages(2), *GROUP) == "guide for second"
+    assert index.lookup(languages(3), *GROUP) == "guide for third"
+
+
+def test_expired_guide_falls_through_to_the_next_best(scoring):
+    index = make_index(threshold=0.5)
+    store(index, languages(1, 2, 3, 4), "best")
+    store(index, languages(1, 2, 3, 5, 6), "runner-up")
+    index.response_cache.clear()
+    index.response_cache.put("runner-up", "guide for runner-up")
+    assert index.lookup(languages(1, 2, 3, 4), *GROUP).startswith("guide for runner-up")
+
+
+def test_adding_a_known_key_again_keeps_other_profiles(scoring):
+    index = make_index(threshold=1.0, max_entries=2)
+    store(index, languages(1), "first")
+    store(index, languages(2), "second")
+    for _ in range(5):
+        # What generate_guide does after every response-cache hit
+        index.add(languages(2), *GROUP, "second")
+    assert index.lookup(languages(1), *GROUP) == "guide for first"
+    assert index.lookup(languages(2), *GROUP) == "guide for second"
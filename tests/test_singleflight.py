@@ -0,0 +1,188 @@
+"""Single-flight coalescing, directly and through GeminiService"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from singleflight import FlightAbandonedError, SingleFlight
+from stub_llm import STUB_GUIDE, make_stub_service
+
+ROLE = "Backend Developer"
+
+
+def test_concurrent_callers_share_one_call():
+    flights = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def work():
+        calls.append(1)
+        release.wait(1)
+        return "result"
+
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(flights.do, "key", work) for _ in range(4)]
+        time.sleep(0.05)
+        release.set()
+        assert [future.result() for future in futures] == ["result"] * 4
+    assert len(calls) == 1
+
+
+def test_followers_get_the_leaders_exception():
+    flights = SingleFlight()
+    started = threading.Event()
+
+    def work():
+        started.set()
+        time.sleep(0.05)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(flights.do, "key", work)
+        started.wait(1)
+        follower = pool.submit(flights.do, "key", lambda: "not called")
+        with pytest.raises(ValueError):
+            leader.result()
+        with pytest.raises(ValueError):
+            follower.result()
+
+
+def test_follower_times_out():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def work():
+        started.set()
+        release.wait(1)
+        return "late"
+
+    with ThreadPoolExecutor(1) as pool:
+        leader = pool.submit(flights.do, "key", work)
+        started.wait(1)
+        with pytest.raises(TimeoutError):
+            flights.do("key", lambda: "not called", timeout=0.05)
+        release.set()
+        assert leader.result() == "late"
+
+
+def test_finished_flight_is_forgotten():
+    flights = SingleFlight()
+    assert flights.do("key", lambda: 1) == 1
+    assert flights.do("key", lambda: 2) == 2
+
+
+def test_stream_followers_replay_and_follow():
+    flights = SingleFlight()
+    first_chunk = threading.Event()
+    release = threading.Event()
+
+    def chunks():
+        yield "a"
+        first_chunk.set()
+        release.wait(1)
+        yield "b"
+        yield "c"
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(lambda: list(flights.stream("key", chunks)))
+        first_chunk.wait(1)
+        follower = pool.submit(lambda: list(flights.stream("key", lambda: iter(["x"]))))
+        time.sleep(0.05)
+        release.set()
+        assert leader.result() == ["a", "b", "c"]
+        assert follower.result() == ["a", "b", "c"]
+
+
+def test_abandoned_stream_fails_its_followers():
+    flights = SingleFlight()
+
+    def chunks():
+        yield "a"
+        yield "b"
+
+    leader = flights.stream("key", chunks)
+    assert next(leader) == "a"
+    follower = flights.stream("key", lambda: iter(["x"]))
+    assert next(follower) == "a"
+    leader.close()
+    with pytest.raises(FlightAbandonedError):
+        next(follower)
+    # The key is free again
+    assert list(flights.stream("key", lambda: iter(["x"]))) == ["x"]
+
+
+def test_async_callers_share_one_task():
+    flights = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(*(flights.do_async("key", work) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["result"] * 5
+    assert len(calls) == 1
+
+
+def test_cancelling_the_async_leader_does_not_cancel_followers():
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def main():
+        leader = asyncio.ensure_future(flights.do_async("key", work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do_async("key", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(main()) == "result"
+
+
+def test_identical_guide_requests_make_one_api_call():
+    service = make_stub_service(latency=0.1)
+    with ThreadPoolExecutor(6) as pool:
+        results = list(pool.map(lambda _: service.generate_response("Python, SQL", ROLE), range(6)))
+    assert results == [STUB_GUIDE] * 6
+    assert service.model.calls == 1
+
+
+def test_identical_guide_streams_make_one_api_call():
+    service = make_stub_service(latency=0.1)
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(
+            lambda _: "".join(service.generate_response_stream("Python, SQL", ROLE)), range(4)
+        ))
+    assert results == [STUB_GUIDE] * 4
+    assert service.model.calls == 1
+
+
+def test_regenerate_does_not_join_an_in_flight_request():
+    service = make_stub_service(latency=0.1)
+    with ThreadPoolExecutor(2) as pool:
+        first = pool.submit(service.generate_response, "Python, SQL", ROLE)
+        time.sleep(0.02)
+        regenerate = pool.submit(service.generate_response, "Python, SQL", ROLE, True)
+        assert first.result() == regenerate.result() == STUB_GUIDE
+    assert service.model.calls == 2
+
+
+def test_regenerate_stream_does_not_join_an_in_flight_stream():
+    service = make_stub_service(latency=0.1)
+    with ThreadPoolExecutor(2) as pool:
+        first = pool.submit(lambda: "".join(service.generate_response_stream("Python, SQL", ROLE)))
+        time.sleep(0.02)
+        regenerate = pool.submit(
+            lambda: "".join(service.generate_response_stream("Python, SQL", ROLE, bypass_cache=True))
+        )
+        assert first.result() == regenerate.result() == STUB_GUIDE
+    assert service.model.calls == 2
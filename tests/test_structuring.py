@@ -0,0 +1,110 @@
+"""The incremental parser and compiled header matcher against the original whole-text code"""
+import random
+import re
+
+from pdf_processor import PDFProcessor, StructuredDataBuilder
+from sample_resumes import LAYOUTS, generate_resume_lines
+
+WORDS = ["Python", "react native", "Go", "Ruby on Rails", "C++", "node.js", "github", "team",
+         "Languages:", "Tools:", "Frameworks:", "Technologies:", "Note:", "built", "api", "-", "•"]
+
+
+def _nested_match_section(processor, line):
+    """Header lookup as it was before the compiled matcher"""
+    for section_name, markers in processor.sections.items():
+        for marker in markers:
+            if marker.upper() in line.upper():
+                return section_name
+    return None
+
+
+def _nested_clean_content(processor, content):
+    cleaned = []
+    for line in content:
+        line = line.strip()
+        if line and not any(marker.upper() in line.upper()
+                            for markers in processor.sections.values()
+                            for marker in markers):
+            line = re.sub(r'^[-•●■◆○*]+\s*', '', line)
+            if line:
+                cleaned.append(line)
+    return cleaned
+
+
+def _whole_text_structured_data(processor, text):
+    """get_structured_data as it was before the incremental builder"""
+    sections_dict = {}
+    current_section = None
+    current_content = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        section_match = _nested_match_section(processor, line)
+        if section_match:
+            if current_section and current_content:
+                sections_dict[current_section] = _nested_clean_content(processor, current_content)
+            current_section = section_match
+            current_content = []
+        elif current_section:
+            current_content.append(line)
+    if current_section and current_content:
+        sections_dict[current_section] = _nested_clean_content(processor, current_content)
+    return processor._validate_structured_data({
+        'sections': sections_dict,
+        'skills': processor.extract_skills(text)
+    })
+
+
+def _random_line(rng, markers):
+    parts = [rng.choice(WORDS) for _ in range(rng.randint(0, 6))]
+    if rng.random() < 0.3:
+        marker = rng.choice(markers)
+        marker = rng.choice([marker, marker.lower(), marker.title()])
+        parts.insert(rng.randint(0, len(parts)), marker)
+    joiner = rng.choice([" ", "", ", "])
+    return rng.choice(["", " ", "\t"]) + joiner.join(parts)
+
+
+def _random_document(rng, markers):
+    lines = generate_resume_lines(rng.randint(1, 2), rng.choice(list(LAYOUTS)), rng.randint(0, 999))
+    for _ in range(rng.randint(0, 30)):
+        lines.insert(rng.randint(0, len(lines)), _random_line(rng, markers))
+    return "\n".join(lines) + rng.choice(["", "\n"])
+
+
+def _random_chunks(rng, text):
+    cuts = sorted(rng.sample(range(len(text) + 1), min(len(text), rng.randint(0, 12))))
+    return [text[start:stop] for start, stop in zip([0] + cuts, cuts + [len(text)])]
+
+
+def test_builder_matches_whole_text_parse_in_any_chunking():
+    processor = PDFProcessor(parallel_pages=False)
+    markers = [marker for section in processor.sections.values() for marker in section]
+    rng = random.Random(8)
+    for _ in range(300):
+        text = _random_document(rng, markers)
+        builder = StructuredDataBuilder(processor)
+        for chunk in _random_chunks(rng, text):
+            builder.feed(chunk)
+        assert builder.finish() == _whole_text_structured_data(processor, text)
+
+
+def test_section_matcher_matches_nested_scan():
+    processor = PDFProcessor(parallel_pages=False)
+    markers = [marker for section in processor.sections.values() for marker in section]
+    fragments = markers + [marker[:len(marker) // 2] for marker in markers] + WORDS
+    index = processor._section_index()
+    rng = random.Random(9)
+    for _ in range(20_000):
+        line = rng.choice(["", " "]).join(rng.choice(fragments) for _ in range(rng.randint(1, 4)))
+        assert processor._match_section(line, index) == _nested_match_section(processor, line)
+
+
+def test_clean_content_matches_nested_scan():
+    processor = PDFProcessor(parallel_pages=False)
+    markers = [marker for section in processor.sections.values() for marker in section]
+    rng = random.Random(10)
+    for _ in range(2_000):
+        content = [_random_line(rng, markers) for _ in range(rng.randint(0, 10))]
+        assert processor._clean_content(content) == _nested_clean_content(processor, content)
@@ -0,0 +1,195 @@
+"""Job queue workers: run resume analyses submitted by the app.
+
+Each worker process claims jobs from the SQLite queue, parses the resume,
+builds the prompt, generates the guide and stores the result, reporting the
+current stage and the guide so far as it goes. Workers are configured by the
+same environment variables as the app and scale independently of it.
+
+    python worker.py --workers 4
+    python worker.py --queue .cache/jobs.sqlite3 --workers 2
+"""
+import argparse
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+from analysis import generate_guide
+from job_queue import JobQueue, DEFAULT_QUEUE_PATH, DEFAULT_RETENTION_SECONDS
+from metrics import metrics
+from pdf_processor import PDFLimitError
+import services
+
+DEFAULT_POLL_INTERVAL = 0.5
+HEARTBEAT_INTERVAL = 5.0
+# Minimum seconds between writes of the streamed guide to the queue
+PROGRESS_INTERVAL = 0.5
+# How often a worker requeues stale jobs and purges old ones
+MAINTENANCE_INTERVAL = 30.0
+
+
+class JobWorker:
+    """Claims and runs jobs in one process"""
+
+    def __init__(self, queue: JobQueue, api_key: str, name: Optional[str] = None):
+        self.queue = queue
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        # Workers are already separate processes; don't split pages across more
+        # (with PDF_PAGE_TIMEOUT a page still runs in a child that can be stopped)
+        self.pdf_processor = services.build_pdf_processor(parallel_pages=False)
+        self.prompt_generator = services.build_prompt_generator()
+        self.resume_cache = services.build_resume_cache()
+        self.response_cache = services.build_response_cache()
+        self.llm_service = services.build_llm_service(api_key, self.response_cache)
+        self.similarity_index = services.build_similarity_index(self.response_cache, self.pdf_processor)
+        self.settings = services.guide_settings()
+        self._current_job: Optional[str] = None
+        self._stopping = threading.Event()
+
+    def run_job(self, job: Dict[str, Any]) -> None:
+        """Run one claimed job to completion (or failure)"""
+        job_id = job['id']
+        started = time.perf_counter()
+        try:
+            self.queue.progress(job_id, stage="Analyzing resume")
+            with metrics.span("parse_resume", request_id=job_id):
+                _, structured_data = self.resume_cache.get_or_parse(job['pdf'], self.pdf_processor)
+
+            with metrics.span("build_prompt", request_id=job_id):
+                prompt = self.prompt_generator.generate_interview_prompt(
+                    structured_data,
+                    job['company'],
+                    job['role'],
+                    self.llm_service.prompt_overhead_tokens(job['role'], job['mode'],
+                                                            self.settings['parallel_sections'])
+                )
+
+            self.queue.progress(job_id, stage="Generating interview guide")
+            last_write = [0.0]
+
+            def on_text(text: str) -> None:
+                now = time.perf_counter()
+                if now - last_write[0] >= PROGRESS_INTERVAL:
+                    last_write[0] = now
+                    self.queue.progress(job_id, partial=text)
+
+            def on_status(message: Optional[str]) -> None:
+                self.queue.progress(job_id, stage=message or "Generating interview guide")
+
+            profile = None
+            if self.similarity_index is not None:
+                profile = self.pdf_processor.to_profile(structured_data)
+            with metrics.span("generate_guide", request_id=job_id, role=job['role']) as span:
+                response = generate_guide(
+                    self.llm_service,
+                    prompt,
+                    job['company'],
+                    job['role'],
+                    job['mode'],
+                    bypass_cache=job['bypass_cache'],
+                    latency_budget=self.settings['latency_budget'],
+                    parallel_sections=self.settings['parallel_sections'],
+                    similarity_index=self.similarity_index,
+                    profile=profile,
+                    on_text=on_text,
+                    on_status=on_status,
+                    span=span,
+                    started=started
+                )
+            # A no-op if the job was requeued or failed while this worker looked stalled
+            self.queue.complete(job_id, self.name,
+                                {'structured_data': structured_data, 'response': response})
+        except PDFLimitError as e:
+            self.queue.fail(job_id, self.name, f"This resume is too large to analyze. {str(e)}")
+        except Exception as e:
+            print(f"Job {job_id} failed: {str(e)}")
+            self.queue.fail(job_id, self.name, f"An error occurred: {str(e)}")
+        finally:
+            metrics.observe("stage_duration_seconds", time.perf_counter() - started,
+                            stage="analysis_total")
+
+    def _heartbeat(self) -> None:
+        """Keep the current job's heartbeat fresh while a long call runs"""
+        while not self._stopping.wait(HEARTBEAT_INTERVAL):
+            job_id = self._current_job
+            if job_id is not None:
+                self.queue.heartbeat(job_id)
+
+    def run_forever(self, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                    retention: float = DEFAULT_RETENTION_SECONDS) -> None:
+        heartbeat = threading.Thread(target=self._heartbeat, daemon=True)
+        heartbeat.start()
+        last_maintenance = 0.0
+        try:
+            while True:
+                if time.monotonic() - last_maintenance >= MAINTENANCE_INTERVAL:
+                    last_maintenance = time.monotonic()
+                    self.queue.requeue_stale()
+                    self.queue.purge(retention)
+                job = self.queue.claim(self.name)
+                if job is None:
+                    time.sleep(poll_interval)
+                    continue
+                self._current_job = job['id']
+                try:
+                    self.run_job(job)
+                finally:
+                    self._current_job = None
+                if os.getenv("METRICS_PROM_PATH"):
+                    metrics.write_prometheus(os.getenv("METRICS_PROM_PATH"))
+        finally:
+            self._stopping.set()
+
+
+def _worker_main(queue_path: str, api_key: str, poll_interval: float, retention: float) -> None:
+    """Entry point of one worker process"""
+    try:
+        JobWorker(JobQueue(queue_path), api_key).run_forever(poll_interval, retention)
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run resume analysis jobs submitted by the app")
+    parser.add_argument("--queue", default=None,
+                        help=f"Job queue database (default: JOB_QUEUE_PATH or {DEFAULT_QUEUE_PATH})")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes to run")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL,
+                        help="Seconds between checks of an empty queue")
+    parser.add_argument("--retention", type=float, default=DEFAULT_RETENTION_SECONDS,
+                        help="Seconds to keep finished jobs for the app to pick up")
+    args = parser.parse_args()
+
+    load_dotenv()
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        parser.error("GOOGLE_API_KEY is not set")
+    queue_path = args.queue or os.getenv("JOB_QUEUE_PATH") or DEFAULT_QUEUE_PATH
+    # Create the database before the workers race to
+    JobQueue(queue_path).close()
+
+    worker_args = (queue_path, api_key, args.poll_interval, args.retention)
+    if args.workers <= 1:
+        _worker_main(*worker_args)
+        return
+    processes = [
+        multiprocessing.Process(target=_worker_main, args=worker_args, name=f"worker-{index}")
+        for index in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    print(f"Started {len(processes)} workers on {queue_path}")
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()